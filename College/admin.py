@@ -3,7 +3,7 @@ from django.utils.html import format_html
 
 from .models import (
     CollegeProfile, Course, Event, Gallery,
-    Faculty, Hostel
+    Faculty, Hostel, Country, State, District
 )
 
 
@@ -208,3 +208,30 @@ class HostelAdmin(admin.ModelAdmin):
             )
             return format_html(previews)
         return "No Images"
+
+
+# ============================================
+# 🔵 LOCATION ADMIN
+# ============================================
+
+@admin.register(Country)
+class CountryAdmin(admin.ModelAdmin):
+    list_display = ("name", "key", "canonical")
+    search_fields = ("name", "key")
+    readonly_fields = ("key",)
+
+
+@admin.register(State)
+class StateAdmin(admin.ModelAdmin):
+    list_display = ("name", "country", "key", "canonical")
+    list_filter = ("country",)
+    search_fields = ("name", "key")
+    readonly_fields = ("key",)
+
+
+@admin.register(District)
+class DistrictAdmin(admin.ModelAdmin):
+    list_display = ("name", "state", "key", "canonical")
+    list_filter = ("state",)
+    search_fields = ("name", "key")
+    readonly_fields = ("key",)
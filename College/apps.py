@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CollegeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'College'
+
+    def ready(self):
+        import College.signals
@@ -0,0 +1,303 @@
+"""
+In-memory prefix index behind `/api/colleges/autocomplete/`.
+
+Each suggestion list (college names, districts, specializations) is a trie
+over the distinct words of its labels, so "tech" completes "Indian
+Institute of Technology" as well as "Technocrats Institute". A suggestion's
+weight is how many colleges (or courses) carry it. Every trie node caches
+its best AUTOCOMPLETE_LIMIT suggestions (filled when the trie loads), and a
+change only clears the caches along the paths of the words it touches, so
+a lookup is a walk down a handful of nodes.
+
+The tries load at worker start (EDUCATION_PIONEER/wsgi.py) or on first use,
+are updated incrementally from College/signals.py and reload when their
+version counter in the database (CatalogVersion) shows another process
+changed them. The versions are read once per request
+(`caching.request_catalog_version`), so a request costs one small query
+however many lists it completes.
+"""
+import heapq
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from . import caching
+from .models import CollegeProfile, Course
+
+
+# Most suggestions returned (and cached per trie node) for one list.
+AUTOCOMPLETE_LIMIT = getattr(settings, "COLLEGE_AUTOCOMPLETE_LIMIT", 10)
+
+
+def normalize(text):
+    """Case-folded label with whitespace collapsed ('' for blank input)."""
+    return " ".join(str(text or "").casefold().split())
+
+
+class _Node:
+    __slots__ = ("children", "entries", "own_top", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.entries = set()   # keys of the labels containing the word ending here
+        self.own_top = None    # cached best keys among `entries`
+        self.top = None        # cached best keys for this prefix
+
+
+class PrefixIndex:
+    """
+    Weighted prefix index over labels.
+
+    `source()` yields ``(doc_id, [label, ...])`` and `fetch_one(doc_id)`
+    returns the labels of one document (None once it is gone). Every
+    document adds 1 to the weight of each of its labels.
+    """
+
+    def __init__(self, name, source, fetch_one):
+        self.name = name
+        self.source = source
+        self.fetch_one = fetch_one
+        self.version_catalog = f"college-autocomplete:{name}"
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._reset()
+
+    def _reset(self):
+        self.root = _Node()
+        self.docs = {}      # doc id -> tuple of label keys
+        self.entries = {}   # label key -> [label, weight]
+
+    # --- Trie ---
+    def _walk(self, word):
+        node = self.root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _insert_word(self, word, key):
+        node = self.root
+        for char in word:
+            node.top = None
+            node = node.children.setdefault(char, _Node())
+        node.top = None
+        node.entries.add(key)
+        self._promote(node, key)
+
+    def _promote(self, node, key):
+        """`key` was added or gained weight: it can only move up in own_top."""
+        if node.own_top is not None:
+            keys = set(node.own_top)
+            keys.add(key)
+            node.own_top = sorted(keys, key=self._rank)[:AUTOCOMPLETE_LIMIT]
+
+    def _remove_word(self, word, key):
+        path = [self.root]
+        for char in word:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].entries.discard(key)
+        if path[-1].own_top is not None and key in path[-1].own_top:
+            path[-1].own_top = None
+        for depth in range(len(word), 0, -1):
+            node = path[depth]
+            node.top = None
+            if not node.children and not node.entries:
+                del path[depth - 1].children[word[depth - 1]]
+        self.root.top = None
+
+    def _touch_word(self, word, key, gained):
+        """Clear the cached tops along the path of `word` after `key` changed weight."""
+        node = self.root
+        node.top = None
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return
+            node.top = None
+        if gained:
+            self._promote(node, key)
+        elif node.own_top is not None and key in node.own_top:
+            # Only a top key losing weight forces a rescan of the entries.
+            node.own_top = None
+
+    def _rank(self, key):
+        label, weight = self.entries[key]
+        return (-weight, label.casefold())
+
+    def _top(self, node):
+        if node.top is None:
+            if node.own_top is None:
+                node.own_top = heapq.nsmallest(AUTOCOMPLETE_LIMIT, node.entries, key=self._rank)
+            keys = set(node.own_top)
+            for child in node.children.values():
+                keys.update(self._top(child))
+            node.top = sorted(keys, key=self._rank)[:AUTOCOMPLETE_LIMIT]
+        return node.top
+
+    # --- Loading & maintenance ---
+    def _add(self, doc_id, labels):
+        keys = []
+        for label in labels:
+            key = normalize(label)
+            if not key or key in keys:
+                continue
+            keys.append(key)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.entries[key] = [" ".join(str(label).split()), 1]
+                for word in set(key.split()):
+                    self._insert_word(word, key)
+            else:
+                entry[1] += 1
+                for word in set(key.split()):
+                    self._touch_word(word, key, gained=True)
+        if keys:
+            self.docs[doc_id] = tuple(keys)
+
+    def _discard(self, doc_id):
+        for key in self.docs.pop(doc_id, ()):
+            entry = self.entries[key]
+            entry[1] -= 1
+            if entry[1]:
+                for word in set(key.split()):
+                    self._touch_word(word, key, gained=False)
+            else:
+                del self.entries[key]
+                for word in set(key.split()):
+                    self._remove_word(word, key)
+
+    def load(self):
+        with self._lock:
+            self._reset()
+            version = caching.catalog_version(self.version_catalog)[0]
+            for doc_id, labels in self.source():
+                self._add(doc_id, labels)
+            # Fill the per-node caches now rather than on the first keystroke.
+            for node in self.root.children.values():
+                self._top(node)
+            self._version = version
+            self._loaded = True
+
+    def _ensure_current(self):
+        if not self._loaded or caching.request_catalog_version(self.version_catalog) != self._version:
+            self.load()
+
+    def _bump_version(self):
+        caching.bump_catalog_version(self.version_catalog)
+        new_version = caching.catalog_version(self.version_catalog)[0]
+        if self._version is not None and new_version == self._version + 1:
+            self._version = new_version
+        else:
+            self._loaded = False
+
+    def update(self, doc_id):
+        """Re-read one document from the database."""
+        with self._lock:
+            if self._loaded:
+                self._discard(doc_id)
+                labels = self.fetch_one(doc_id)
+                if labels is not None:
+                    self._add(doc_id, labels)
+            self._bump_version()
+
+    def remove(self, doc_id):
+        with self._lock:
+            if self._loaded:
+                self._discard(doc_id)
+            self._bump_version()
+
+    def invalidate(self):
+        """Force a reload here and in every other worker (after bulk updates)."""
+        with self._lock:
+            self._loaded = False
+            self._bump_version()
+
+    # --- Queries ---
+    def complete(self, text, limit=AUTOCOMPLETE_LIMIT):
+        """
+        Best labels for `text`: the last word is a prefix, any earlier
+        words must appear in the label as whole words.
+        """
+        query = normalize(text).split()
+        if not query:
+            return []
+        limit = min(limit, AUTOCOMPLETE_LIMIT)
+        *required, prefix = query
+
+        with self._lock:
+            self._ensure_current()
+            if not required:
+                node = self._walk(prefix)
+                keys = self._top(node) if node is not None else []
+            else:
+                # Start from the rarest whole word and check the rest per label.
+                nodes = [self._walk(word) for word in required]
+                if any(node is None or not node.entries for node in nodes):
+                    return []
+                candidates = min((node.entries for node in nodes), key=len)
+                keys = sorted(
+                    (
+                        key for key in candidates
+                        if set(required) <= set(key.split())
+                        and any(word.startswith(prefix) for word in key.split())
+                    ),
+                    key=self._rank,
+                )
+            return [self.entries[key][0] for key in keys[:limit]]
+
+
+def _college_names():
+    rows = CollegeProfile.objects.order_by().values_list("id", "college_name")
+    return ((college_id, [name]) for college_id, name in rows.iterator(chunk_size=2000))
+
+
+def _college_name(college_id):
+    name = CollegeProfile.objects.filter(pk=college_id).values_list("college_name", flat=True).first()
+    return None if name is None else [name]
+
+
+def _districts():
+    rows = CollegeProfile.objects.order_by().values_list("id", "district")
+    return ((college_id, [district]) for college_id, district in rows.iterator(chunk_size=2000))
+
+
+def _district(college_id):
+    district = CollegeProfile.objects.filter(pk=college_id).values_list("district", flat=True).first()
+    return None if district is None else [district]
+
+
+def _specializations():
+    rows = Course.objects.order_by().exclude(specialization__isnull=True).values_list("id", "specialization")
+    return ((course_id, [specialization]) for course_id, specialization in rows.iterator(chunk_size=2000))
+
+
+def _specialization(course_id):
+    specialization = Course.objects.filter(pk=course_id).values_list("specialization", flat=True).first()
+    return None if specialization is None else [specialization]
+
+
+INDEXES = {
+    "colleges": PrefixIndex("colleges", _college_names, _college_name),
+    "districts": PrefixIndex("districts", _districts, _district),
+    "specializations": PrefixIndex("specializations", _specializations, _specialization),
+}
+
+
+def suggest(text, limit=AUTOCOMPLETE_LIMIT, kinds=None):
+    """``{kind: [label, ...]}`` for every requested suggestion list."""
+    return {kind: INDEXES[kind].complete(text, limit) for kind in (kinds or INDEXES)}
+
+
+def warm_up():
+    """Load every trie at worker start; tolerate a database that is not ready yet."""
+    try:
+        for index in INDEXES.values():
+            index.load()
+    except DatabaseError:
+        pass
@@ -0,0 +1,156 @@
+"""
+HTTP validators and freshness headers for the public college endpoints.
+
+List responses are validated by the catalog version counter (a
+CatalogVersion row bumped after every college or course change). Detail
+responses are validated by the newest `updated_at` of the college and its
+courses, events, gallery items, faculties and hostels. Either way the
+validators cost one small query, and a matching If-None-Match or
+If-Modified-Since gets a 304 before anything is serialized.
+
+The in-memory indexes (facets, autocomplete) check their CatalogVersion
+through `request_catalog_version`, which reads every version in one query
+the first time a request asks and answers the rest of that request from
+memory.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db.models import F, Max, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .models import CatalogVersion, CollegeProfile, Course, Event, Faculty, Gallery, Hostel
+
+
+CATALOG = "colleges"
+
+# How long shared caches may serve a public response before revalidating.
+PUBLIC_MAX_AGE = getattr(settings, "COLLEGE_PUBLIC_MAX_AGE", 60)
+
+
+def catalog_version(name=CATALOG):
+    """``(version, updated_at)`` of a catalog (``(0, None)`` before its first change)."""
+    row = CatalogVersion.objects.filter(name=name).values_list("version", "updated_at").first()
+    return row or (0, None)
+
+
+def catalog_versions(names):
+    """``{name: version}`` of several catalogs in one query (0 before a catalog's first change)."""
+    versions = dict(CatalogVersion.objects.filter(name__in=names).values_list("name", "version"))
+    return {name: versions.get(name, 0) for name in names}
+
+
+def bump_catalog_version(name=CATALOG):
+    updated = CatalogVersion.objects.filter(name=name).update(version=F("version") + 1, updated_at=timezone.now())
+    if not updated:
+        CatalogVersion.objects.get_or_create(name=name, defaults={"version": 1})
+    versions = getattr(_request, "versions", None)
+    if versions:
+        versions.pop(name, None)
+
+
+# versions read during the current request: None outside a request, {} until the first read
+_request = threading.local()
+
+
+def _begin_request(**kwargs):
+    _request.versions = {}
+
+
+def _end_request(**kwargs):
+    _request.versions = None
+
+
+request_started.connect(_begin_request)
+request_finished.connect(_end_request)
+
+
+def request_catalog_version(name):
+    """
+    Version of catalog `name`. Within a request every catalog's version is
+    read in one query on first use and shared by the rest of the request
+    (a local bump drops just that entry); outside a request it is read
+    every time.
+    """
+    versions = getattr(_request, "versions", None)
+    if versions is None:
+        return catalog_version(name)[0]
+    if not versions:
+        versions.update(CatalogVersion.objects.values_list("name", "version"))
+        versions[None] = None  # marks the versions as read, even when there are none
+    if name not in versions:
+        versions[name] = catalog_version(name)[0]
+    return versions[name]
+
+
+def touch_college(**lookup):
+    """Move a college's `updated_at` forward, e.g. after one of its nested rows was deleted."""
+    CollegeProfile.objects.filter(**lookup).update(updated_at=timezone.now())
+
+
+def _latest(model, **outer):
+    rows = model.objects.filter(**outer).order_by().values(*outer).annotate(latest=Max("updated_at"))
+    return Subquery(rows.values("latest")[:1])
+
+
+def college_last_modified(college_code):
+    """Newest `updated_at` across the college and its nested resources (None if no such college)."""
+    row = (
+        CollegeProfile.objects
+        .filter(college_code=college_code)
+        .annotate(
+            courses_at=_latest(Course, college=OuterRef("college_code")),
+            events_at=_latest(Event, college=OuterRef("pk")),
+            gallery_at=_latest(Gallery, college=OuterRef("pk")),
+            faculties_at=_latest(Faculty, college=OuterRef("pk")),
+            hostels_at=_latest(Hostel, college=OuterRef("pk")),
+        )
+        .values_list("updated_at", "courses_at", "events_at", "gallery_at", "faculties_at", "hostels_at")
+        .first()
+    )
+    if row is None:
+        return None
+    return max(value for value in row if value is not None)
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest[:32])
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET with ETag/Last-Modified validators and public Cache-Control.
+
+    Views implement `get_validators(request)`, returning
+    ``(etag, last_modified)`` or None when the response must not be
+    cached (it then gets `Cache-Control: private`).
+    """
+    cache_max_age = PUBLIC_MAX_AGE
+
+    def get_validators(self, request):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(request)
+        if validators is None:
+            response = super().get(request, *args, **kwargs)
+            patch_cache_control(response, private=True)
+            return response
+
+        etag, last_modified = validators
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_cache_control(response, public=True, max_age=self.cache_max_age)
+            patch_vary_headers(response, ["Accept"])
+        return response
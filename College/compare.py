@@ -0,0 +1,132 @@
+"""
+Batch loading and side-by-side comparison of a few colleges.
+
+`/api/colleges/public/?codes=A,B,C` and `/api/colleges/compare/?codes=A,B`
+take a list of college codes and load every college and its nested rows
+with one query per relation, however many codes are given. The comparison
+is aligned: every row holds one value per requested college, in request
+order, with None where a college has nothing to show (a course it does not
+offer, a hostel type it lacks).
+"""
+from django.conf import settings
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from .models import CollegeProfile, Course, Hostel
+
+
+# Most colleges accepted by `/compare/` and by the public batch endpoint.
+COMPARE_LIMIT = getattr(settings, "COLLEGE_COMPARE_LIMIT", 4)
+BATCH_LIMIT = getattr(settings, "COLLEGE_BATCH_LIMIT", 20)
+
+# CollegeProfile fields compared row by row.
+ATTRIBUTES = [
+    "college_type",
+    "established_year",
+    "accreditation_body",
+    "state",
+    "district",
+    "verified",
+    "is_popular",
+    "is_featured",
+]
+
+
+def parse_codes(value, limit):
+    """Distinct college codes of a comma-separated `codes` parameter, in order."""
+    codes = list(dict.fromkeys(code.strip() for code in (value or "").split(",") if code.strip()))
+    if not codes:
+        raise ValidationError({"codes": "Give at least one college code."})
+    if len(codes) > limit:
+        raise ValidationError({"codes": f"At most {limit} colleges can be requested at once."})
+    return codes
+
+
+def in_order(queryset, codes):
+    """``(colleges, missing codes)`` for `codes`, colleges in request order."""
+    by_code = {college.college_code: college for college in queryset.filter(college_code__in=codes)}
+    return [by_code[code] for code in codes if code in by_code], [code for code in codes if code not in by_code]
+
+
+def comparison_queryset():
+    """Colleges with exactly what the comparison reads: three queries in total."""
+    return CollegeProfile.objects.prefetch_related(
+        Prefetch("courses", queryset=Course.objects.order_by("main_stream", "degree", "level", "specialization")),
+        Prefetch("hostels", queryset=Hostel.objects.filter(is_active=True).order_by("fee")),
+    )
+
+
+def _range(values):
+    values = [value for value in values if value is not None]
+    return (min(values), max(values)) if values else (None, None)
+
+
+def _row(field, values):
+    return {"field": field, "values": values}
+
+
+def compare(colleges):
+    """Aligned comparison of `colleges` (loaded with `comparison_queryset()`)."""
+    courses = [list(college.courses.all()) for college in colleges]
+    hostels = [list(college.hostels.all()) for college in colleges]
+
+    fees = []
+    course_ranges = [_range(course.fee for course in offered) for offered in courses]
+    hostel_ranges = [_range(hostel.fee for hostel in active) for active in hostels]
+    fees.append(_row("course_count", [len(offered) for offered in courses]))
+    fees.append(_row("course_fee_min", [low for low, _ in course_ranges]))
+    fees.append(_row("course_fee_max", [high for _, high in course_ranges]))
+    fees.append(_row("hostel_count", [len(active) for active in hostels]))
+    fees.append(_row("hostel_fee_min", [low for low, _ in hostel_ranges]))
+    fees.append(_row("hostel_fee_max", [high for _, high in hostel_ranges]))
+
+    # Courses line up on (stream, degree, level, specialization).
+    course_rows = {}
+    for position, offered in enumerate(courses):
+        for course in offered:
+            specialization = " ".join((course.specialization or "").casefold().split())
+            key = (course.main_stream, course.degree, course.level, specialization)
+            row = course_rows.get(key)
+            if row is None:
+                row = course_rows[key] = {
+                    "main_stream": course.main_stream,
+                    "degree": course.degree,
+                    "level": course.level,
+                    "specialization": course.specialization,
+                    "fees": [None] * len(colleges),
+                    "durations": [None] * len(colleges),
+                }
+            if row["fees"][position] is None or course.fee < row["fees"][position]:
+                row["fees"][position] = course.fee
+                row["durations"][position] = course.duration
+
+    def presence(values_per_college):
+        labels = {}
+        for position, values in enumerate(values_per_college):
+            for value in values:
+                labels.setdefault(" ".join(str(value).casefold().split()), [value, set()])[1].add(position)
+        return [
+            {"name": label, "available": [position in positions for position in range(len(colleges))]}
+            for label, positions in sorted(labels.values(), key=lambda item: str(item[0]).casefold())
+        ]
+
+    return {
+        "attributes": [_row(field, [getattr(college, field) for college in colleges]) for field in ATTRIBUTES],
+        "fees": fees,
+        "courses": [course_rows[key] for key in sorted(course_rows)],
+        "hostels": {
+            "types": presence([{hostel.type for hostel in active} for active in hostels]),
+            "room_types": presence([
+                {name for hostel in active for name, _ in Hostel.room_type_entries(hostel.room_types)}
+                for active in hostels
+            ]),
+            "amenities": presence([
+                {
+                    amenity
+                    for hostel in active if isinstance(hostel.amenities, list)
+                    for amenity in hostel.amenities if isinstance(amenity, str)
+                }
+                for active in hostels
+            ]),
+        },
+    }
@@ -0,0 +1,69 @@
+"""
+Response cache of the public course catalog (`/api/colleges/courses/catalog/`).
+
+Catalog pages are cached whole, keyed by the catalog version and the
+normalized query: parameter names the catalog does not understand are
+dropped, blank values are ignored, comma-separated values are sorted
+(except the `ordering` list) and parameters are ordered, so
+`?level=undergraduate&main_stream=law,arts&_=171...` and
+`?main_stream=arts,law&level=undergraduate` share one entry. The host and
+renderer are part of the key since pagination links are absolute.
+
+Any course write, and any college write (rows carry the college's name and
+location), bumps the version from College/signals.py, which orphans every
+cached page at once; the orphans simply expire. The version is a
+CatalogVersion row (College/caching.py), so a bump from a management
+command or another worker is seen by every process, and the ETag, built
+from the same key, changes with it.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import caching
+
+
+CACHE_PREFIX = "college:course-catalog:"
+CATALOG = "course-catalog"
+
+CACHE_TIMEOUT = getattr(settings, "COURSE_CATALOG_CACHE_TIMEOUT", 5 * 60)
+
+
+def version():
+    """``(version, updated_at)`` of the course catalog."""
+    return caching.catalog_version(CATALOG)
+
+
+def invalidate():
+    caching.bump_catalog_version(CATALOG)
+
+
+def normalize_query(query_params, allowed, ordered=("ordering",)):
+    """
+    ``((name, value), ...)`` of the `allowed` parameters, in a canonical
+    form. Values of the `ordered` parameters keep their order.
+    """
+    items = []
+    for name in sorted(set(query_params) & set(allowed)):
+        values = [
+            item.strip() for value in query_params.getlist(name) for item in value.split(",") if item.strip()
+        ]
+        if name not in ordered:
+            values = sorted(set(values))
+        if values:
+            items.append((name, ",".join(values)))
+    return tuple(items)
+
+
+def cache_key(catalog_version, host, query, renderer_format):
+    digest = hashlib.sha1(repr((host, query)).encode()).hexdigest()
+    return f"{CACHE_PREFIX}{catalog_version}:{renderer_format}:{digest}"
+
+
+def get(key):
+    return cache.get(key)
+
+
+def put(key, data):
+    cache.set(key, data, CACHE_TIMEOUT)
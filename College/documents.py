@@ -0,0 +1,121 @@
+"""
+Materialized public college documents.
+
+The public detail endpoint (`/api/colleges/public/<college_code>/`) nests
+every course, event, gallery item, faculty and hostel of a college, so
+serializing it costs six queries and a lot of Python per request. Instead
+the JSON is rendered once, gzip-compressed and stored in
+PublicCollegeDocument. The view sends the stored bytes as they are to
+clients that accept gzip (and inflates them for the rest), together with
+the document's ETag. Only the default representation (every relation at
+its default limit) is stored; `?include=`/`?limit=` requests are rendered
+live.
+
+A document is rebuilt after a commit that changes the college or one of its
+nested resources (College/signals.py), and `manage.py
+rebuild_public_documents` rebuilds all of them in parallel.
+
+Media fields are absolute URLs, so documents are rendered against
+COLLEGE_DOCUMENT_BASE_URL. Requests arriving on another host are served
+by the regular serializer.
+"""
+import gzip
+import hashlib
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from . import caching, nested
+from .models import PublicCollegeDocument
+from .serializers import CollegePublicSerializer
+
+
+# Scheme and host the stored documents build their media URLs against.
+DOCUMENT_BASE_URL = getattr(settings, "COLLEGE_DOCUMENT_BASE_URL", "http://127.0.0.1:8000/")
+
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def _request(base_url):
+    parts = urlsplit(base_url)
+    return RequestFactory().get("/", HTTP_HOST=parts.netloc, secure=parts.scheme == "https")
+
+
+def render(college, base_url=DOCUMENT_BASE_URL):
+    """JSON bytes of the public representation of `college`."""
+    data = CollegePublicSerializer(college, context={"request": _request(base_url)}).data
+    return JSONRenderer().render(data)
+
+
+def build(college, base_url=DOCUMENT_BASE_URL):
+    """Unsaved PublicCollegeDocument for `college` (loaded with `nested.public_queryset()`)."""
+    body = render(college, base_url)
+    return PublicCollegeDocument(
+        college_id=college.pk,
+        base_url=base_url,
+        body=gzip.compress(body, mtime=0),
+        # Weak: the gzip and identity encodings share the validator.
+        etag="W/" + quote_etag(hashlib.sha1(body).hexdigest()[:32]),
+        source_modified=caching.college_last_modified(college.college_code),
+    )
+
+
+def save(documents):
+    """Insert or replace the given documents in one statement."""
+    return PublicCollegeDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["college"],
+        update_fields=["base_url", "body", "etag", "source_modified", "built_at"],
+    )
+
+
+def rebuild(**lookup):
+    """Rebuild the document of the college matching `lookup` (None if it is gone)."""
+    college = nested.public_queryset().filter(**lookup).first()
+    if college is None:
+        return None
+    document = build(college)
+    save([document])
+    return document
+
+
+def build_many(college_ids):
+    """
+    Render the documents of `college_ids` without saving them; the unit of
+    work of `manage.py rebuild_public_documents`.
+    """
+    return [build(college) for college in nested.public_queryset().filter(pk__in=college_ids)]
+
+
+def get(college_code, base_url):
+    """
+    Stored document of the college for requests on `base_url`, built on
+    first use. None when the college does not exist or the host differs.
+    """
+    if base_url != DOCUMENT_BASE_URL:
+        return None
+    document = (
+        PublicCollegeDocument.objects
+        .filter(college__college_code=college_code, base_url=base_url)
+        .first()
+    )
+    return document or rebuild(college_code=college_code)
+
+
+def response(document, request):
+    """HttpResponse carrying the document, compressed when the client allows it."""
+    body = bytes(document.body)
+    if _ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        result = HttpResponse(body, content_type="application/json")
+        result["Content-Encoding"] = "gzip"
+    else:
+        result = HttpResponse(gzip.decompress(body), content_type="application/json")
+    patch_vary_headers(result, ["Accept-Encoding"])
+    return result
@@ -0,0 +1,139 @@
+"""
+Upcoming-events feed and its iCalendar (.ics) export.
+
+The feed lists events across colleges from today on (or from `?from=`),
+soonest first, and is read through the (date, college) index on Event. Both
+the JSON feed and the calendar are validated by the "events" catalog
+version (a CatalogVersion row bumped after every event, college or course
+change, see College/signals.py). A calendar client that refreshes every few
+minutes gets a 304 for the cost of that one lookup. It pays for a read of its
+date window only when something changed.
+
+Calendars are written a few events at a time from a server-side iterator
+into a streaming response, so a long export never sits in memory.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import caching
+
+
+CATALOG = "events"
+
+# Events read from the database per round trip while streaming a calendar.
+ICS_CHUNK_SIZE = getattr(settings, "COLLEGE_ICS_CHUNK_SIZE", 500)
+
+PRODUCT_ID = "-//Education Pioneer//College events//EN"
+
+
+def version():
+    return caching.catalog_version(CATALOG)
+
+
+def bump():
+    caching.bump_catalog_version(CATALOG)
+
+
+def escape(text):
+    """TEXT value escaping of RFC 5545 (3.3.11)."""
+    return (
+        str(text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+        .replace("\r", "\\n")
+    )
+
+
+def quote_param(text):
+    """Parameter value (3.2): quoted, since it may hold commas or colons; DQUOTE is not allowed."""
+    return '"' + str(text or "").replace('"', "'") + '"'
+
+
+def fold(line):
+    """Content line folded at 75 octets, each continuation starting with a space."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # never split inside a UTF-8 sequence
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ") if value else ""
+
+
+def vevent(event, host):
+    """Lines of one all-day VEVENT."""
+    college = event.college
+    where = event.location or ", ".join(part for part in (college.college_name, college.district, college.state) if part)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.pk}@{host}",
+        f"DTSTAMP:{_stamp(event.updated_at)}",
+        f"LAST-MODIFIED:{_stamp(event.updated_at)}",
+        f"DTSTART;VALUE=DATE:{event.date:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{event.date + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{escape(event.name)}",
+        f"LOCATION:{escape(where)}",
+    ]
+    if college.email:
+        lines.append(f"ORGANIZER;CN={quote_param(college.college_name)}:mailto:{college.email}")
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape(event.description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def stream_calendar(events, name, host, flush_events=50):
+    """
+    Text chunks of a VCALENDAR holding `events` (a queryset with the college
+    selected), read with `.iterator()`.
+    """
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape(name)}",
+    ]
+    yield "".join(fold(line) for line in header)
+
+    chunk, pending = [], 0
+    for event in events.iterator(chunk_size=ICS_CHUNK_SIZE):
+        chunk.extend(fold(line) for line in vevent(event, host))
+        pending += 1
+        if pending >= flush_events:
+            yield "".join(chunk)
+            chunk, pending = [], 0
+    chunk.append(fold("END:VCALENDAR"))
+    yield "".join(chunk)
+
+
+class ICalendarRenderer(BaseRenderer):
+    """
+    Lets calendar clients (`Accept: text/calendar`) reach the calendar view.
+    The view streams the calendar itself; only error bodies pass through
+    here, and they are written as JSON text.
+    """
+    media_type = "text/calendar"
+    format = "ics"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return JSONEncoder(ensure_ascii=False).encode(data).encode(self.charset)
@@ -0,0 +1,267 @@
+"""
+In-process bitmap facet index for the college list.
+
+For every facet (state, district, college_type, ...) the index maps each
+value to a bitset of college ids, held as a Python int where bit N is set
+when college N carries the value. A filtered listing then resolves by
+OR-ing the bitsets of the requested values of a facet and AND-ing across
+facets, and facet counts are `popcount(value_bits & selection_bits)`.
+
+The index is loaded once per worker (EDUCATION_PIONEER/wsgi.py warms it up,
+otherwise the first use loads it) from the CollegeProfile table alone: the
+course facets come from the denormalized course_* columns, so loading needs
+no JOIN. Signals keep it current incrementally; a version counter in the
+database (CatalogVersion, see College/caching.py) tells every other process
+(workers, management commands) when it missed a change and must reload.
+That counter is read at most once per request (caching.request_catalog_version).
+"""
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from . import caching
+from .models import CollegeProfile
+
+
+# facet name -> (CollegeProfile column, kind)
+#   "text"   single free-text value, matched case-insensitively
+#   "packed" multi-valued ",a,b," course facet column
+#   "bool"   boolean flag
+FACETS = {
+    "state": ("state", "text"),
+    "district": ("district", "text"),
+    "college_type": ("college_type", "text"),
+    "accreditation_body": ("accreditation_body", "text"),
+    "main_stream": ("course_streams", "packed"),
+    "degree": ("course_degrees", "packed"),
+    "level": ("course_levels", "packed"),
+    "verified": ("verified", "bool"),
+    "is_popular": ("is_popular", "bool"),
+    "is_featured": ("is_featured", "bool"),
+}
+
+# Facets with a fixed vocabulary (choices, course facets, flags). Only these
+# filter the college list through the index: the free-text ones (state,
+# district, accreditation body) keep the list's SQL semantics (canonical
+# locations, substring match) whatever values happen to be in the data.
+CLOSED_FACETS = ("college_type", "main_stream", "degree", "level", "verified", "is_popular", "is_featured")
+
+VERSION_CATALOG = "college-facets"
+
+# Selections larger than this are left to SQL: an id list that long costs
+# more to send to the database than the plain WHERE clause it replaces.
+MAX_SELECTION_SIZE = getattr(settings, "COLLEGE_FACET_MAX_SELECTION", 2000)
+
+_TRUE_VALUES = {"true", "1", "yes", "on"}
+_FALSE_VALUES = {"false", "0", "no", "off"}
+
+
+def normalize(facet, value):
+    """Key under which `value` is stored for `facet` (None if unusable)."""
+    if FACETS[facet][1] == "bool":
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        value = str(value).strip().lower()
+        if value in _TRUE_VALUES:
+            return "true"
+        if value in _FALSE_VALUES:
+            return "false"
+        return None
+    value = str(value or "").strip().casefold()
+    return value or None
+
+
+def split_values(raw):
+    """`engineering,medical` -> ["engineering", "medical"]."""
+    return [value.strip() for value in str(raw).split(",") if value.strip()]
+
+
+def iter_bits(bitmap):
+    """Yield the positions of the set bits of `bitmap`, lowest first."""
+    bits = bin(bitmap)[:1:-1]
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class FacetIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self.all_ids = 0
+        self.bitmaps = {facet: {} for facet in FACETS}
+        self.labels = {facet: {} for facet in FACETS}
+        self.rows = {}
+
+    # --- Loading & maintenance ---
+    def _row_keys(self, row):
+        """{facet: {key: label}} for one row of CollegeProfile values."""
+        keys = {}
+        for facet, (column, kind) in FACETS.items():
+            value = row[column]
+            if kind == "packed":
+                labels = CollegeProfile.facet_values(value)
+            else:
+                labels = [value]
+            keys[facet] = {}
+            for label in labels:
+                key = normalize(facet, label)
+                if key is not None:
+                    keys[facet][key] = label
+        return keys
+
+    def _add(self, college_id, keys):
+        bit = 1 << college_id
+        self.all_ids |= bit
+        for facet, values in keys.items():
+            for key, label in values.items():
+                self.bitmaps[facet][key] = self.bitmaps[facet].get(key, 0) | bit
+                self.labels[facet].setdefault(key, label)
+        self.rows[college_id] = keys
+
+    def _discard(self, college_id):
+        keys = self.rows.pop(college_id, None)
+        if keys is None:
+            return
+        bit = 1 << college_id
+        self.all_ids &= ~bit
+        for facet, values in keys.items():
+            for key in values:
+                remaining = self.bitmaps[facet].get(key, 0) & ~bit
+                if remaining:
+                    self.bitmaps[facet][key] = remaining
+                else:
+                    self.bitmaps[facet].pop(key, None)
+                    self.labels[facet].pop(key, None)
+
+    def _fetch(self, queryset):
+        columns = sorted({column for column, _ in FACETS.values()})
+        return queryset.values("id", *columns)
+
+    def load(self):
+        """(Re)build the whole index from the database."""
+        with self._lock:
+            self.all_ids = 0
+            self.bitmaps = {facet: {} for facet in FACETS}
+            self.labels = {facet: {} for facet in FACETS}
+            self.rows = {}
+            version = caching.catalog_version(VERSION_CATALOG)[0]
+            for row in self._fetch(CollegeProfile.objects.order_by()).iterator(chunk_size=2000):
+                self._add(row["id"], self._row_keys(row))
+            self._version = version
+            self._loaded = True
+
+    def _ensure_current(self):
+        """Load on first use, reload if another worker changed the catalog."""
+        if not self._loaded or caching.request_catalog_version(VERSION_CATALOG) != self._version:
+            self.load()
+
+    def _bump_version(self):
+        """Record a local change; keep our version only if we missed nothing."""
+        caching.bump_catalog_version(VERSION_CATALOG)
+        new_version = caching.catalog_version(VERSION_CATALOG)[0]
+        if self._version is not None and new_version == self._version + 1:
+            self._version = new_version
+        else:
+            self._loaded = False
+
+    def update_college(self, college_id):
+        """Re-read one college from the database and refresh its bits."""
+        with self._lock:
+            if self._loaded:
+                row = self._fetch(CollegeProfile.objects.filter(pk=college_id)).first()
+                self._discard(college_id)
+                if row is not None:
+                    self._add(college_id, self._row_keys(row))
+            self._bump_version()
+
+    def invalidate(self):
+        """Force a reload here and in every other worker (after bulk updates)."""
+        with self._lock:
+            self._loaded = False
+            self._bump_version()
+
+    def remove_college(self, college_id):
+        with self._lock:
+            if self._loaded:
+                self._discard(college_id)
+            self._bump_version()
+
+    # --- Queries ---
+    def parse(self, params):
+        """
+        Pick the facet filters out of query `params`.
+
+        Returns ``{facet: [key, ...]}`` for every facet whose values are all
+        exact (case-insensitive) index keys. Facets holding a value the
+        index does not know (e.g. a partial state name) are left out so the
+        caller can fall back to the SQL filter for them.
+        """
+        if not any(params.get(facet) not in (None, "") for facet in FACETS):
+            return {}
+
+        with self._lock:
+            self._ensure_current()
+            selection = {}
+            for facet in FACETS:
+                raw = params.get(facet)
+                if raw in (None, ""):
+                    continue
+                keys = [normalize(facet, value) for value in split_values(raw)]
+                if keys and all(key is not None and key in self.bitmaps[facet] for key in keys):
+                    selection[facet] = keys
+                elif keys and FACETS[facet][1] in ("bool", "packed") and all(key is not None for key in keys):
+                    # Fixed vocabularies: an unknown value simply matches nothing.
+                    selection[facet] = keys
+            return selection
+
+    def select(self, selection):
+        """Bitset of the colleges matching `selection` (OR within, AND across facets)."""
+        with self._lock:
+            self._ensure_current()
+            result = self.all_ids
+            for facet, keys in selection.items():
+                matched = 0
+                for key in keys:
+                    matched |= self.bitmaps[facet].get(key, 0)
+                result &= matched
+            return result
+
+    def ids(self, selection):
+        """Sorted college ids matching `selection`."""
+        return list(iter_bits(self.select(selection)))
+
+    def counts(self, selection):
+        """
+        ``{facet: {label: count}}`` for the current selection.
+
+        Each facet is counted against the selection *without* its own filter,
+        so picking `main_stream=engineering` still shows how many colleges
+        each other stream would add.
+        """
+        with self._lock:
+            self._ensure_current()
+            result = {}
+            for facet in FACETS:
+                base = self.select({f: keys for f, keys in selection.items() if f != facet})
+                facet_counts = {}
+                for key, bitmap in self.bitmaps[facet].items():
+                    count = (bitmap & base).bit_count()
+                    if count or key in selection.get(facet, ()):
+                        facet_counts[self.labels[facet][key]] = count
+                result[facet] = facet_counts
+            return result
+
+
+index = FacetIndex()
+
+
+def warm_up():
+    """Load the index at worker start; tolerate a database that is not ready yet."""
+    try:
+        index.load()
+    except DatabaseError:
+        pass
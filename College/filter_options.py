@@ -0,0 +1,109 @@
+"""
+Dropdown options for the college filters (`/api/colleges/filters/`).
+
+Each option list is computed on first use with a single GROUP BY query that
+yields both the values and how many colleges carry each value, and the
+result is cached per option. Nothing is recomputed until a save or delete
+touches one of the fields the option is built from (see College/signals.py),
+at which point only the affected options are invalidated.
+
+Every option has a version (a CatalogVersion row, see College/caching.py)
+that is part of its cache key. Invalidating bumps the version, so every
+worker, whatever its cache backend, stops reading the old snapshot at
+once; the orphaned entries simply expire. Reading the versions of the
+requested options costs one small query.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import caching
+from .models import CollegeProfile, Course
+
+
+CACHE_PREFIX = "college:filter-options:"
+CATALOG_PREFIX = "filter-options:"
+
+# Lifetime of a snapshot; a bumped version orphans it before then.
+CACHE_TIMEOUT = getattr(settings, "FILTER_OPTIONS_CACHE_TIMEOUT", 60 * 60)
+
+
+class FilterOption:
+    """One dropdown: the distinct values of `field` on `model`."""
+
+    def __init__(self, model, field, choices=None, exclude_blank=False):
+        self.model = model
+        self.field = field
+        self.choices = choices
+        self.exclude_blank = exclude_blank
+
+    def compute(self):
+        """Return ``[(value, college_count), ...]``."""
+        queryset = self.model.objects.order_by()
+        if self.exclude_blank:
+            queryset = queryset.exclude(**{f"{self.field}__isnull": True}).exclude(**{self.field: ""})
+
+        if self.model is Course:
+            counter = Count("college", distinct=True)
+        else:
+            counter = Count("pk")
+        counts = dict(queryset.values_list(self.field).annotate(count=counter))
+
+        if self.choices is not None:
+            # Fixed vocabularies list every choice, even those not offered yet.
+            return [(value, counts.get(value, 0)) for value, _ in self.choices]
+        return sorted(counts.items(), key=lambda item: (item[0] or ""))
+
+
+FILTER_OPTIONS = {
+    "countries": FilterOption(CollegeProfile, "country"),
+    "states": FilterOption(CollegeProfile, "state"),
+    "districts": FilterOption(CollegeProfile, "district"),
+    "accreditation_bodies": FilterOption(CollegeProfile, "accreditation_body", exclude_blank=True),
+    "course_levels": FilterOption(Course, "level", choices=Course.COURSE_LEVEL_CHOICES),
+    "main_streams": FilterOption(Course, "main_stream", choices=Course.MAIN_STREAM_CHOICES),
+    "degrees": FilterOption(Course, "degree", choices=Course.DEGREE_CHOICES),
+    "specializations": FilterOption(Course, "specialization", exclude_blank=True),
+}
+
+
+def _catalog(name):
+    return f"{CATALOG_PREFIX}{name}"
+
+
+def _cache_key(name, version):
+    return f"{CACHE_PREFIX}{name}:{version}"
+
+
+def get_options(*names):
+    """
+    Return ``{name: [(value, count), ...]}`` for the requested options,
+    computing and caching only the ones missing from the cache.
+    """
+    names = names or tuple(FILTER_OPTIONS)
+    versions = caching.catalog_versions([_catalog(name) for name in names])
+    keys = {name: _cache_key(name, versions[_catalog(name)]) for name in names}
+    cached = cache.get_many(list(keys.values()))
+
+    result = {}
+    for name in names:
+        snapshot = cached.get(keys[name])
+        if snapshot is None:
+            snapshot = FILTER_OPTIONS[name].compute()
+            cache.set(keys[name], snapshot, CACHE_TIMEOUT)
+        result[name] = snapshot
+    return result
+
+
+def options_for_fields(model, fields=None):
+    """Names of the options built from `model` (optionally only from `fields`)."""
+    return [
+        name for name, option in FILTER_OPTIONS.items()
+        if option.model is model and (fields is None or option.field in fields)
+    ]
+
+
+def invalidate(names):
+    """Retire the cached snapshots of the given options, in every worker."""
+    for name in names:
+        caching.bump_catalog_version(_catalog(name))
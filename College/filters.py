@@ -0,0 +1,155 @@
+from functools import reduce
+import operator
+
+from django.db.models import Case, IntegerField, Q, Value, When
+from django_filters import CharFilter
+from rest_framework import filters
+
+from . import fuzzy, locations, search
+
+
+def rank_by(queryset, ranked_ids):
+    """Restrict to `ranked_ids` and annotate each row's position as `search_rank`."""
+    rank = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked_ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ranked_ids).annotate(search_rank=rank)
+
+
+class FuzzySearchFilter(filters.SearchFilter):
+    """
+    SearchFilter with a typo-tolerant mode: `?search=technolgy&search_mode=fuzzy`.
+
+    In fuzzy mode the terms go through the trigram indexes of
+    College/fuzzy.py and the near-matches come back annotated with
+    `search_rank` (0 = closest). Otherwise this is the plain SearchFilter.
+
+    The hits are checked against the queryset as it stands (the view's
+    scoping and the other filters) best first, in batches, until
+    FUZZY_RESULT_LIMIT of them are known to be in it. When more matched,
+    the rest are dropped and `view.search_result_limit` is set, which
+    SearchResultLimitMixin reports in the `X-Search-Result-Limit` response
+    header.
+    """
+    search_mode_param = "search_mode"
+    # First batch of hits checked against the queryset; each next one doubles, up to the cap.
+    scope_batch_size = 1000
+    max_scope_batch_size = 16000
+
+    def is_fuzzy(self, request):
+        return request.query_params.get(self.search_mode_param) == "fuzzy"
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not self.is_fuzzy(request) or queryset.model not in fuzzy.SEARCHES:
+            return super().filter_queryset(request, queryset, view)
+
+        limit = fuzzy.FUZZY_RESULT_LIMIT
+        hits = [pk for pk, _ in fuzzy.SEARCHES[queryset.model](" ".join(search_terms))]
+        kept, start, size = [], 0, self.scope_batch_size
+        while start < len(hits) and len(kept) <= limit:
+            batch = hits[start:start + size]
+            in_scope = set(queryset.order_by().filter(pk__in=batch).values_list("pk", flat=True))
+            kept.extend(pk for pk in batch if pk in in_scope)
+            start += size
+            size = min(size * 2, self.max_scope_batch_size)
+        if len(kept) > limit:
+            kept = kept[:limit]
+            view.search_result_limit = limit
+        if not kept:
+            return queryset.none()
+        return rank_by(queryset, kept)
+
+
+class SearchResultLimitMixin:
+    """Marks responses whose fuzzy search hits were cut off (see FuzzySearchFilter)."""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        limit = getattr(self, "search_result_limit", None)
+        if limit is not None:
+            response["X-Search-Result-Limit"] = str(limit)
+        return response
+
+
+class FullTextSearchFilter(FuzzySearchFilter):
+    """
+    `?search=` backed by the college full-text index.
+
+    Every matching college is kept (ranking, COUNT and pagination run in
+    SQL) and annotated with its bm25 `search_rank` (lower is better). The
+    search text is left on `view.search_text` so the view can fetch the
+    highlighted snippets of the rows it returns. When the index is
+    unavailable the regular `icontains` SearchFilter over `search_fields`
+    is used instead. `?search_mode=fuzzy` switches to the typo-tolerant
+    trigram search.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if self.is_fuzzy(request) or not search_terms:
+            return super().filter_queryset(request, queryset, view)
+
+        query = " ".join(search_terms)
+        matched = search.matching(queryset, query)
+        if matched is None:
+            return super().filter_queryset(request, queryset, view)
+        view.search_text = query
+        return matched
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that orders search results by relevance, and `near=`
+    results by distance, unless the client asked for an explicit `?ordering=`.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param):
+            if "search_rank" in queryset.query.annotations:
+                return ["search_rank"]
+            if "distance_km" in queryset.query.annotations:
+                return ["distance_km"]
+        return super().get_ordering(request, queryset, view)
+
+
+class AnyOfCharFilter(CharFilter):
+    """
+    CharFilter accepting comma-separated values that are ORed together,
+    e.g. `?state=Karnataka,Goa`.
+    """
+
+    def filter(self, qs, value):
+        values = [item.strip() for item in (value or "").split(",") if item.strip()]
+        if not values:
+            return qs
+        lookup = f"{self.field_name}__{self.lookup_expr}"
+        condition = reduce(operator.or_, (Q(**{lookup: item}) for item in values))
+        return self.get_method(qs)(condition)
+
+
+class LocationFilter(AnyOfCharFilter):
+    """
+    Location filter resolved through the canonical location tables.
+
+    Every comma-separated value is looked up by its normalized key (aliases
+    included) and the filter becomes `<level>_ref_id IN (...)`, an indexed
+    integer match. If any value is unknown to the tables the filter falls
+    back to the text `lookup_expr` on `field_name`. `ref_field` names the
+    reference column when it is not `<level>_ref` on the filtered model.
+    """
+
+    def __init__(self, *args, level=None, ref_field=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.level = level or self.field_name
+        self.ref_field = ref_field or f"{self.level}_ref"
+
+    def filter(self, qs, value):
+        values = [item.strip() for item in (value or "").split(",") if item.strip()]
+        if not values:
+            return qs
+        ids = [locations.matching_ids(self.level, item) for item in values]
+        if not all(ids):
+            return super().filter(qs, value)
+        return self.get_method(qs)(**{f"{self.ref_field}__in": set().union(*ids)})
@@ -0,0 +1,355 @@
+"""
+Typo-tolerant (trigram) search over college names and course specializations.
+
+Each indexed text is split into words, and every distinct word is broken
+into padded trigrams ("  m", " ma", "mad", ..., "as "), the same scheme as
+PostgreSQL's pg_trgm. Two words are similar when the Jaccard overlap of
+their trigram sets reaches FUZZY_SIMILARITY, so "technolgy" still finds
+"technology" and "madrs" finds "madras".
+
+Lookups never compare the query against every word. Candidate words come
+from the postings of the query's rarest trigrams only (a word that shares
+too few of them cannot reach the threshold), and only those candidates are
+scored. A document matches when each query word has a similar word in it;
+its score is the mean similarity.
+
+Like the facet index (College/facets.py) the indexes live in process
+memory, load on first use and are kept current from signals, with a
+version counter in the database (CatalogVersion) that tells other
+processes to reload.
+"""
+import bisect
+import math
+import re
+import threading
+from array import array
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from . import caching
+from .facets import iter_bits
+from .models import CollegeProfile, Course
+
+
+# Minimum trigram similarity (0..1) for two words to count as a match.
+FUZZY_SIMILARITY = getattr(settings, "COLLEGE_FUZZY_SIMILARITY", 0.3)
+
+# Upper bound on the ranked hits a fuzzy search returns, counted after the
+# view's scoping and other filters (see FuzzySearchFilter).
+FUZZY_RESULT_LIMIT = getattr(settings, "COLLEGE_FUZZY_RESULT_LIMIT", 500)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def words(text):
+    """Distinct case-folded words of `text`, in order."""
+    return list(dict.fromkeys(_WORD_RE.findall(str(text or "").casefold())))
+
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(grams_a, grams_b):
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared) if shared else 0.0
+
+
+class TrigramIndex:
+    """
+    Fuzzy word index over one text column.
+
+    `source()` returns an iterable of ``(doc_id, text, owner_id)`` rows;
+    `owner_id` lets course hits be rolled up to their college.
+
+    Every document gets a dense slot number (freed slots are reused), and
+    postings are sorted arrays of slots, so a rare word costs a few bytes
+    however high its document's id. Queries turn the postings they touch
+    into bitsets over the slots (Python ints, bit N set for slot N) as in
+    the facet index.
+    """
+
+    def __init__(self, name, source, fetch_one):
+        self.name = name
+        self.source = source
+        self.fetch_one = fetch_one
+        self.version_catalog = f"college-fuzzy:{name}"
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._reset()
+
+    def _reset(self):
+        self.all_ids = 0      # bitset of the occupied slots
+        self.slots = {}       # doc id -> slot
+        self.slot_docs = []   # slot -> doc id (None when free)
+        self.free_slots = []
+        self.docs = {}        # doc id -> tuple of words
+        self.owners = {}      # doc id -> owner id
+        self.postings = {}    # word -> sorted array of slots
+        self.word_grams = {}  # word -> frozenset of trigrams
+        self.gram_words = {}  # trigram -> set of words
+
+    # --- Loading & maintenance ---
+    def _add(self, doc_id, text, owner_id=None):
+        doc_words = tuple(words(text))
+        if not doc_words:
+            return
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.slot_docs[slot] = doc_id
+        else:
+            slot = len(self.slot_docs)
+            self.slot_docs.append(doc_id)
+        self.slots[doc_id] = slot
+        self.all_ids |= 1 << slot
+        self.docs[doc_id] = doc_words
+        if owner_id is not None:
+            self.owners[doc_id] = owner_id
+        for word in doc_words:
+            if word not in self.postings:
+                self.postings[word] = array("I")
+                grams = self.word_grams[word] = frozenset(trigrams(word))
+                for gram in grams:
+                    self.gram_words.setdefault(gram, set()).add(word)
+            bisect.insort(self.postings[word], slot)
+
+    def _discard(self, doc_id):
+        doc_words = self.docs.pop(doc_id, ())
+        self.owners.pop(doc_id, None)
+        slot = self.slots.pop(doc_id, None)
+        if slot is None:
+            return
+        self.all_ids &= ~(1 << slot)
+        self.slot_docs[slot] = None
+        self.free_slots.append(slot)
+        for word in doc_words:
+            slots = self.postings[word]
+            del slots[bisect.bisect_left(slots, slot)]
+            if slots:
+                continue
+            del self.postings[word]
+            for gram in self.word_grams.pop(word):
+                self.gram_words[gram].discard(word)
+                if not self.gram_words[gram]:
+                    del self.gram_words[gram]
+
+    def load(self):
+        with self._lock:
+            self._reset()
+            version = caching.catalog_version(self.version_catalog)[0]
+            for doc_id, text, owner_id in self.source():
+                self._add(doc_id, text, owner_id)
+            self._version = version
+            self._loaded = True
+
+    def _ensure_current(self):
+        if not self._loaded or caching.catalog_version(self.version_catalog)[0] != self._version:
+            self.load()
+
+    def _bump_version(self):
+        caching.bump_catalog_version(self.version_catalog)
+        new_version = caching.catalog_version(self.version_catalog)[0]
+        if self._version is not None and new_version == self._version + 1:
+            self._version = new_version
+        else:
+            self._loaded = False
+
+    def update(self, doc_id):
+        """Re-read one document from the database."""
+        with self._lock:
+            if self._loaded:
+                self._discard(doc_id)
+                row = self.fetch_one(doc_id)
+                if row is not None:
+                    self._add(doc_id, *row)
+            self._bump_version()
+
+    def remove(self, doc_id):
+        with self._lock:
+            if self._loaded:
+                self._discard(doc_id)
+            self._bump_version()
+
+    def invalidate(self):
+        """Force a reload here and in every other worker (after bulk updates)."""
+        with self._lock:
+            self._loaded = False
+            self._bump_version()
+
+    # --- Queries ---
+    def similar_words(self, word):
+        """``{indexed word: similarity}`` for the words close to `word`."""
+        grams = trigrams(word)
+        # Similarity is at most shared / len(grams), so a match must share
+        # `needed` trigrams and therefore at least one of the rarest
+        # len(grams) - needed + 1 of them.
+        needed = max(1, math.ceil(FUZZY_SIMILARITY * len(grams)))
+        ranked = sorted(grams, key=lambda gram: len(self.gram_words.get(gram, ())))
+        candidates = set()
+        for gram in ranked[:len(grams) - needed + 1]:
+            candidates.update(self.gram_words.get(gram, ()))
+
+        result = {}
+        for candidate in candidates:
+            score = similarity(grams, self.word_grams[candidate])
+            if score >= FUZZY_SIMILARITY:
+                result[candidate] = score
+        return result
+
+    def _bitset(self, words):
+        """Bitset of the slots of the documents holding any of `words`."""
+        bits = bytearray((len(self.slot_docs) + 7) // 8)
+        for word in words:
+            for slot in self.postings[word]:
+                bits[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(bits, "little")
+
+    def _levels(self, similar):
+        """
+        ``{similarity: bitset}`` placing every document that contains one of
+        the `similar` words at the similarity of its closest such word.
+        """
+        by_score = {}
+        for word, score in similar.items():
+            by_score.setdefault(round(score, 2), []).append(word)
+        levels = {}
+        seen = 0
+        for score in sorted(by_score, reverse=True):
+            bits = self._bitset(by_score[score]) & ~seen
+            if bits:
+                levels[score] = bits
+                seen |= bits
+        return levels
+
+    def search(self, text, limit=None):
+        """
+        ``[(doc id, score), ...]`` best first, for the documents holding a
+        word similar to every word of `text`; score is the mean similarity.
+        At most `limit` hits when given.
+
+        Documents are grouped by their summed similarity and each group is
+        a bitset, so even a query matching most of the index costs a few
+        big-integer ANDs rather than a per-document loop.
+        """
+        query_words = words(text)
+        if not query_words:
+            return []
+        with self._lock:
+            self._ensure_current()
+            totals = {0.0: self.all_ids}
+            for word in query_words:
+                levels = self._levels(self.similar_words(word))
+                combined = {}
+                for total, docs in totals.items():
+                    for score, bits in levels.items():
+                        both = docs & bits
+                        if both:
+                            key = round(total + score, 2)
+                            combined[key] = combined.get(key, 0) | both
+                totals = combined
+                if not totals:
+                    return []
+
+            results = []
+            for total in sorted(totals, reverse=True):
+                for doc_id in sorted(self.slot_docs[slot] for slot in iter_bits(totals[total])):
+                    results.append((doc_id, total / len(query_words)))
+                    if limit is not None and len(results) >= limit:
+                        return results
+            return results
+
+    def owner_scores(self, hits):
+        """Roll ``[(doc id, score), ...]`` up to ``{owner id: best score}``."""
+        result = {}
+        for doc_id, score in hits:
+            owner_id = self.owners.get(doc_id)
+            if owner_id is not None and score > result.get(owner_id, 0):
+                result[owner_id] = score
+        return result
+
+
+def _college_rows():
+    return (
+        (college_id, name, None)
+        for college_id, name in CollegeProfile.objects.order_by().values_list("id", "college_name").iterator(chunk_size=2000)
+    )
+
+
+def _college_row(college_id):
+    name = CollegeProfile.objects.filter(pk=college_id).values_list("college_name", flat=True).first()
+    return None if name is None else (name, None)
+
+
+def _course_rows():
+    return (
+        Course.objects.order_by()
+        .exclude(specialization__isnull=True)
+        .values_list("id", "specialization", "college__id")
+        .iterator(chunk_size=2000)
+    )
+
+
+def _course_row(course_id):
+    return (
+        Course.objects
+        .filter(pk=course_id)
+        .exclude(specialization__isnull=True)
+        .values_list("specialization", "college__id")
+        .first()
+    )
+
+
+college_names = TrigramIndex("college_names", _college_rows, _college_row)
+specializations = TrigramIndex("specializations", _course_rows, _course_row)
+
+
+def _ranked(scores, limit):
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return ranked if limit is None else ranked[:limit]
+
+
+def search_colleges(text, limit=None):
+    """
+    ``[(college_id, score), ...]`` best first, for colleges whose name or
+    one of whose course specializations fuzzily matches `text`.
+    """
+    scores = dict(college_names.search(text, limit))
+    for college_id, score in specializations.owner_scores(specializations.search(text, limit)).items():
+        if score > scores.get(college_id, 0):
+            scores[college_id] = score
+    return _ranked(scores, limit)
+
+
+def search_courses(text, limit=None):
+    """
+    ``[(course_id, score), ...]`` best first, for courses whose
+    specialization or college name fuzzily matches `text`.
+    """
+    scores = dict(specializations.search(text, limit))
+    college_scores = dict(college_names.search(text, limit))
+    if college_scores:
+        # Colleges matched by name contribute all of their courses.
+        rows = Course.objects.filter(college__id__in=college_scores).values_list("id", "college__id")
+        for course_id, college_id in rows:
+            score = college_scores[college_id]
+            if score > scores.get(course_id, 0):
+                scores[course_id] = score
+    return _ranked(scores, limit)
+
+
+SEARCHES = {
+    CollegeProfile: search_colleges,
+    Course: search_courses,
+}
+
+
+def warm_up():
+    """Load both indexes at worker start; tolerate a database that is not ready yet."""
+    try:
+        college_names.load()
+        specializations.load()
+    except DatabaseError:
+        pass
@@ -0,0 +1,128 @@
+"""
+Pin-code coordinates and radius queries for "colleges near me".
+
+Coordinates come from the PinCode table, seeded with the centroids bundled
+in College/data/pincode_centroids.csv (a full postal directory can be
+loaded with `manage.py load_pincodes`). A pin code that is not in the
+table falls back to the mean centroid of its 3-digit sorting district.
+
+Every college stores the coordinates of its pin_code. A radius query first
+narrows the candidates with a latitude/longitude bounding box, served by
+the (latitude, longitude) index. The exact great-circle distance is then
+computed only for the colleges inside the box.
+"""
+import csv
+import math
+import re
+
+from django.db.models import Avg, F
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+from .models import CollegeProfile, PinCode
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.045
+
+# Largest radius accepted by the `near=` filter.
+MAX_RADIUS_KM = 500
+
+_NON_DIGIT = re.compile(r"\D+")
+
+
+def normalize_pincode(value):
+    """'600 036' -> '600036'; None unless six digits remain."""
+    digits = _NON_DIGIT.sub("", str(value or ""))
+    return digits if len(digits) == 6 else None
+
+
+def locate(pincode):
+    """``(latitude, longitude)`` of a pin code, or None when unknown."""
+    code = normalize_pincode(pincode)
+    if code is None:
+        return None
+    row = PinCode.objects.filter(code=code).values_list("latitude", "longitude").first()
+    if row is not None:
+        return row
+    area = PinCode.objects.filter(code__startswith=code[:3]).aggregate(
+        latitude=Avg("latitude"), longitude=Avg("longitude")
+    )
+    if area["latitude"] is None:
+        return None
+    return area["latitude"], area["longitude"]
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """``(min_lat, max_lat, min_lon, max_lon)`` enclosing the radius circle."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    delta_lon = 180.0 if cos_lat < 1e-6 else min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+    return latitude - delta_lat, latitude + delta_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def distance_expression(latitude, longitude):
+    """Haversine distance in km from the given point to each row's coordinates."""
+    lat0 = math.radians(latitude)
+    lon0 = math.radians(longitude)
+    half_dlat = (Radians(F("latitude")) - lat0) / 2
+    half_dlon = (Radians(F("longitude")) - lon0) / 2
+    a = Power(Sin(half_dlat), 2) + math.cos(lat0) * Cos(Radians(F("latitude"))) * Power(Sin(half_dlon), 2)
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+
+def within_radius(queryset, latitude, longitude, radius_km):
+    """
+    Colleges within `radius_km` of the point, annotated with `distance_km`.
+    The bounding box is applied first so the distance is only computed for
+    the rows the index lets through.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    return (
+        queryset
+        .filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+        .annotate(distance_km=distance_expression(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+    )
+
+
+def set_college_coordinates(college):
+    """Fill `college.latitude/longitude` from its pin code (None when unknown)."""
+    point = locate(college.pin_code)
+    college.latitude, college.longitude = point if point is not None else (None, None)
+
+
+def refresh_college_coordinates():
+    """Recompute the coordinates of every college, e.g. after loading pin codes."""
+    updated = 0
+    for college_id, pin_code in CollegeProfile.objects.values_list("id", "pin_code").iterator(chunk_size=2000):
+        point = locate(pin_code) or (None, None)
+        CollegeProfile.objects.filter(pk=college_id).update(latitude=point[0], longitude=point[1])
+        updated += 1
+    return updated
+
+
+def read_centroids(path):
+    """
+    ``{pincode: (latitude, longitude, office)}`` from a CSV with `pincode`,
+    `latitude` and `longitude` columns (header names are case-insensitive,
+    so the India Post directory export works as is). Offices sharing a pin
+    code are averaged; rows without usable coordinates are skipped.
+    """
+    sums = {}
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+            code = normalize_pincode(row.get("pincode"))
+            try:
+                latitude = float(row.get("latitude", ""))
+                longitude = float(row.get("longitude", ""))
+            except ValueError:
+                continue
+            if code is None or not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                continue
+            total = sums.setdefault(code, [0.0, 0.0, 0, row.get("office") or row.get("officename") or ""])
+            total[0] += latitude
+            total[1] += longitude
+            total[2] += 1
+    return {code: (lat / count, lon / count, office) for code, (lat, lon, count, office) in sums.items()}
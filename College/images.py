@@ -0,0 +1,265 @@
+"""
+Upload normalization and resized variants of college images.
+
+Uploads to the image fields in IMAGE_FIELDS (logos, gallery images, faculty
+photos, event images) and hostel images are re-encoded before they are
+stored:
+- EXIF orientation is applied and the metadata dropped.
+- The image is cut to IMAGE_MAX_DIMENSION on its longer side.
+- It is recompressed at IMAGE_QUALITY.
+
+After the row is committed, a small thread pool writes scaled-down copies
+of each stored image at IMAGE_VARIANT_WIDTHS, in the original's format
+(PNG when it has transparency, JPEG otherwise) and as WebP. Like every
+upload they are content-addressed blobs (`blobs/ab/cd/<sha256>.<ext>`, see
+College/storage.py), so identical variants are stored once. Their names
+are recorded in the row's `image_variants` column:
+
+    {"<original storage name>": {"width": 4000, "height": 3000,
+                                 "sizes": [{"width": 320, "src": ..., "webp": ...}, ...]}}
+
+Serializers turn an entry into `srcset` strings (see ImageVariantsMixin).
+It is keyed by the original's name, so replacing an image makes the old
+entry stale rather than wrong. The next run drops the stale entry and
+deletes its files. The record is written with update() so no model signals
+fire, and the public college document is rebuilt afterwards.
+
+`build_image_variants` runs the same pipeline over existing rows.
+"""
+import io
+import logging
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import CollegeProfile, Event, Faculty, Gallery, Hostel
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MAX_DIMENSION = getattr(settings, "COLLEGE_IMAGE_MAX_DIMENSION", 2560)
+IMAGE_QUALITY = getattr(settings, "COLLEGE_IMAGE_QUALITY", 82)
+IMAGE_VARIANT_WIDTHS = tuple(getattr(settings, "COLLEGE_IMAGE_VARIANT_WIDTHS", (320, 640, 1280)))
+# 0 builds variants inline (after commit) instead of on the thread pool.
+IMAGE_PIPELINE_WORKERS = getattr(settings, "COLLEGE_IMAGE_PIPELINE_WORKERS", 2)
+
+# model -> image fields whose uploads are normalized and get variants
+IMAGE_FIELDS = {
+    CollegeProfile: ("college_logo", "college_image"),
+    Event: ("image",),
+    Gallery: ("file",),
+    Faculty: ("photo",),
+}
+
+# Pillow formats that are re-encoded; anything else (GIF, video, PDF) is left alone.
+_NORMALIZED_FORMATS = {"JPEG": "JPEG", "MPO": "JPEG", "PNG": "PNG", "WEBP": "WEBP"}
+
+_executor = None
+
+
+def _has_alpha(image):
+    return image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+
+
+def _encode(image, fmt):
+    """Bytes of `image` in `fmt`, without any metadata."""
+    if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    elif fmt in ("PNG", "WEBP") and image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+        image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+    buffer = io.BytesIO()
+    if fmt == "JPEG":
+        image.save(buffer, "JPEG", quality=IMAGE_QUALITY, optimize=True, progressive=True)
+    elif fmt == "WEBP":
+        image.save(buffer, "WEBP", quality=IMAGE_QUALITY, method=4)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _open(file):
+    """Decoded Pillow image of `file` with EXIF orientation applied, or None if it is not an image."""
+    try:
+        file.seek(0)
+        image = Image.open(file)
+        image.load()
+    except (UnidentifiedImageError, OSError, ValueError, Image.DecompressionBombError):
+        return None
+    finally:
+        file.seek(0)
+    if getattr(image, "is_animated", False):
+        return None
+    return image
+
+
+def normalize(file):
+    """
+    Bytes of `file` (an upload) orientated, cut to IMAGE_MAX_DIMENSION and
+    re-encoded without metadata; None when it is not an image to normalize
+    or doing so would only make it bigger.
+    """
+    image = _open(file)
+    if image is None or image.format not in _NORMALIZED_FORMATS:
+        return None
+    fmt = _NORMALIZED_FORMATS[image.format]
+    had_metadata = bool(image.info.get("exif") or image.getexif())
+    image = ImageOps.exif_transpose(image)
+    resized = max(image.size) > IMAGE_MAX_DIMENSION
+    if resized:
+        image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION), Image.LANCZOS)
+
+    data = _encode(image, fmt)
+    if not resized and not had_metadata and len(data) >= (file.size or 0):
+        return None
+    return data
+
+
+def normalize_field(instance, field_name):
+    """Swap a pending upload on `instance.<field_name>` for its normalized bytes."""
+    field_file = getattr(instance, field_name)
+    if not field_file or field_file._committed:
+        return
+    data = normalize(field_file.file)
+    if data is not None:
+        setattr(instance, field_name, ContentFile(data, name=posixpath.basename(field_file.name)))
+
+
+def storage_name(url):
+    """Storage name of a media URL (absolute or not); None when it is not under MEDIA_URL."""
+    path = unquote(urlparse(url or "").path)
+    media_path = urlparse(settings.MEDIA_URL).path
+    if not path.startswith(media_path):
+        return None
+    return path[len(media_path):] or None
+
+
+def source_names(instance):
+    """Storage names of the images of `instance` that get variants."""
+    if isinstance(instance, Hostel):
+        return [name for name in map(storage_name, instance.images or []) if name]
+    if isinstance(instance, Gallery) and instance.media_type != "image":
+        return []
+    return [getattr(instance, field).name for field in IMAGE_FIELDS[type(instance)] if getattr(instance, field)]
+
+
+def build(name):
+    """Write the variants of stored image `name`; their record, or None if it cannot be read."""
+    try:
+        with default_storage.open(name) as file:
+            image = _open(file)
+    except OSError:
+        return None
+    if image is None:
+        return None
+    image = ImageOps.exif_transpose(image)
+    width, height = image.size
+    fmt, ext = ("PNG", "png") if _has_alpha(image) else ("JPEG", "jpg")
+    directory, base = posixpath.split(os.path.splitext(name)[0])
+
+    sizes = []
+    for target in [size for size in IMAGE_VARIANT_WIDTHS if size < width] or [width]:
+        scaled = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        stem = posixpath.join(directory, "variants", f"{base}-{target}w")
+        sizes.append({
+            "width": target,
+            "src": default_storage.save(f"{stem}.{ext}", ContentFile(_encode(scaled, fmt))),
+            "webp": default_storage.save(f"{stem}.webp", ContentFile(_encode(scaled, "WEBP"))),
+        })
+    return {"width": width, "height": height, "sizes": sizes}
+
+
+def _delete(entry):
+    for size in entry.get("sizes", ()):
+        for key in ("src", "webp"):
+            if size.get(key):
+                default_storage.delete(size[key])
+
+
+def process(model, pk):
+    """Bring the `image_variants` of one row in line with its current images."""
+    from . import caching, documents
+
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    names = source_names(instance)
+    current = instance.image_variants or {}
+    variants = {name: entry for name, entry in current.items() if name in names}
+    for name in names:
+        if name not in variants:
+            entry = build(name)
+            if entry is not None:
+                variants[name] = entry
+    if variants == current:
+        return
+
+    model.objects.filter(pk=pk).update(image_variants=variants)
+    for name, entry in current.items():
+        if name not in variants:
+            _delete(entry)
+
+    if model is CollegeProfile:
+        caching.bump_catalog_version()
+        documents.rebuild(pk=pk)
+    else:
+        documents.rebuild(pk=instance.college_id)
+
+
+def needs_variants(instance):
+    current = instance.image_variants or {}
+    names = source_names(instance)
+    return set(names) != set(current)
+
+
+def _run(model, pk):
+    try:
+        process(model, pk)
+    except Exception:
+        logger.exception("Building image variants of %s %s failed", model.__name__, pk)
+    finally:
+        connection.close()
+
+
+def schedule(instance):
+    """Build the variants of `instance` once the current transaction commits."""
+    model, pk = type(instance), instance.pk
+
+    def submit():
+        global _executor
+        if IMAGE_PIPELINE_WORKERS <= 0:
+            process(model, pk)
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IMAGE_PIPELINE_WORKERS, thread_name_prefix="image-variants")
+        _executor.submit(_run, model, pk)
+
+    transaction.on_commit(submit)
+
+
+def srcset(entry, key, url):
+    return ", ".join(f"{url(size[key])} {size['width']}w" for size in entry["sizes"] if size.get(key))
+
+
+def represent(entry, url):
+    """API shape of a variants record; `url` turns a storage name into a URL."""
+    if not entry:
+        return None
+    return {
+        "width": entry["width"],
+        "height": entry["height"],
+        "srcset": srcset(entry, "src", url),
+        "webp_srcset": srcset(entry, "webp", url),
+        "sizes": [
+            {"width": size["width"], "url": url(size["src"]), "webp": url(size["webp"])}
+            for size in entry["sizes"]
+        ],
+    }
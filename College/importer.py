@@ -0,0 +1,236 @@
+"""
+Bulk import of a college's courses, faculty members and events.
+
+Rows come from CSV (header row with field names) or NDJSON (one JSON
+object per line). One instance of the resource's serializer checks every
+row. It leaves out the fields the import fills in itself (`college`) and
+those a file cannot carry (file fields), so no row costs a query. Valid
+rows are written
+`IMPORT_BATCH_SIZE` at a time with one `bulk_create`:
+
+- Courses are upserted on their unique key (college, degree,
+  specialization, level). A row for an existing course updates its stream,
+  duration, fee, eligibility and description. When the same key appears
+  twice in one file, the last row wins. A blank specialization (NULL or
+  "") never conflicts in the unique index, so those rows are matched and
+  updated with a query each instead of the bulk upsert.
+- Faculty members and events have no natural key and are always inserted.
+
+`run()` yields one report entry per rejected row and a closing summary,
+so callers can stream the report while the import is still going. Bulk
+writes skip model signals, so everything the signals would maintain (course
+facets, search and in-memory indexes, caches, the public document) is
+refreshed once at the end.
+"""
+import codecs
+import csv
+import json
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from . import autocomplete, caching, course_catalog, documents, event_feed, facets, filter_options, fuzzy, search
+from .models import CollegeProfile, Course, Event, Faculty
+from .serializers import CourseSerializer, EventSerializer, FacultySerializer
+
+
+IMPORT_BATCH_SIZE = getattr(settings, "COLLEGE_IMPORT_BATCH_SIZE", 500)
+
+FORMATS = ("csv", "ndjson")
+
+# Serializer fields never read from an import file.
+SKIPPED_FIELDS = ("college", "college_code", "college_name", "brochure", "photo", "image")
+
+
+class ImportKind:
+    """How rows of one resource are validated and written."""
+
+    def __init__(self, model, serializer_class, unique_fields=None, update_fields=None):
+        self.model = model
+        self.serializer_class = serializer_class
+        self.unique_fields = unique_fields
+        self.update_fields = update_fields
+
+    @staticmethod
+    def _key(values):
+        # "" and NULL are the same blank value.
+        return tuple(None if value == "" else value for value in values)
+
+    def key(self, instance):
+        return self._key(getattr(instance, field) for field in self.unique_fields[1:])
+
+    def existing_keys(self, college):
+        if not self.unique_fields:
+            return set()
+        rows = self.model.objects.filter(college=college).values_list(*self.unique_fields[1:])
+        return {self._key(row) for row in rows}
+
+    def _update_blank_keyed(self, instance):
+        """Update the row `instance` stands for when a key field is blank; False if there is none."""
+        condition = Q()
+        for field in self.unique_fields:
+            value = getattr(instance, field)
+            if value is None or value == "":
+                condition &= Q(**{f"{field}__isnull": True}) | Q(**{field: ""})
+            else:
+                condition &= Q(**{field: value})
+        values = {field: self.model._meta.get_field(field).pre_save(instance, False) for field in self.update_fields}
+        return bool(self.model.objects.filter(condition).update(**values))
+
+    def write(self, instances):
+        if not self.unique_fields:
+            return self.model.objects.bulk_create(instances)
+        keyed = [instance for instance in instances if None not in self.key(instance)]
+        new = [instance for instance in instances if None in self.key(instance) and not self._update_blank_keyed(instance)]
+        if new:
+            self.model.objects.bulk_create(new)
+        if keyed:
+            self.model.objects.bulk_create(
+                keyed,
+                update_conflicts=True,
+                unique_fields=self.unique_fields,
+                update_fields=self.update_fields,
+            )
+
+
+KINDS = {
+    "courses": ImportKind(
+        Course,
+        CourseSerializer,
+        unique_fields=["college", "degree", "specialization", "level"],
+        update_fields=["main_stream", "duration", "fee", "eligibility", "description", "updated_at"],
+    ),
+    "faculties": ImportKind(Faculty, FacultySerializer),
+    "events": ImportKind(Event, EventSerializer),
+}
+
+
+def guess_format(filename):
+    """'csv' or 'ndjson' from a file name, None when the extension says neither."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def is_utf8(upload):
+    """
+    Whether the whole of `upload` decodes as UTF-8. Read chunk by chunk, so
+    a bad byte is caught before the streamed report has started; the file
+    is rewound for the import.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for chunk in upload.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        upload.seek(0)
+    return True
+
+
+def read_rows(lines, fmt):
+    """
+    ``(line number, row)`` pairs from an iterable of text lines; `row` is a
+    dict, or an error message when the line cannot be parsed. Blank CSV
+    cells are left out so model defaults apply.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            values = {
+                (key or "").strip(): value.strip()
+                for key, value in row.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+            if values:
+                yield reader.line_num, values
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        yield number, row if isinstance(row, dict) else "Each line must be a JSON object."
+
+
+def _refresh_derived(kind, college):
+    """Do once what the model signals would have done per row."""
+    if kind.model is Course:
+        CollegeProfile.refresh_course_facets(college.college_code)
+        search.index_college(college.pk)
+        filter_options.invalidate(filter_options.options_for_fields(Course))
+        facets.index.update_college(college.pk)
+        fuzzy.specializations.invalidate()
+        autocomplete.INDEXES["specializations"].invalidate()
+        caching.bump_catalog_version()
+        course_catalog.invalidate()
+    if kind.model in (Course, Event):
+        event_feed.bump()
+    documents.rebuild(pk=college.pk)
+
+
+def run(kind_name, college, rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Import `rows` (from `read_rows`) for `college`. Yields
+    ``{"line": n, "errors": {...}}`` for every rejected row, then
+    ``{"summary": {"created": .., "updated": .., "failed": ..}}``.
+    """
+    kind = KINDS[kind_name]
+    # One serializer checks every row, as a `many=True` serializer does with
+    # its child: the fields are built once rather than per row.
+    validator = kind.serializer_class(omit=SKIPPED_FIELDS)
+    existing = kind.existing_keys(college)
+    counts = {"created": 0, "updated": 0, "failed": 0}
+    pending = {}  # key (or line number) -> (line, instance)
+
+    def flush():
+        batch = list(pending.values())
+        pending.clear()
+        if not batch:
+            return []
+        try:
+            with transaction.atomic():
+                kind.write([instance for _, instance in batch])
+        except DatabaseError as exc:
+            counts["failed"] += len(batch)
+            return [{"line": line, "errors": {"non_field_errors": [str(exc)]}} for line, _ in batch]
+        for _, instance in batch:
+            if kind.unique_fields and kind.key(instance) in existing:
+                counts["updated"] += 1
+            else:
+                counts["created"] += 1
+                if kind.unique_fields:
+                    existing.add(kind.key(instance))
+        return []
+
+    for line, row in rows:
+        if isinstance(row, str):
+            counts["failed"] += 1
+            yield {"line": line, "errors": {"non_field_errors": [row]}}
+            continue
+        try:
+            validated = validator.run_validation(row)
+        except ValidationError as exc:
+            counts["failed"] += 1
+            yield {"line": line, "errors": exc.detail}
+            continue
+        instance = kind.model(college=college, **validated)
+        pending[kind.key(instance) if kind.unique_fields else line] = (line, instance)
+        if len(pending) >= batch_size:
+            yield from flush()
+    yield from flush()
+
+    if counts["created"] or counts["updated"]:
+        _refresh_derived(kind, college)
+    yield {"summary": counts}
@@ -0,0 +1,154 @@
+"""
+Canonical location lookups (Country / State / District reference tables).
+
+Free-text location values are reduced to a normalized key (case-folded,
+accents and punctuation stripped, whitespace collapsed) so "Tamil Nadu",
+"tamil  nadu" and "Tamil-Nadu" all meet on the same row. Alias rows
+("Bangalore", "Madras", ...) point at their canonical row, and profiles
+link to canonical rows only. Location filters can then compare integer
+foreign keys instead of running `icontains` over text.
+"""
+import re
+import unicodedata
+
+from .models import Country, District, State
+
+
+LEVELS = {
+    "country": Country,
+    "state": State,
+    "district": District,
+}
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_key(text):
+    """'  Tamil-Nadu ' -> 'tamil nadu'; '' for blank input."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _NON_WORD.sub(" ", text.casefold()).replace("_", " ")
+    return " ".join(text.split())
+
+
+def _canonical(row):
+    return row.canonical if row is not None and row.canonical_id else row
+
+
+def _pick(queryset, key, **scope):
+    """
+    Row for `key` inside `scope` (e.g. the same country), or None. Without
+    a scope any row with the key will do.
+    """
+    rows = list(queryset.filter(key=key).select_related("canonical"))
+    scope = {field: value for field, value in scope.items() if value is not None}
+    for row in rows:
+        if all(getattr(row, f"{field}_id") == value.pk for field, value in scope.items()):
+            return _canonical(row)
+    return None
+
+
+def resolve_country(name, create=False):
+    key = normalize_key(name)
+    if not key:
+        return None
+    country = _pick(Country.objects, key)
+    if country is None and create:
+        country, _ = Country.objects.get_or_create(key=key, defaults={"name": str(name).strip()})
+    return country
+
+
+def resolve_state(name, country=None, create=False):
+    key = normalize_key(name)
+    if not key:
+        return None
+    state = _pick(State.objects, key, country=country)
+    if state is None and create:
+        state, _ = State.objects.get_or_create(country=country, key=key, defaults={"name": str(name).strip()})
+    return state
+
+
+def resolve_district(name, state=None, create=False):
+    key = normalize_key(name)
+    if not key:
+        return None
+    district = _pick(District.objects, key, state=state)
+    if district is None and create:
+        district, _ = District.objects.get_or_create(state=state, key=key, defaults={"name": str(name).strip()})
+    return district
+
+
+def matching_ids(level, name):
+    """
+    Ids of the canonical `level` rows a filter value stands for (an alias
+    resolves to its canonical row). Empty when the value is unknown.
+    """
+    key = normalize_key(name)
+    if not key:
+        return set()
+    rows = LEVELS[level].objects.filter(key=key).values_list("id", "canonical_id")
+    return {canonical_id or row_id for row_id, canonical_id in rows}
+
+
+def link_profile(instance):
+    """
+    Point the profile's *_ref fields at the canonical rows for its text
+    location and rewrite the text to the canonical spelling. Unknown
+    values are added as new canonical rows.
+
+    Returns the names of the fields that were set.
+    """
+    fields = []
+    has_country = hasattr(instance, "country_ref_id")
+
+    country = None
+    if has_country:
+        country = resolve_country(instance.country, create=True)
+        instance.country_ref = country
+        fields.append("country_ref")
+        if country is not None:
+            instance.country = country.name
+            fields.append("country")
+
+    state = resolve_state(instance.state, country=country, create=True)
+    instance.state_ref = state
+    fields.append("state_ref")
+    if state is not None:
+        instance.state = state.name
+        fields.append("state")
+
+    district = resolve_district(instance.district, state=state, create=True)
+    instance.district_ref = district
+    fields.append("district_ref")
+    if district is not None:
+        instance.district = district.name
+        fields.append("district")
+    return fields
+
+
+LOCATION_FIELDS = {"country", "state", "district"}
+
+
+def link_profile_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    pre_save receiver shared by the profile models.
+
+    A save restricted to `update_fields` only relinks when it touches a
+    location field, and then writes the *_ref columns itself since they are
+    not part of that save.
+    """
+    if raw:
+        return
+    if update_fields is None:
+        link_profile(instance)
+        return
+    if not LOCATION_FIELDS & set(update_fields):
+        return
+    link_profile(instance)
+    if instance.pk is not None:
+        refs = {
+            field.attname: getattr(instance, field.attname)
+            for field in sender._meta.concrete_fields
+            if field.name.endswith("_ref")
+        }
+        sender.objects.filter(pk=instance.pk).update(**refs)
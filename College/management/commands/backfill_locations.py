@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from College import caching, facets, filter_options, locations, search
+from College.models import CollegeProfile, PublicCollegeDocument
+from Consultant.models import ConsultantProfile
+from Student.models import StudentProfile
+
+
+class Command(BaseCommand):
+    help = "Link existing college, student and consultant profiles to the canonical location tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Skip profiles whose state reference is already set",
+        )
+
+    def handle(self, *args, **options):
+        for model in (CollegeProfile, StudentProfile, ConsultantProfile):
+            queryset = model.objects.order_by("pk")
+            if options["only_missing"]:
+                queryset = queryset.filter(state_ref__isnull=True)
+
+            linked = 0
+            with transaction.atomic():
+                for profile in queryset.iterator(chunk_size=500):
+                    fields = locations.link_profile(profile)
+                    # update() keeps the profile signals (notifications,
+                    # consultant assignment, ...) out of a data migration
+                    model.objects.filter(pk=profile.pk).update(
+                        **{field: getattr(profile, field) for field in fields}
+                    )
+                    linked += 1
+            self.stdout.write(f"{model.__name__}: {linked} profiles linked")
+
+        # The text columns were rewritten in bulk, so refresh everything
+        # derived from them in one go.
+        if search.is_available():
+            search.rebuild_index()
+        filter_options.invalidate(filter_options.options_for_fields(CollegeProfile))
+        facets.index.invalidate()
+        caching.bump_catalog_version()
+        # Stored documents embed the old text; they are rebuilt on next request.
+        PublicCollegeDocument.objects.all().delete()
+        self.stdout.write(self.style.SUCCESS("✅ Location references backfilled."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from College import images
+from College.models import Hostel
+
+
+class Command(BaseCommand):
+    help = "Build the resized JPEG/PNG and WebP variants of stored college, event, gallery, faculty and hostel images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=sorted(model.__name__ for model in (*images.IMAGE_FIELDS, Hostel)),
+            help="Only this model's rows",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Skip rows whose variants are up to date",
+        )
+
+    def handle(self, *args, **options):
+        models = [model for model in (*images.IMAGE_FIELDS, Hostel) if options["model"] in (None, model.__name__)]
+        processed = 0
+        for model in models:
+            for instance in model.objects.order_by("pk").iterator():
+                if options["only_missing"] and not images.needs_variants(instance):
+                    continue
+                images.process(model, instance.pk)
+                processed += 1
+            self.stdout.write(f"{model.__name__}: done")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Image variants checked for {processed} rows."))
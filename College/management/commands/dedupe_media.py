@@ -0,0 +1,187 @@
+import os
+import shutil
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.base import File
+from django.core.files.storage import storages
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from College import caching, event_feed, images, storage
+from College.models import Hostel, HostelImage, MediaBlob, PublicCollegeDocument
+
+
+def _file_fields():
+    """(model, field name) of every file field of every installed model."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+def _variant_models():
+    return [model for model in apps.get_models() if any(f.name == "image_variants" for f in model._meta.fields)]
+
+
+def _variant_names(entry):
+    return [size[key] for size in entry.get("sizes", ()) for key in ("src", "webp") if size.get(key)]
+
+
+def _census():
+    """Counter of stored name -> number of references to it in the database."""
+    counts = Counter()
+    for model, field in _file_fields():
+        counts.update(
+            name for name in model.objects.exclude(**{field: ""}).values_list(field, flat=True) if name
+        )
+    # One reference per hostel image a college uploaded, and one per college
+    # for a listed file without an upload record (older data).
+    owned = set(HostelImage.objects.values_list("college_id", "name"))
+    listed = {
+        (college_id, name)
+        for college_id, urls in Hostel.objects.values_list("college_id", "images")
+        for name in storage.hostel_image_names(urls)
+    }
+    counts.update(name for _, name in owned | listed)
+    for model in _variant_models():
+        for variants in model.objects.values_list("image_variants", flat=True):
+            for entry in (variants or {}).values():
+                counts.update(_variant_names(entry))
+    return counts
+
+
+def _rename_entry(entry, moves):
+    return {
+        **entry,
+        "sizes": [
+            {**size, **{key: moves.get(size[key], size[key]) for key in ("src", "webp") if size.get(key)}}
+            for size in entry.get("sizes", ())
+        ],
+    }
+
+
+def _rename_url(url, moves, media):
+    name = images.storage_name(url)
+    if name not in moves:
+        return url
+    return url[:url.rfind(media.url(name))] + media.url(moves[name])
+
+
+class Command(BaseCommand):
+    help = (
+        "Move stored media into the content-addressed blob tree, keeping one copy of identical files, "
+        "point every database reference at it and recount the references"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+        parser.add_argument("--prune", action="store_true", help="Delete blobs nothing references")
+
+    def handle(self, *args, **options):
+        media = storages["default"]
+        if not isinstance(media, storage.ContentAddressedStorage):
+            raise CommandError("The default storage is not College.storage.ContentAddressedStorage")
+
+        # 1. Hash every referenced file that is not a blob yet.
+        moves, missing = {}, 0
+        for name in sorted(_census()):
+            if storage.is_blob(name):
+                continue
+            if not media.exists(name):
+                missing += 1
+                continue
+            with media.open(name) as handle:
+                moves[name] = storage.blob_name(storage.content_hash(File(handle)), name)
+
+        targets = Counter(moves.values())
+        duplicates = sum(count - 1 for count in targets.values()) + sum(
+            1 for target in targets if media.exists(target)
+        )
+        self.stdout.write(
+            f"{len(moves)} files to move, {duplicates} of them duplicates, {missing} referenced files missing"
+        )
+        if options["dry_run"]:
+            return
+
+        # 2. Link each file in under its blob name (no data is copied);
+        #    the old names go only once the database points at the blobs,
+        #    so an interrupted run can simply be repeated.
+        freed = 0
+        for old, new in moves.items():
+            old_path, new_path = media.path(old), media.path(new)
+            if os.path.exists(new_path):
+                freed += os.path.getsize(old_path)
+                continue
+            os.makedirs(os.path.dirname(new_path), exist_ok=True)
+            try:
+                os.link(old_path, new_path)
+            except OSError:
+                shutil.copyfile(old_path, new_path)
+
+        # 3. Point the database at the blobs (update() fires no signals).
+        with transaction.atomic():
+            for model, field in _file_fields():
+                for old, new in moves.items():
+                    model.objects.filter(**{field: old}).update(**{field: new})
+            for old, new in moves.items():
+                # A college that uploaded the same bytes twice keeps one row. The
+                # old names have no MediaBlob row, so deleting gives nothing back.
+                HostelImage.objects.filter(
+                    name=old, college__in=HostelImage.objects.filter(name=new).values("college")
+                ).delete()
+                HostelImage.objects.filter(name=old).update(name=new)
+            for model in _variant_models():
+                has_urls = model is Hostel
+                for row in model.objects.only("pk", "image_variants", *(["images"] if has_urls else [])).iterator():
+                    variants = {
+                        moves.get(name, name): _rename_entry(entry, moves)
+                        for name, entry in (row.image_variants or {}).items()
+                    }
+                    changes = {"image_variants": variants} if variants != (row.image_variants or {}) else {}
+                    if has_urls:
+                        urls = [_rename_url(url, moves, media) for url in row.images or []]
+                        if urls != (row.images or []):
+                            changes["images"] = urls
+                    if changes:
+                        model.objects.filter(pk=row.pk).update(**changes)
+
+        for old in moves:
+            os.remove(media.path(old))
+
+        # 4. Recount references from scratch.
+        counts = Counter({name: count for name, count in _census().items() if storage.is_blob(name)})
+        with transaction.atomic():
+            MediaBlob.objects.update(references=0)
+            MediaBlob.objects.bulk_create(
+                [
+                    MediaBlob(
+                        name=name,
+                        references=count,
+                        size=media.size(name) if media.exists(name) else 0,
+                    )
+                    for name, count in counts.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=["references", "size"],
+                batch_size=500,
+            )
+
+        pruned = 0
+        if options["prune"]:
+            for name in list(MediaBlob.objects.filter(references=0).values_list("name", flat=True)):
+                media.purge(name)
+                pruned += 1
+
+        # Cached responses and documents hold the old URLs.
+        PublicCollegeDocument.objects.all().delete()
+        caching.bump_catalog_version()
+        event_feed.bump()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(moves)} files moved into the blob tree, {freed} bytes freed, "
+            f"{len(counts)} blobs referenced, {pruned} pruned."
+        ))
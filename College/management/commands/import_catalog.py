@@ -0,0 +1,48 @@
+import json
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from College import importer
+from College.models import CollegeProfile
+
+
+class Command(BaseCommand):
+    help = "Bulk import courses, faculties or events of one college from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("college_code")
+        parser.add_argument("kind", choices=sorted(importer.KINDS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=importer.FORMATS, help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=importer.IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        college = CollegeProfile.objects.filter(college_code=options["college_code"]).first()
+        if college is None:
+            raise CommandError(f"No college with code {options['college_code']}")
+        fmt = options["format"] or importer.guess_format(options["path"])
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        try:
+            with open(options["path"], "rb") as raw:
+                if not importer.is_utf8(File(raw)):
+                    raise CommandError("The file must be UTF-8 encoded")
+            handle = open(options["path"], encoding="utf-8-sig", newline="")
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        with handle:
+            rows = importer.read_rows(handle, fmt)
+            for entry in importer.run(options["kind"], college, rows, options["batch_size"]):
+                if "summary" in entry:
+                    summary = entry["summary"]
+                else:
+                    self.stderr.write(f"line {entry['line']}: {json.dumps(entry['errors'])}")
+
+        message = f"{summary['created']} created, {summary['updated']} updated, {summary['failed']} failed"
+        style = self.style.SUCCESS if not summary["failed"] else self.style.WARNING
+        self.stdout.write(style(f"✅ Import finished: {message}."))
@@ -0,0 +1,46 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from College import caching, geo
+from College.models import PinCode
+
+
+BUNDLED = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "pincode_centroids.csv")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load pin-code centroids from a CSV with pincode/latitude/longitude columns "
+        "(e.g. the India Post directory export) and recompute college coordinates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default=BUNDLED, help="CSV file (defaults to the bundled centroids)")
+        parser.add_argument("--replace", action="store_true", help="Delete existing pin codes first")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+
+        centroids = geo.read_centroids(path)
+        with transaction.atomic():
+            if options["replace"]:
+                PinCode.objects.all().delete()
+            PinCode.objects.bulk_create(
+                [
+                    PinCode(code=code, latitude=latitude, longitude=longitude, office=office[:100])
+                    for code, (latitude, longitude, office) in centroids.items()
+                ],
+                batch_size=2000,
+                update_conflicts=True,
+                unique_fields=["code"],
+                update_fields=["latitude", "longitude", "office"],
+            )
+        self.stdout.write(f"{len(centroids)} pin codes loaded")
+
+        updated = geo.refresh_college_coordinates()
+        caching.bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"✅ Coordinates refreshed for {updated} colleges."))
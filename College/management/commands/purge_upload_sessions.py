@@ -0,0 +1,32 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from College import uploads
+from College.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "Delete expired resumable upload sessions and their part files, and part files no session owns"
+
+    def handle(self, *args, **options):
+        expired = 0
+        for session in UploadSession.objects.filter(expires_at__lte=timezone.now()).iterator():
+            uploads.discard(session)
+            expired += 1
+
+        orphans = 0
+        if os.path.isdir(uploads.UPLOAD_SESSION_DIR):
+            # Part files of sessions opened after this listing are newer than it.
+            listed_at = time.time()
+            live = {f"{pk}.part" for pk in UploadSession.objects.values_list("pk", flat=True)}
+            for entry in os.scandir(uploads.UPLOAD_SESSION_DIR):
+                if entry.name.endswith(".part") and entry.name not in live and entry.stat().st_mtime < listed_at:
+                    os.remove(entry.path)
+                    orphans += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {expired} expired upload sessions and {orphans} orphaned part files removed."
+        ))
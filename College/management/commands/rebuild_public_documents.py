@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from College import documents
+from College.models import CollegeProfile, PublicCollegeDocument
+
+
+def _init_worker():
+    # Spawned workers start from scratch; forked ones must not share the
+    # parent's database connections.
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized public college documents, rendering them in parallel worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes rendering documents (1 renders in this process)",
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Colleges per unit of work")
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Skip colleges that already have a document",
+        )
+
+    def handle(self, *args, **options):
+        workers, batch_size = options["workers"], options["batch_size"]
+        if workers < 1 or batch_size < 1:
+            raise CommandError("--workers and --batch-size must be positive")
+
+        queryset = CollegeProfile.objects.order_by("pk")
+        if options["only_missing"]:
+            queryset = queryset.exclude(pk__in=PublicCollegeDocument.objects.values("college"))
+        college_ids = list(queryset.values_list("pk", flat=True))
+        batches = [college_ids[i:i + batch_size] for i in range(0, len(college_ids), batch_size)]
+
+        built = 0
+        if workers == 1 or len(batches) <= 1:
+            for batch in batches:
+                built += len(documents.save(documents.build_many(batch)))
+        else:
+            # Workers only read and render; this process does every write,
+            # so SQLite never sees competing writers.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = [pool.submit(documents.build_many, batch) for batch in batches]
+                for future in as_completed(futures):
+                    built += len(documents.save(future.result()))
+                    self.stdout.write(f"{built}/{len(college_ids)} documents built")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {built} public college documents rebuilt."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from College import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the college full-text search index from the database"
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write(self.style.ERROR("❌ Full-text search needs the SQLite FTS5 backend."))
+            return
+
+        search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS("✅ College search index rebuilt."))
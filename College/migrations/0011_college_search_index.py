@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+CREATE_SEARCH_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS "College_collegesearch" USING fts5(
+    college_name,
+    district,
+    state,
+    country,
+    accreditation_body,
+    specializations,
+    about_college,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+POPULATE_SEARCH_TABLE = """
+INSERT INTO "College_collegesearch" (
+    rowid, college_name, district, state, country,
+    accreditation_body, specializations, about_college
+)
+SELECT c.id, c.college_name, c.district, c.state, c.country,
+       COALESCE(c.accreditation_body, ''),
+       COALESCE((
+           SELECT group_concat(s.specialization, ' ')
+           FROM "College_course" s
+           WHERE s.college_id = c.college_code
+             AND s.specialization IS NOT NULL
+       ), ''),
+       c.about_college
+FROM "College_collegeprofile" c
+"""
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_SEARCH_TABLE)
+    schema_editor.execute(POPULATE_SEARCH_TABLE)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS "College_collegesearch"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0010_alter_course_options_alter_course_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
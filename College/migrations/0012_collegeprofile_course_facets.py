@@ -0,0 +1,56 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:22
+
+from django.db import migrations, models
+
+
+def pack_facet(values):
+    values = sorted({value for value in values if value})
+    return f",{','.join(values)}," if values else ""
+
+
+def backfill_course_facets(apps, schema_editor):
+    CollegeProfile = apps.get_model('College', 'CollegeProfile')
+    Course = apps.get_model('College', 'Course')
+
+    courses_by_college = {}
+    for row in Course.objects.values_list('college_id', 'main_stream', 'degree', 'level', 'specialization'):
+        courses_by_college.setdefault(row[0], []).append(row[1:])
+
+    for college_code, courses in courses_by_college.items():
+        CollegeProfile.objects.filter(college_code=college_code).update(
+            course_streams=pack_facet(c[0] for c in courses),
+            course_degrees=pack_facet(c[1] for c in courses),
+            course_levels=pack_facet(c[2] for c in courses),
+            course_specializations="\n".join(sorted({c[3] for c in courses if c[3]})),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0011_college_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collegeprofile',
+            name='course_degrees',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='collegeprofile',
+            name='course_levels',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='collegeprofile',
+            name='course_specializations',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='collegeprofile',
+            name='course_streams',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_course_facets, migrations.RunPython.noop),
+    ]
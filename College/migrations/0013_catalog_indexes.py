@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0012_collegeprofile_course_facets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collegeprofile',
+            index=models.Index(fields=['-created_at'], name='college_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collegeprofile',
+            index=models.Index(fields=['verified', '-created_at'], name='college_verified_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collegeprofile',
+            index=models.Index(fields=['is_featured', '-created_at'], name='college_featured_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collegeprofile',
+            index=models.Index(fields=['is_popular', '-created_at'], name='college_popular_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collegeprofile',
+            index=models.Index(fields=['state', 'district'], name='college_state_district_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collegeprofile',
+            index=models.Index(fields=['college_name'], name='college_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['main_stream', 'level', 'fee'], name='course_stream_level_fee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['degree', 'fee'], name='course_degree_fee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['fee'], name='course_fee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['-created_at'], name='course_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['college', '-created_at'], name='course_college_created_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+
+INDIAN_STATES = [
+    "Andaman and Nicobar Islands", "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar",
+    "Chandigarh", "Chhattisgarh", "Dadra and Nagar Haveli and Daman and Diu", "Delhi", "Goa",
+    "Gujarat", "Haryana", "Himachal Pradesh", "Jammu and Kashmir", "Jharkhand", "Karnataka",
+    "Kerala", "Ladakh", "Lakshadweep", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
+    "Mizoram", "Nagaland", "Odisha", "Puducherry", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu",
+    "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal",
+]
+
+STATE_ALIASES = {
+    "Orissa": "Odisha",
+    "Pondicherry": "Puducherry",
+    "Uttaranchal": "Uttarakhand",
+    "New Delhi": "Delhi",
+    "NCT of Delhi": "Delhi",
+}
+
+# state -> {canonical district: [alias spellings]}
+DISTRICTS = {
+    "Karnataka": {"Bengaluru": ["Bangalore"], "Mysuru": ["Mysore"], "Mangaluru": ["Mangalore"]},
+    "Maharashtra": {"Mumbai": ["Bombay"], "Pune": ["Poona"]},
+    "Tamil Nadu": {"Chennai": ["Madras"], "Tiruchirappalli": ["Trichy"]},
+    "West Bengal": {"Kolkata": ["Calcutta"]},
+    "Haryana": {"Gurugram": ["Gurgaon"]},
+    "Kerala": {"Thiruvananthapuram": ["Trivandrum"], "Kochi": ["Cochin"]},
+}
+
+
+def normalize_key(text):
+    # Frozen copy of College.locations.normalize_key
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w]+", " ", text.casefold()).replace("_", " ")
+    return " ".join(text.split())
+
+
+def seed(apps, schema_editor):
+    Country = apps.get_model("College", "Country")
+    State = apps.get_model("College", "State")
+    District = apps.get_model("College", "District")
+
+    india, _ = Country.objects.get_or_create(key=normalize_key("India"), defaults={"name": "India"})
+    Country.objects.get_or_create(key=normalize_key("Bharat"), defaults={"name": "Bharat", "canonical": india})
+
+    states = {}
+    for name in INDIAN_STATES:
+        states[name], _ = State.objects.get_or_create(country=india, key=normalize_key(name), defaults={"name": name})
+    for alias, name in STATE_ALIASES.items():
+        State.objects.get_or_create(
+            country=india, key=normalize_key(alias), defaults={"name": alias, "canonical": states[name]}
+        )
+
+    for state_name, districts in DISTRICTS.items():
+        state = states[state_name]
+        for name, aliases in districts.items():
+            district, _ = District.objects.get_or_create(state=state, key=normalize_key(name), defaults={"name": name})
+            for alias in aliases:
+                District.objects.get_or_create(
+                    state=state, key=normalize_key(alias), defaults={"name": alias, "canonical": district}
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0014_location_reference_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+import csv
+import os
+
+from django.db import migrations
+
+
+CENTROIDS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "pincode_centroids.csv")
+
+
+def seed(apps, schema_editor):
+    PinCode = apps.get_model("College", "PinCode")
+    CollegeProfile = apps.get_model("College", "CollegeProfile")
+
+    with open(CENTROIDS, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    PinCode.objects.bulk_create(
+        [
+            PinCode(code=row["pincode"], latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]), office=row["office"])
+            for row in rows
+        ],
+        ignore_conflicts=True,
+    )
+
+    points = {code: (lat, lon) for code, lat, lon in PinCode.objects.values_list("code", "latitude", "longitude")}
+    for college_id, pin_code in CollegeProfile.objects.values_list("id", "pin_code"):
+        code = "".join(char for char in str(pin_code or "") if char.isdigit())
+        point = points.get(code)
+        if point is None and len(code) == 6:
+            # same fallback as College.geo.locate: mean of the sorting district
+            area = [value for key, value in points.items() if key[:3] == code[:3]]
+            if area:
+                point = (sum(p[0] for p in area) / len(area), sum(p[1] for p in area) / len(area))
+        if point is not None:
+            CollegeProfile.objects.filter(pk=college_id).update(latitude=point[0], longitude=point[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0016_pincode_coordinates'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
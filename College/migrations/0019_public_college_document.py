@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0018_catalog_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicCollegeDocument',
+            fields=[
+                ('college', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='public_document', serialize=False, to='College.collegeprofile')),
+                ('base_url', models.CharField(max_length=200)),
+                ('body', models.BinaryField()),
+                ('etag', models.CharField(max_length=80)),
+                ('source_modified', models.DateTimeField()),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
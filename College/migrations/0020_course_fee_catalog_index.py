@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0019_public_college_document'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='course',
+            name='course_fee_idx',
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['fee', 'main_stream', 'level', 'degree', 'college'], name='course_fee_catalog_idx'),
+        ),
+    ]
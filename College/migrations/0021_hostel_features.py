@@ -0,0 +1,101 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:54
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def feature_key(name):
+    # Frozen copy of College.models.Hostel.feature_key
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"[\W_]+", "", text.casefold())
+
+
+def backfill_hostel_features(apps, schema_editor):
+    Hostel = apps.get_model('College', 'Hostel')
+    HostelAmenity = apps.get_model('College', 'HostelAmenity')
+    HostelRoomType = apps.get_model('College', 'HostelRoomType')
+
+    amenities, room_types = [], []
+    for hostel in Hostel.objects.only('id', 'amenities', 'room_types').iterator():
+        seen = set()
+        for name in hostel.amenities if isinstance(hostel.amenities, list) else []:
+            key = feature_key(name) if isinstance(name, str) else ""
+            if key and key not in seen:
+                seen.add(key)
+                amenities.append(HostelAmenity(hostel_id=hostel.id, key=key, name=name.strip()))
+
+        if isinstance(hostel.room_types, dict):
+            entries = hostel.room_types.items()
+        elif isinstance(hostel.room_types, list):
+            entries = [(name, None) for name in hostel.room_types if isinstance(name, (str, int))]
+        else:
+            entries = []
+        seen = set()
+        for name, rooms in entries:
+            key = feature_key(str(name))
+            if key and key not in seen:
+                seen.add(key)
+                if not isinstance(rooms, int) or isinstance(rooms, bool) or rooms < 0:
+                    rooms = None
+                room_types.append(HostelRoomType(hostel_id=hostel.id, key=key, name=str(name).strip(), rooms=rooms))
+
+    HostelAmenity.objects.bulk_create(amenities, batch_size=500)
+    HostelRoomType.objects.bulk_create(room_types, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0020_course_fee_catalog_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HostelAmenity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HostelRoomType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=100)),
+                ('rooms', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='hostel',
+            index=models.Index(fields=['type', 'fee'], name='hostel_type_fee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hostel',
+            index=models.Index(fields=['fee'], name='hostel_fee_idx'),
+        ),
+        migrations.AddField(
+            model_name='hostelamenity',
+            name='hostel',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='amenity_rows', to='College.hostel'),
+        ),
+        migrations.AddField(
+            model_name='hostelroomtype',
+            name='hostel',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_type_rows', to='College.hostel'),
+        ),
+        migrations.AddConstraint(
+            model_name='hostelamenity',
+            constraint=models.UniqueConstraint(fields=('key', 'hostel'), name='hostel_amenity_unique_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='hostelroomtype',
+            constraint=models.UniqueConstraint(fields=('key', 'hostel'), name='hostel_room_type_unique_key'),
+        ),
+        migrations.RunPython(backfill_hostel_features, migrations.RunPython.noop),
+    ]
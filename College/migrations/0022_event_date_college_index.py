@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0021_hostel_features'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'college'], name='event_date_college_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+
+PROFILES = [
+    ("College", "CollegeProfile"),
+    ("Student", "StudentProfile"),
+    ("Consultant", "ConsultantProfile"),
+]
+
+
+def normalize_key(text):
+    # Frozen copy of College.locations.normalize_key
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w]+", " ", text.casefold()).replace("_", " ")
+    return " ".join(text.split())
+
+
+def resolve(model, name, **scope):
+    # Frozen copy of College.locations.resolve_* with create=True
+    key = normalize_key(name)
+    if not key:
+        return None
+    given = {field: value for field, value in scope.items() if value is not None}
+    for row in model.objects.filter(key=key).select_related("canonical"):
+        if all(getattr(row, f"{field}_id") == value.pk for field, value in given.items()):
+            return row.canonical if row.canonical_id else row
+    return model.objects.get_or_create(key=key, defaults={"name": str(name).strip()}, **scope)[0]
+
+
+def link(apps, schema_editor):
+    Country = apps.get_model("College", "Country")
+    State = apps.get_model("College", "State")
+    District = apps.get_model("College", "District")
+
+    for app_label, model_name in PROFILES:
+        Profile = apps.get_model(app_label, model_name)
+        has_country = any(field.name == "country_ref" for field in Profile._meta.fields)
+        for profile in Profile.objects.all().iterator():
+            fields = {}
+            country = None
+            if has_country:
+                country = resolve(Country, profile.country)
+                fields["country_ref"] = country
+                if country is not None:
+                    fields["country"] = country.name
+            state = resolve(State, profile.state, country=country)
+            fields["state_ref"] = state
+            if state is not None:
+                fields["state"] = state.name
+            district = resolve(District, profile.district, state=state)
+            fields["district_ref"] = district
+            if district is not None:
+                fields["district"] = district.name
+            Profile.objects.filter(pk=profile.pk).update(**fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0025_upload_session'),
+        ('Student', '0004_location_refs'),
+        ('Consultant', '0004_location_refs'),
+    ]
+
+    operations = [
+        migrations.RunPython(link, migrations.RunPython.noop),
+    ]
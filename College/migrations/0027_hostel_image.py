@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:28
+
+from urllib.parse import unquote, urlparse
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def storage_name(url):
+    # Frozen copy of College.images.storage_name
+    path = unquote(urlparse(url or "").path)
+    media_path = urlparse(settings.MEDIA_URL).path
+    if not path.startswith(media_path):
+        return None
+    return path[len(media_path):] or None
+
+
+def backfill_hostel_images(apps, schema_editor):
+    # Only files saved under the college's own upload directory (before the
+    # content-addressed storage) are known to belong to it.
+    Hostel = apps.get_model('College', 'Hostel')
+    HostelImage = apps.get_model('College', 'HostelImage')
+
+    owned = set()
+    for college_id, urls in Hostel.objects.values_list('college_id', 'images').iterator():
+        for url in urls if isinstance(urls, list) else []:
+            name = storage_name(url) if isinstance(url, str) else None
+            if name and name.startswith(f"hostels/{college_id}/"):
+                owned.add((college_id, name))
+    HostelImage.objects.bulk_create(
+        [HostelImage(college_id=college_id, name=name) for college_id, name in owned],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0026_link_profile_locations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HostelImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('college', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hostel_images', to='College.collegeprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('college', 'name'), name='hostel_image_unique_name')],
+            },
+        ),
+        migrations.RunPython(backfill_hostel_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:36
+
+import College.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0027_hostel_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollegeSearch',
+            fields=[
+                ('college', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='College.collegeprofile')),
+                ('document', College.models.SearchDocumentField(db_column='College_collegesearch')),
+            ],
+            options={
+                'db_table': 'College_collegesearch',
+                'managed': False,
+            },
+        ),
+    ]
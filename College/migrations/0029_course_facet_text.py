@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0028_college_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='collegeprofile',
+            name='course_degrees',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AlterField(
+            model_name='collegeprofile',
+            name='course_levels',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AlterField(
+            model_name='collegeprofile',
+            name='course_streams',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -1,8 +1,115 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+
+
+
+# ============================================
+# Location reference tables
+# ============================================
+
+class LocationBase(models.Model):
+    """
+    Shared shape of the location reference tables.
+
+    `key` is the normalized spelling (see College/locations.py). A row whose
+    `canonical` is set is an alias spelling (e.g. "Bangalore") of the
+    canonical row it points to ("Bengaluru"); profiles only ever link to
+    canonical rows.
+    """
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, db_index=True)
+    canonical = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='aliases'
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ['name']
+
+    def __str__(self):
+        if self.canonical_id:
+            return f"{self.name} → {self.canonical.name}"
+        return self.name
+
+    def save(self, *args, **kwargs):
+        from .locations import normalize_key
+        self.key = normalize_key(self.name)
+        super().save(*args, **kwargs)
+
+
+class Country(LocationBase):
+    class Meta(LocationBase.Meta):
+        verbose_name_plural = 'Countries'
+        constraints = [
+            models.UniqueConstraint(fields=['key'], name='country_unique_key'),
+        ]
+
+
+class State(LocationBase):
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, null=True, blank=True, related_name='states')
+
+    class Meta(LocationBase.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'key'], name='state_unique_key'),
+        ]
+
+
+class District(LocationBase):
+    state = models.ForeignKey(State, on_delete=models.CASCADE, null=True, blank=True, related_name='districts')
+
+    class Meta(LocationBase.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['state', 'key'], name='district_unique_key'),
+        ]
+
+
+class PinCode(models.Model):
+    """Centroid of a postal pin code (seeded from College/data/pincode_centroids.csv)."""
+    code = models.CharField(max_length=6, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    office = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['code']
+
+    def __str__(self):
+        return f"{self.code} ({self.office})" if self.office else self.code
 
 
+class CatalogVersion(models.Model):
+    """
+    Change counter of a public catalog (e.g. "colleges"). Stored in the
+    database so every worker hands out the same list validators.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class MediaBlob(models.Model):
+    """
+    Reference count of one content-addressed media file (see
+    College/storage.py). The file is deleted when the last reference goes.
+    """
+    name = models.CharField(max_length=255, primary_key=True)
+    size = models.BigIntegerField(default=0)
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.references})"
+
 
 class CollegeProfile(models.Model):
     user = models.OneToOneField(
@@ -33,6 +140,16 @@ class CollegeProfile(models.Model):
     district = models.CharField(max_length=100)
     pin_code = models.CharField(max_length=10, blank=True, null=True)
     address = models.TextField()
+
+    # Canonical location rows, kept in sync with country/state/district on save
+    country_ref = models.ForeignKey(Country, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='colleges')
+    state_ref = models.ForeignKey(State, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='colleges')
+    district_ref = models.ForeignKey(District, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='colleges')
+
+    # Centroid of pin_code (see College/geo.py), used by the `near=` filter
+    latitude = models.FloatField(blank=True, null=True, editable=False)
+    longitude = models.FloatField(blank=True, null=True, editable=False)
+
     email = models.EmailField()
     phone = models.CharField(max_length=20)
     website = models.URLField(blank=True, null=True)
@@ -42,6 +159,8 @@ class CollegeProfile(models.Model):
     college_logo = models.ImageField(upload_to='colleges/logo/', blank=True, null=True)
     college_image = models.ImageField(upload_to='colleges/main/', blank=True, null=True)
     credential_image = models.ImageField(upload_to='colleges/credentials/', blank=True, null=True)
+    # resized copies of the images, written by College/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     landline = models.CharField(max_length=20, blank=True, null=True)
     contact_person = models.CharField(max_length=100, blank=True, null=True)
 
@@ -57,9 +176,32 @@ class CollegeProfile(models.Model):
     is_popular = models.BooleanField(default=False)
     is_featured = models.BooleanField(default=False)
 
+    # --- Course facets (denormalized from Course, see refresh_course_facets) ---
+    # Stored as ",value1,value2," so a single value is matched with
+    # `course_streams__contains=",engineering,"` without joining Course.
+    course_streams = models.TextField(blank=True, default="", editable=False)
+    course_degrees = models.TextField(blank=True, default="", editable=False)
+    course_levels = models.TextField(blank=True, default="", editable=False)
+    course_specializations = models.TextField(blank=True, default="", editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # CollegeListView default ordering and the verified/popular/featured
+            # listings, each newest first
+            models.Index(fields=['-created_at'], name='college_created_idx'),
+            models.Index(fields=['verified', '-created_at'], name='college_verified_created_idx'),
+            models.Index(fields=['is_featured', '-created_at'], name='college_featured_created_idx'),
+            models.Index(fields=['is_popular', '-created_at'], name='college_popular_created_idx'),
+            # location filters
+            models.Index(fields=['state', 'district'], name='college_state_district_idx'),
+            models.Index(fields=['college_name'], name='college_name_idx'),
+            # bounding box of the `near=` radius filter
+            models.Index(fields=['latitude', 'longitude'], name='college_geo_idx'),
+        ]
+
     # --- Helper ---
     def mark_profile_complete(self):
         """
@@ -71,11 +213,98 @@ class CollegeProfile(models.Model):
             self.user.is_profile_complete = True
             self.user.save(update_fields=['is_profile_complete'])
 
+    @staticmethod
+    def pack_facet(values):
+        """Pack a set of facet values as ",a,b," (empty string for no values)."""
+        values = sorted({value for value in values if value})
+        return f",{','.join(values)}," if values else ""
+
+    @staticmethod
+    def facet_values(packed):
+        """Inverse of pack_facet."""
+        return [value for value in (packed or "").split(",") if value]
+
+    @classmethod
+    def refresh_course_facets(cls, college_code):
+        """
+        Recompute the denormalized course facets of one college from its
+        courses. Uses update() so no CollegeProfile signals are fired.
+        """
+        courses = list(
+            Course.objects.filter(college_id=college_code)
+            .values_list('main_stream', 'degree', 'level', 'specialization')
+        )
+        cls.objects.filter(college_code=college_code).update(
+            course_streams=cls.pack_facet(c[0] for c in courses),
+            course_degrees=cls.pack_facet(c[1] for c in courses),
+            course_levels=cls.pack_facet(c[2] for c in courses),
+            course_specializations="\n".join(sorted({c[3] for c in courses if c[3]})),
+        )
+
     def __str__(self):
         return self.college_name
 
 
 
+class SearchDocumentField(models.TextField):
+    """
+    The hidden FTS5 column named after its table (see College/search.py):
+    the left side of MATCH and the first argument of bm25().
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class CollegeSearch(models.Model):
+    """
+    Read-only view of the SQLite FTS5 search index (College/search.py),
+    one row per college with the college's id as rowid. Joining it lets a
+    search run MATCH once per query.
+    """
+    college = models.OneToOneField(
+        CollegeProfile,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_document',
+    )
+    document = SearchDocumentField(db_column='College_collegesearch')
+
+    class Meta:
+        managed = False
+        db_table = 'College_collegesearch'
+
+
+class PublicCollegeDocument(models.Model):
+    """
+    Pre-rendered, gzip-compressed JSON of a college's public detail page
+    (see College/documents.py).
+    """
+    college = models.OneToOneField(
+        CollegeProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='public_document'
+    )
+    base_url = models.CharField(max_length=200)
+    body = models.BinaryField()
+    etag = models.CharField(max_length=80)
+    source_modified = models.DateTimeField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Public document of {self.college_id}"
+
+
 class Course(models.Model):
     COURSE_LEVEL_CHOICES = [
         ('undergraduate', 'Undergraduate'),
@@ -129,6 +358,20 @@ class Course(models.Model):
     class Meta:
         ordering = ['degree', 'specialization']
         unique_together = ['college', 'degree', 'specialization', 'level']
+        indexes = [
+            # CourseViewSet: stream/level filters with fee range and fee ordering
+            models.Index(fields=['main_stream', 'level', 'fee'], name='course_stream_level_fee_idx'),
+            models.Index(fields=['degree', 'fee'], name='course_degree_fee_idx'),
+            # Public course catalog: fee-range browsing with any stream/level/
+            # degree/college filter, and its COUNT, answered from the index
+            models.Index(
+                fields=['fee', 'main_stream', 'level', 'degree', 'college'],
+                name='course_fee_catalog_idx',
+            ),
+            # CourseViewSet default ordering, globally and per college
+            models.Index(fields=['-created_at'], name='course_created_idx'),
+            models.Index(fields=['college', '-created_at'], name='course_college_created_idx'),
+        ]
 
     def __str__(self):
         spec = f" - {self.specialization}" if self.specialization else ""
@@ -141,7 +384,16 @@ class Event(models.Model):
     location = models.CharField(max_length=255, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
     image = models.ImageField(upload_to="events/images/", blank=True, null=True)
+    # resized copies of the images, written by College/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # upcoming-events feed and calendar: date window, soonest first
+            models.Index(fields=['date', 'college'], name='event_date_college_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.college.college_code})"    
@@ -165,11 +417,14 @@ class Gallery(models.Model):
     )
 
     file = models.FileField(upload_to='college_gallery/')
+    # resized copies of the images, written by College/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     title = models.CharField(max_length=255, blank=True)
     description = models.TextField(blank=True)
 
     display_order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Gallery Items"
@@ -190,6 +445,8 @@ class Faculty(models.Model):
     qualification = models.CharField(max_length=255, blank=True)
     experience = models.CharField(max_length=255, blank=True)  # years or text
     photo = models.ImageField(upload_to='faculty_photos/', blank=True, null=True)
+    # resized copies of the images, written by College/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     department = models.CharField(max_length=255, blank=True)
     email = models.EmailField(blank=True)
     bio = models.TextField(blank=True)  # ✔ NEW field to match frontend
@@ -225,12 +482,152 @@ class Hostel(models.Model):
     # ✅ Multiple hostel images
     images = models.JSONField(default=list, blank=True)  
     # will store array of image URLs after upload
+    # resized copies of the images, written by College/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     is_active = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # hostel search: type plus fee range, and fee ordering
+            models.Index(fields=['type', 'fee'], name='hostel_type_fee_idx'),
+            models.Index(fields=['fee'], name='hostel_fee_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.college.college_name})"    
 
+    @staticmethod
+    def feature_key(name):
+        """'Wi-Fi ' / 'WIfi' -> 'wifi': the spelling-insensitive key of an amenity or room type."""
+        from .locations import normalize_key
+        return normalize_key(name).replace(" ", "")
+
+    @staticmethod
+    def room_type_entries(room_types):
+        """``(name, rooms)`` pairs of `room_types`, given as {"single": 10} or ["single", ...]."""
+        if isinstance(room_types, dict):
+            return [
+                (str(name), rooms if isinstance(rooms, int) and not isinstance(rooms, bool) and rooms >= 0 else None)
+                for name, rooms in room_types.items()
+            ]
+        if isinstance(room_types, list):
+            return [(str(name), None) for name in room_types if isinstance(name, (str, int))]
+        return []
+
+    def refresh_features(self):
+        """
+        Rewrite the HostelAmenity / HostelRoomType rows of this hostel from
+        its `amenities` and `room_types` JSON.
+        """
+        amenities = {}
+        for name in self.amenities if isinstance(self.amenities, list) else []:
+            key = self.feature_key(name) if isinstance(name, str) else ""
+            if key:
+                amenities.setdefault(key, HostelAmenity(hostel=self, key=key, name=name.strip()))
+        room_types = {}
+        for name, rooms in self.room_type_entries(self.room_types):
+            key = self.feature_key(name)
+            if key:
+                room_types.setdefault(key, HostelRoomType(hostel=self, key=key, name=name.strip(), rooms=rooms))
+
+        HostelAmenity.objects.filter(hostel=self).delete()
+        HostelAmenity.objects.bulk_create(amenities.values())
+        HostelRoomType.objects.filter(hostel=self).delete()
+        HostelRoomType.objects.bulk_create(room_types.values())
+
+
+class HostelAmenity(models.Model):
+    """
+    One amenity of a hostel, normalized out of `Hostel.amenities` (see
+    Hostel.refresh_features) so hostel search matches it through an index.
+    """
+    hostel = models.ForeignKey(Hostel, on_delete=models.CASCADE, related_name='amenity_rows')
+    key = models.CharField(max_length=100)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            # leads with `key`: "hostels with wifi" is an index range scan
+            models.UniqueConstraint(fields=['key', 'hostel'], name='hostel_amenity_unique_key'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class HostelImage(models.Model):
+    """
+    A hostel image uploaded for a college (HostelImageUploadView). The row
+    holds the upload's reference on the stored file (College/storage.py):
+    only that college's hostels may list the file in `Hostel.images`, and
+    the reference is given back once none of them does.
+    """
+    college = models.ForeignKey(CollegeProfile, on_delete=models.CASCADE, related_name='hostel_images')
+    name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['college', 'name'], name='hostel_image_unique_name'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class HostelRoomType(models.Model):
+    """One room type of a hostel, normalized out of `Hostel.room_types`."""
+    hostel = models.ForeignKey(Hostel, on_delete=models.CASCADE, related_name='room_type_rows')
+    key = models.CharField(max_length=100)
+    name = models.CharField(max_length=100)
+    rooms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'hostel'], name='hostel_room_type_unique_key'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress (see College/uploads.py). The bytes
+    received so far sit in a part file; `offset` is how many of them are
+    safely written.
+    """
+    TARGET_CHOICES = [
+        ('gallery', 'Gallery item'),
+        ('brochure', 'Course brochure'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    college = models.ForeignKey(CollegeProfile, on_delete=models.CASCADE, related_name='upload_sessions')
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    # the course of a brochure upload
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    # extra fields of the row created on commit (gallery title, description, ...)
+    metadata = models.JSONField(default=dict, blank=True)
+
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='upload_session_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
@@ -0,0 +1,111 @@
+"""
+Nested resources of the public college representation.
+
+The public detail (and the batch endpoint) nests a college's courses,
+events, gallery items, faculties and hostels. `?include=courses,events`
+picks the relations to load; the others are neither queried nor returned.
+Each included relation is cut to its first `limit` rows (`?limit=`, or
+`?<relation>_limit=` for one relation) using a sliced prefetch, so a
+college with thousands of gallery items still costs one bounded query per
+relation. The response's `nested` block gives each relation's total
+`count` and a `next` link to `/api/colleges/public/<code>/<relation>/`,
+which pages through the rest in the same order.
+"""
+from django.conf import settings
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+from .models import CollegeProfile, Course, Event, Faculty, Gallery, Hostel
+
+
+# Rows of each nested relation embedded in a public college by default.
+NESTED_LIMIT = getattr(settings, "COLLEGE_NESTED_LIMIT", 10)
+MAX_NESTED_LIMIT = 100
+
+# relation -> (model, column holding the parent, value it holds, ordering)
+RELATIONS = {
+    "courses": (Course, "college", "college_code", ("degree", "specialization", "id")),
+    "events": (Event, "college", "pk", ("date", "id")),
+    "gallery_items": (Gallery, "college", "pk", ("display_order", "-created_at", "id")),
+    "faculties": (Faculty, "college", "pk", ("display_order", "name", "id")),
+    "hostels": (Hostel, "college", "pk", ("name", "id")),
+}
+
+# Nested serializer fields that only repeat the parent college.
+PARENT_FIELDS = ("college", "college_code", "college_name")
+
+
+def parse_include(value):
+    """Relations named in `?include=` (every relation when the parameter is absent)."""
+    if value is None:
+        return list(RELATIONS)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in RELATIONS]
+    if unknown:
+        raise ValidationError(
+            {"include": f"Unknown relation(s) {', '.join(unknown)}; choose from {', '.join(RELATIONS)}."}
+        )
+    return list(dict.fromkeys(names))
+
+
+def _limit(value, param):
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({param: "Must be a whole number."})
+    if not 0 <= limit <= MAX_NESTED_LIMIT:
+        raise ValidationError({param: f"Must be between 0 and {MAX_NESTED_LIMIT}."})
+    return limit
+
+
+def parse_limits(query_params, relations):
+    """``{relation: limit}`` from `?limit=` and `?<relation>_limit=`."""
+    default = NESTED_LIMIT
+    if "limit" in query_params:
+        default = _limit(query_params["limit"], "limit")
+    limits = {}
+    for relation in relations:
+        param = f"{relation}_limit"
+        limits[relation] = _limit(query_params[param], param) if param in query_params else default
+    return limits
+
+
+def is_default(query_params):
+    """True when the request asks for the default representation (no include or limits)."""
+    return not any(
+        param == "include" or param == "limit" or param.endswith("_limit") for param in query_params
+    )
+
+
+def related_rows(relation, college):
+    """Queryset of one relation of `college`, in its page order."""
+    model, column, source, ordering = RELATIONS[relation]
+    return model.objects.filter(**{column: getattr(college, source)}).order_by(*ordering)
+
+
+def _count(model, column, source):
+    rows = model.objects.filter(**{column: OuterRef(source)}).order_by().values(column).annotate(total=Count("pk"))
+    return Coalesce(Subquery(rows.values("total")[:1]), 0)
+
+
+def public_queryset(limits=None):
+    """
+    Colleges with the given relations prefetched into ``<relation>_page``
+    lists of at most ``limit + 1`` rows (the extra row tells whether a
+    `next` link is needed), and a ``<relation>_count`` annotation per
+    relation. `limits` defaults to every relation at NESTED_LIMIT.
+    """
+    if limits is None:
+        limits = dict.fromkeys(RELATIONS, NESTED_LIMIT)
+    queryset = CollegeProfile.objects.select_related("user", "approved_by")
+    for relation, limit in limits.items():
+        model, column, source, ordering = RELATIONS[relation]
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                relation,
+                queryset=model.objects.order_by(*ordering)[:limit + 1],
+                to_attr=f"{relation}_page",
+            )
+        ).annotate(**{f"{relation}_count": _count(model, column, source)})
+    return queryset
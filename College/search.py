@@ -0,0 +1,175 @@
+"""
+Full-text search index for colleges.
+
+Every CollegeProfile has one row in an SQLite FTS5 virtual table whose rowid
+is the college's primary key. The row carries the searchable text of the
+college plus the specializations of its courses, and is rewritten from
+signals whenever the college or one of its courses changes.
+
+Searching goes through the FTS index instead of running an ``icontains``
+scan over every column of every college. `matching()` narrows a queryset
+to the hits and annotates each with its bm25 relevance, so ranking, COUNT
+and pagination all happen in SQL over every match; `highlights()` then
+fetches the highlighted snippets of just the rows being returned.
+On any other database backend ``is_available()`` is False and callers fall
+back to the plain ``icontains`` search.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Value
+
+from .models import CollegeProfile, Course
+
+
+SEARCH_TABLE = "College_collegesearch"
+
+# Column order of the FTS table, paired with its bm25 weight.
+SEARCH_COLUMNS = [
+    ("college_name", 10.0),
+    ("district", 4.0),
+    ("state", 4.0),
+    ("country", 2.0),
+    ("accreditation_body", 3.0),
+    ("specializations", 3.0),
+    ("about_college", 1.0),
+]
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_available():
+    """The index only exists on SQLite (FTS5)."""
+    return connection.vendor == "sqlite"
+
+
+def _document_select(where):
+    """SELECT producing (rowid, *SEARCH_COLUMNS) for the colleges matching `where`."""
+    college_table = CollegeProfile._meta.db_table
+    course_table = Course._meta.db_table
+    return f"""
+        SELECT c.id, c.college_name, c.district, c.state, c.country,
+               COALESCE(c.accreditation_body, ''),
+               COALESCE((
+                   SELECT group_concat(s.specialization, ' ')
+                   FROM "{course_table}" s
+                   WHERE s.college_id = c.college_code
+                     AND s.specialization IS NOT NULL
+               ), ''),
+               c.about_college
+        FROM "{college_table}" c
+        WHERE {where}
+    """
+
+
+def _insert_sql(where):
+    columns = ", ".join(name for name, _ in SEARCH_COLUMNS)
+    return f'INSERT INTO "{SEARCH_TABLE}" (rowid, {columns}) {_document_select(where)}'
+
+
+def index_college(college_id):
+    """(Re)build the search document of a single college."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{SEARCH_TABLE}" WHERE rowid = %s', [college_id])
+        cursor.execute(_insert_sql("c.id = %s"), [college_id])
+
+
+def index_college_by_code(college_code):
+    """(Re)build the search document of the college owning `college_code`."""
+    if not is_available():
+        return
+    college_id = (
+        CollegeProfile.objects
+        .filter(college_code=college_code)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if college_id is not None:
+        index_college(college_id)
+
+
+def remove_college(college_id):
+    """Drop a college from the index."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{SEARCH_TABLE}" WHERE rowid = %s', [college_id])
+
+
+def rebuild_index():
+    """Re-create every search document from the current tables."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{SEARCH_TABLE}"')
+        cursor.execute(_insert_sql("1 = 1"))
+
+
+def build_match_query(text):
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted phrase (so FTS operators in the input are
+    never interpreted), words are ANDed together and the last word is
+    matched as a prefix so results keep up with the user typing.
+    Returns None when the input holds no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    phrases = [f'"{token}"' for token in tokens]
+    phrases[-1] += "*"
+    return " ".join(phrases)
+
+
+class SearchRank(Func):
+    """bm25 relevance (lower is better) of the joined search document `expression`."""
+    function = "bm25"
+    output_field = FloatField()
+
+    def __init__(self, expression):
+        super().__init__(expression, *(Value(weight) for _, weight in SEARCH_COLUMNS))
+
+
+def matching(queryset, text):
+    """
+    `queryset` (of CollegeProfile) narrowed to the colleges matching `text`
+    and annotated with their relevance as `search_rank` (lower is better).
+    The index is joined in, so MATCH runs once per query and bm25 once per
+    hit. None when `text` holds no searchable words or the index is
+    unavailable.
+    """
+    match = build_match_query(text)
+    if match is None or not is_available():
+        return None
+    return queryset.filter(search_document__document__match=match).annotate(
+        search_rank=SearchRank(F("search_document__document"))
+    )
+
+
+def highlights(text, college_ids):
+    """
+    ``{college_id: snippet}`` for the given colleges: a short excerpt of the
+    best-matching column with the matched terms wrapped in HIGHLIGHT_START /
+    HIGHLIGHT_END.
+    """
+    match = build_match_query(text)
+    college_ids = list(college_ids)
+    if match is None or not college_ids or not is_available():
+        return {}
+
+    placeholders = ", ".join(["%s"] * len(college_ids))
+    sql = f"""
+        SELECT rowid,
+               snippet("{SEARCH_TABLE}", -1, %s, %s, '…', 12)
+        FROM "{SEARCH_TABLE}"
+        WHERE "{SEARCH_TABLE}" MATCH %s AND rowid IN ({placeholders})
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [HIGHLIGHT_START, HIGHLIGHT_END, match, *college_ids])
+        return {row[0]: row[1] for row in cursor.fetchall()}
@@ -1,8 +1,79 @@
+from django.core.files.storage import default_storage
+from django.urls import reverse
 from rest_framework import serializers
-from .models import CollegeProfile,Course,Event,Gallery,Faculty,Hostel
+from . import images, storage, uploads
+from .models import CollegeProfile,Course,Event,Gallery,Faculty,Hostel,UploadSession
+from .nested import NESTED_LIMIT, PARENT_FIELDS, RELATIONS
 
 
-class CollegeProfileSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Lets a view keep only some of a serializer's fields (`?fields=`).
+
+    `fields=[...]` drops every other declared field and `omit=[...]` drops
+    the named ones; unknown names are ignored. `columns_for()` lists the
+    model columns those fields read so the view can pass them to `.only()`.
+    """
+    # serializer field -> model columns it reads, for fields that are not
+    # plain model fields
+    column_sources = {}
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    @classmethod
+    def selectable_fields(cls, requested=None):
+        """`requested` narrowed to this serializer's fields (all of them if empty)."""
+        if not requested:
+            return list(cls.Meta.fields)
+        return [name for name in cls.Meta.fields if name in requested]
+
+    @classmethod
+    def columns_for(cls, fields):
+        model = cls.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        for name in fields:
+            if name in cls.column_sources:
+                columns.update(cls.column_sources[name])
+            elif name in concrete:
+                columns.add(name)
+        return sorted(columns)
+
+
+class ImageVariantsMixin:
+    """
+    Adds `<field>_variants` next to each field in `image_variant_fields`:
+    the `srcset` / `webp_srcset` of the image's resized copies and their
+    URLs (see College/images.py), or null until they are built. Reads the
+    row's `image_variants` column, so no query per row.
+    """
+    image_variant_fields = ()
+
+    def variant_url(self, name):
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        shown = [field_name for field_name in self.image_variant_fields if field_name in self.fields]
+        if shown:
+            # not read otherwise: a sparse fieldset leaves the column deferred
+            variants = getattr(instance, "image_variants", None) or {}
+            for field_name in shown:
+                file = getattr(instance, field_name)
+                entry = variants.get(file.name) if file else None
+                data[f"{field_name}_variants"] = images.represent(entry, self.variant_url)
+        return data
+
+
+class CollegeProfileSerializer(ImageVariantsMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for CollegeProfile model."""
 
     # Read-only system-generated fields
@@ -14,6 +85,13 @@ class CollegeProfileSerializer(serializers.ModelSerializer):
     # Dynamically get main streams from related courses
     main_streams = serializers.SerializerMethodField(read_only=True)
 
+    column_sources = {
+        "main_streams": ("course_streams",),
+        "college_logo": ("college_logo", "image_variants"),
+        "college_image": ("college_image", "image_variants"),
+    }
+    image_variant_fields = ("college_logo", "college_image")
+
     class Meta:
         model = CollegeProfile
         fields = [
@@ -67,9 +145,22 @@ class CollegeProfileSerializer(serializers.ModelSerializer):
         ]
     
     def get_main_streams(self, obj):
-        """Get unique main streams from related courses"""
-        main_streams = obj.courses.values_list('main_stream', flat=True).distinct()
-        return list(main_streams)
+        """
+        Unique main streams of the college's courses, read from the
+        denormalized `course_streams` column so listing a page of colleges
+        costs no query per row.
+        """
+        return CollegeProfile.facet_values(obj.course_streams)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        highlights = self.context.get("search_highlights")
+        if highlights is not None:
+            data["search_highlight"] = highlights.get(instance.pk)
+        distance = getattr(instance, "distance_km", None)
+        if distance is not None:
+            data["distance_km"] = round(distance, 2)
+        return data
 
     def create(self, validated_data):
         """Create college profile and mark profile complete if valid."""
@@ -85,7 +176,26 @@ class CollegeProfileSerializer(serializers.ModelSerializer):
         instance.mark_profile_complete()
         return instance
 
-class CourseSerializer(serializers.ModelSerializer):
+
+class CollegeSummarySerializer(CollegeProfileSerializer):
+    """Compact card representation used by default for college listings."""
+
+    class Meta(CollegeProfileSerializer.Meta):
+        fields = [
+            "id",
+            "college_name",
+            "college_code",
+            "college_type",
+            "state",
+            "district",
+            "college_logo",
+            "verified",
+            "is_popular",
+            "is_featured",
+            "main_streams",
+        ]
+
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     college_code = serializers.CharField(source='college.college_code', read_only=True)
     college_name = serializers.CharField(source='college.college_name', read_only=True)
 
@@ -119,8 +229,30 @@ class CourseSerializer(serializers.ModelSerializer):
 
 
 
-class EventSerializer(serializers.ModelSerializer):
+class CourseCatalogSerializer(CourseSerializer):
+    """Course row of the public catalog, with where the college is."""
+    state = serializers.CharField(source='college.state', read_only=True)
+    district = serializers.CharField(source='college.district', read_only=True)
+
+    class Meta(CourseSerializer.Meta):
+        fields = [
+            'id',
+            'college_code',
+            'college_name',
+            'state',
+            'district',
+            'main_stream',
+            'degree',
+            'level',
+            'specialization',
+            'duration',
+            'fee',
+        ]
+
+
+class EventSerializer(ImageVariantsMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     college_name = serializers.CharField(source='college.name', read_only=True)
+    image_variant_fields = ('image',)
 
     class Meta:
         model = Event
@@ -131,9 +263,24 @@ class EventSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class GallerySerializer(serializers.ModelSerializer):
+class EventFeedSerializer(EventSerializer):
+    """Event row of the cross-college feed, with its college and where it is."""
+    college_code = serializers.CharField(source='college.college_code', read_only=True)
+    college_name = serializers.CharField(source='college.college_name', read_only=True)
+    state = serializers.CharField(source='college.state', read_only=True)
+    district = serializers.CharField(source='college.district', read_only=True)
+
+    class Meta(EventSerializer.Meta):
+        fields = [
+            'id', 'college_code', 'college_name', 'state', 'district',
+            'name', 'date', 'location', 'description', 'image',
+        ]
+
+
+class GallerySerializer(ImageVariantsMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField(read_only=True)
     college_name = serializers.CharField(source="college.college_name", read_only=True)  # optional
+    image_variant_fields = ("file",)
 
     class Meta:
         model = Gallery
@@ -158,7 +305,9 @@ class GallerySerializer(serializers.ModelSerializer):
         return None
 
 
-class FacultySerializer(serializers.ModelSerializer):
+class FacultySerializer(ImageVariantsMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    image_variant_fields = ("photo",)
+
     class Meta:
         model = Faculty
         fields = [
@@ -177,22 +326,80 @@ class FacultySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["college","id", "created_at"]
 
-class HostelSerializer(serializers.ModelSerializer):
+class HostelSerializer(ImageVariantsMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Hostel
-        fields = "__all__"
+        exclude = ["image_variants"]
+
+    def validate_images(self, value):
+        """Media files in `images` must have been uploaded for this college (`/hostels/upload-image/`)."""
+        request = self.context.get('request')
+        if self.instance is not None:
+            college = self.instance.college
+        elif request is not None and request.user.is_authenticated:
+            college = CollegeProfile.objects.filter(user=request.user).first()
+        else:
+            college = None
+        if college is None:
+            return value
+        listed = set(storage.referenced_names(self.instance, variants=False)) if self.instance is not None else set()
+        if storage.foreign_hostel_images(college, value) - listed:
+            raise serializers.ValidationError("Images must be uploaded for your college first.")
+        return value
+
+    def to_representation(self, instance):
+        """`images_variants` holds the variants of each of `images`, in the same order."""
+        data = super().to_representation(instance)
+        if "images" in self.fields:
+            variants = instance.image_variants or {}
+            data["images_variants"] = [
+                images.represent(variants.get(images.storage_name(url)), self.variant_url)
+                for url in instance.images or []
+            ]
+        return data
+
+
+class HostelSearchSerializer(HostelSerializer):
+    """Hostel row of the cross-college search, with its college and where it is."""
+    college_code = serializers.CharField(source='college.college_code', read_only=True)
+    college_name = serializers.CharField(source='college.college_name', read_only=True)
+    state = serializers.CharField(source='college.state', read_only=True)
+    district = serializers.CharField(source='college.district', read_only=True)
+
+    class Meta(HostelSerializer.Meta):
+        exclude = None
+        fields = [
+            'id',
+            'college_code',
+            'college_name',
+            'state',
+            'district',
+            'name',
+            'type',
+            'fee',
+            'room_types',
+            'amenities',
+            'images',
+            'description',
+        ]
 
 
 class CollegePublicSerializer(CollegeProfileSerializer):
     """
     Public-facing serializer that includes related resources for a college detail view.
     This nests courses, events, gallery items, faculties and hostels for read-only consumption.
+
+    Instances come from `nested.public_queryset()`. The `nested_limits`
+    context (``{relation: limit}``) selects the relations to nest and how
+    many rows of each to embed; the `nested` block of the output links to
+    the rest. Nested rows leave out
+    the fields that would only repeat the college.
     """
-    courses = CourseSerializer(many=True, read_only=True)
-    events = EventSerializer(many=True, read_only=True)
-    gallery_items = GallerySerializer(many=True, read_only=True)
-    faculties = FacultySerializer(many=True, read_only=True)
-    hostels = HostelSerializer(many=True, read_only=True)
+    courses = CourseSerializer(source='courses_page', many=True, read_only=True, omit=PARENT_FIELDS)
+    events = EventSerializer(source='events_page', many=True, read_only=True, omit=PARENT_FIELDS)
+    gallery_items = GallerySerializer(source='gallery_items_page', many=True, read_only=True, omit=PARENT_FIELDS)
+    faculties = FacultySerializer(source='faculties_page', many=True, read_only=True, omit=PARENT_FIELDS)
+    hostels = HostelSerializer(source='hostels_page', many=True, read_only=True, omit=PARENT_FIELDS)
 
     class Meta(CollegeProfileSerializer.Meta):
         # reuse parent fields and add nested resource names
@@ -200,3 +407,85 @@ class CollegePublicSerializer(CollegeProfileSerializer):
             'courses', 'events', 'gallery_items', 'faculties', 'hostels'
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for relation in set(RELATIONS) - set(self.nested_limits):
+            self.fields.pop(relation, None)
+
+    @property
+    def nested_limits(self):
+        limits = self.context.get('nested_limits')
+        return dict.fromkeys(RELATIONS, NESTED_LIMIT) if limits is None else limits
+
+    def get_continuation_url(self, instance, relation, limit):
+        url = reverse('college-public-relation', kwargs={'college_code': instance.college_code, 'relation': relation})
+        if limit:
+            url += f'?page=2&page_size={limit}'
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['nested'] = {}
+        for relation, limit in self.nested_limits.items():
+            rows = data[relation]
+            data[relation] = rows[:limit]
+            data['nested'][relation] = {
+                'count': getattr(instance, f'{relation}_count'),
+                'next': self.get_continuation_url(instance, relation, limit) if len(rows) > limit else None,
+            }
+        return data
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Opens a resumable upload (College/uploads.py). `title`, `description`
+    and `display_order` are kept for the gallery item created on commit;
+    a brochure upload names its `course`.
+    """
+    title = serializers.CharField(max_length=255, required=False, allow_blank=True, write_only=True)
+    description = serializers.CharField(required=False, allow_blank=True, write_only=True)
+    display_order = serializers.IntegerField(min_value=0, required=False, write_only=True)
+    size = serializers.IntegerField(min_value=1, max_value=uploads.UPLOAD_MAX_SIZE)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id',
+            'target',
+            'course',
+            'filename',
+            'size',
+            'offset',
+            'chunk_size',
+            'metadata',
+            'title',
+            'description',
+            'display_order',
+            'created_at',
+            'expires_at',
+        ]
+        read_only_fields = ['id', 'offset', 'metadata', 'created_at', 'expires_at']
+
+    def get_chunk_size(self, obj):
+        return uploads.UPLOAD_CHUNK_SIZE
+
+    def validate(self, attrs):
+        uploads.check_filename(attrs['target'], attrs['filename'])
+        college = self.context['college']
+        course = attrs.get('course')
+        if attrs['target'] == 'brochure':
+            if course is None:
+                raise serializers.ValidationError({'course': ['Required for a brochure upload.']})
+            if course.college_id != college.college_code:
+                raise serializers.ValidationError({'course': ['Not a course of your college.']})
+        else:
+            attrs.pop('course', None)
+        attrs['metadata'] = {
+            key: attrs.pop(key) for key in ('title', 'description', 'display_order') if key in attrs
+        }
+        return attrs
+
+    def create(self, validated_data):
+        return uploads.open_session(user=self.context['request'].user, college=self.context['college'], **validated_data)
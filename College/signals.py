@@ -1,8 +1,13 @@
-from django.db.models.signals import post_save, pre_save
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import CollegeProfile, AdmissionApplication, ConsultantProfile
+from .models import CollegeProfile, Course, Event, Faculty, Gallery, Hostel, HostelImage
+from . import autocomplete, caching, course_catalog, documents, event_feed, facets, filter_options, fuzzy, geo, images, locations, search, storage
 
 
 # -------------------------------------------------------------------
@@ -25,52 +30,408 @@ def notify_admin_on_new_college(sender, instance, created, **kwargs):
             send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [admin_email])
 
 
+def course_college_codes(instance):
+    """Codes of the colleges a course write affects: its own and, after a move, the previous one."""
+    previous = getattr(instance, '_previous_college_code', None)
+    return [instance.college_id] + ([previous] if previous else [])
+
+
+@receiver(pre_save, sender=Course)
+def remember_previous_college(sender, instance, raw=False, update_fields=None, **kwargs):
+    """A course moved to another college leaves the previous college's derived data stale too."""
+    instance._previous_college_code = None
+    if raw or instance._state.adding or (update_fields is not None and 'college' not in update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('college_id', flat=True).first()
+    if previous is not None and previous != instance.college_id:
+        instance._previous_college_code = previous
+
+
+# -------------------------------------------------------------------
+# 🔹 2. Keep the full-text search index in sync
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CollegeProfile)
+def index_college_on_save(sender, instance, **kwargs):
+    """Rebuild the college's search document after every save."""
+    search.index_college(instance.pk)
+
+
+@receiver(post_delete, sender=CollegeProfile)
+def unindex_college_on_delete(sender, instance, **kwargs):
+    """Remove a deleted college from the search index."""
+    search.remove_college(instance.pk)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def reindex_college_on_course_change(sender, instance, **kwargs):
+    """Course specializations are part of the college's search document."""
+    for college_code in course_college_codes(instance):
+        search.index_college_by_code(college_code)
+
+
+# -------------------------------------------------------------------
+# 🔹 3. Keep denormalized course facets on CollegeProfile up to date
+# -------------------------------------------------------------------
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def refresh_college_course_facets(sender, instance, **kwargs):
+    """Recompute streams/degrees/levels/specializations of the course's college(s)."""
+    for college_code in course_college_codes(instance):
+        CollegeProfile.refresh_course_facets(college_code)
+
+
+# -------------------------------------------------------------------
+# 🔹 4. Link the college to its canonical location rows
+# -------------------------------------------------------------------
+@receiver(pre_save, sender=CollegeProfile)
+def link_college_location(sender, instance, **kwargs):
+    """Runs before the filter-option check so it sees the canonical spelling."""
+    locations.link_profile_on_save(sender, instance, **kwargs)
+
+
+# -------------------------------------------------------------------
+# 🔹 5. Invalidate cached filter options when their source fields change
+# -------------------------------------------------------------------
+@receiver(pre_save, sender=CollegeProfile)
+@receiver(pre_save, sender=Course)
+def detect_stale_filter_options(sender, instance, update_fields=None, **kwargs):
+    """Work out which cached filter options this save makes stale."""
+    affected = filter_options.options_for_fields(sender)
+    fields = {filter_options.FILTER_OPTIONS[name].field for name in affected}
+    if sender is Course:
+        # Moving a course changes the college counts of every course option.
+        fields.add('college')
+    if update_fields is not None:
+        fields &= set(update_fields)
+
+    if not fields:
+        instance._stale_filter_options = []
+        return
+
+    previous = None
+    if not instance._state.adding:
+        previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if previous is None:
+        instance._stale_filter_options = affected
+        return
+
+    changed = {
+        field for field in fields
+        if previous[field] != getattr(instance, sender._meta.get_field(field).attname)
+    }
+    if 'college' in changed:
+        instance._stale_filter_options = affected
+    else:
+        instance._stale_filter_options = filter_options.options_for_fields(sender, changed)
+
+
+@receiver(post_save, sender=CollegeProfile)
+@receiver(post_save, sender=Course)
+def invalidate_filter_options_on_save(sender, instance, **kwargs):
+    stale = getattr(instance, '_stale_filter_options', [])
+    if stale:
+        transaction.on_commit(lambda: filter_options.invalidate(stale))
+
+
+@receiver(post_delete, sender=CollegeProfile)
+@receiver(post_delete, sender=Course)
+def invalidate_filter_options_on_delete(sender, instance, **kwargs):
+    stale = filter_options.options_for_fields(sender)
+    transaction.on_commit(lambda: filter_options.invalidate(stale))
+
+
+# -------------------------------------------------------------------
+# 🔹 6. Keep the in-memory facet index up to date
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CollegeProfile)
+def update_facet_index_on_save(sender, instance, **kwargs):
+    college_id = instance.pk
+    transaction.on_commit(lambda: facets.index.update_college(college_id))
+
+
+@receiver(post_delete, sender=CollegeProfile)
+def update_facet_index_on_delete(sender, instance, **kwargs):
+    college_id = instance.pk
+    transaction.on_commit(lambda: facets.index.remove_college(college_id))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def update_facet_index_on_course_change(sender, instance, **kwargs):
+    """Runs after refresh_college_course_facets has rewritten the course_* columns."""
+    college_ids = list(
+        CollegeProfile.objects
+        .filter(college_code__in=course_college_codes(instance))
+        .values_list('id', flat=True)
+    )
+    if college_ids:
+        transaction.on_commit(lambda: [facets.index.update_college(college_id) for college_id in college_ids])
+
+
+# -------------------------------------------------------------------
+# 🔹 7. Keep the in-memory fuzzy (trigram) search indexes up to date
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CollegeProfile)
+def update_fuzzy_index_on_college_save(sender, instance, **kwargs):
+    college_id = instance.pk
+    transaction.on_commit(lambda: fuzzy.college_names.update(college_id))
+
+
+@receiver(post_delete, sender=CollegeProfile)
+def update_fuzzy_index_on_college_delete(sender, instance, **kwargs):
+    college_id = instance.pk
+    transaction.on_commit(lambda: fuzzy.college_names.remove(college_id))
+
+
+@receiver(post_save, sender=Course)
+def update_fuzzy_index_on_course_save(sender, instance, **kwargs):
+    course_id = instance.pk
+    transaction.on_commit(lambda: fuzzy.specializations.update(course_id))
+
+
+@receiver(post_delete, sender=Course)
+def update_fuzzy_index_on_course_delete(sender, instance, **kwargs):
+    course_id = instance.pk
+    transaction.on_commit(lambda: fuzzy.specializations.remove(course_id))
+
+
+# -------------------------------------------------------------------
+# 🔹 8. Keep the autocomplete prefix index up to date
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CollegeProfile)
+def update_autocomplete_on_college_save(sender, instance, **kwargs):
+    college_id = instance.pk
+
+    def update():
+        autocomplete.INDEXES["colleges"].update(college_id)
+        autocomplete.INDEXES["districts"].update(college_id)
+    transaction.on_commit(update)
+
+
+@receiver(post_delete, sender=CollegeProfile)
+def update_autocomplete_on_college_delete(sender, instance, **kwargs):
+    college_id = instance.pk
+
+    def remove():
+        autocomplete.INDEXES["colleges"].remove(college_id)
+        autocomplete.INDEXES["districts"].remove(college_id)
+    transaction.on_commit(remove)
+
+
+@receiver(post_save, sender=Course)
+def update_autocomplete_on_course_save(sender, instance, **kwargs):
+    course_id = instance.pk
+    transaction.on_commit(lambda: autocomplete.INDEXES["specializations"].update(course_id))
+
+
+@receiver(post_delete, sender=Course)
+def update_autocomplete_on_course_delete(sender, instance, **kwargs):
+    course_id = instance.pk
+    transaction.on_commit(lambda: autocomplete.INDEXES["specializations"].remove(course_id))
+
+
+# -------------------------------------------------------------------
+# 🔹 9. Derive the college's coordinates from its pin code
+# -------------------------------------------------------------------
+@receiver(pre_save, sender=CollegeProfile)
+def set_college_coordinates(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is None:
+        geo.set_college_coordinates(instance)
+    elif 'pin_code' in update_fields and instance.pk is not None:
+        # latitude/longitude are not part of this save, write them directly
+        geo.set_college_coordinates(instance)
+        sender.objects.filter(pk=instance.pk).update(latitude=instance.latitude, longitude=instance.longitude)
+
+
+# -------------------------------------------------------------------
+# 🔹 10. Keep the HTTP validators of the public endpoints moving
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CollegeProfile)
+@receiver(post_delete, sender=CollegeProfile)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def bump_catalog_version(sender, instance, **kwargs):
+    """List ETags derive from the catalog version."""
+    transaction.on_commit(caching.bump_catalog_version)
+
+
+@receiver(post_delete, sender=Course)
+def touch_college_on_course_delete(sender, instance, **kwargs):
+    """A deleted row leaves no updated_at behind, so date the change on the college."""
+    caching.touch_college(college_code=instance.college_id)
+
+
+@receiver(post_save, sender=Course)
+def touch_college_on_course_move(sender, instance, **kwargs):
+    """Likewise for the college a moved course has left."""
+    previous = getattr(instance, '_previous_college_code', None)
+    if previous:
+        caching.touch_college(college_code=previous)
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Gallery)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_delete, sender=Hostel)
+def touch_college_on_nested_delete(sender, instance, **kwargs):
+    caching.touch_college(pk=instance.college_id)
+
+
+# -------------------------------------------------------------------
+# 🔹 11. Rebuild the materialized public document of the college
+# -------------------------------------------------------------------
+@receiver(post_save, sender=CollegeProfile)
+def rebuild_public_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: documents.rebuild(pk=instance.pk))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def rebuild_public_document_on_course_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        college_codes = course_college_codes(instance)
+        transaction.on_commit(lambda: [documents.rebuild(college_code=code) for code in college_codes])
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Gallery)
+@receiver(post_delete, sender=Gallery)
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_save, sender=Hostel)
+@receiver(post_delete, sender=Hostel)
+def rebuild_public_document_on_nested_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: documents.rebuild(pk=instance.college_id))
+
+
+# -------------------------------------------------------------------
+# 🔹 12. Drop cached course catalog pages
+# -------------------------------------------------------------------
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=CollegeProfile)
+@receiver(post_delete, sender=CollegeProfile)
+def invalidate_course_catalog(sender, instance, **kwargs):
+    """Catalog rows carry course and college columns, so any such write orphans them."""
+    transaction.on_commit(course_catalog.invalidate)
+
+
+# -------------------------------------------------------------------
+# 🔹 13. Keep the indexed hostel amenities / room types in sync
+# -------------------------------------------------------------------
+@receiver(post_save, sender=Hostel)
+def refresh_hostel_features(sender, instance, raw=False, **kwargs):
+    """Deleted hostels take their rows with them (CASCADE)."""
+    if not raw:
+        instance.refresh_features()
+
+
+# -------------------------------------------------------------------
+# 🔹 14. Events feed / calendar validators
 # -------------------------------------------------------------------
-# 🔹 2. Notify student when their application status changes
-# -------------------------------------------------------------------
-@receiver(pre_save, sender=AdmissionApplication)
-def handle_application_status_change(sender, instance, **kwargs):
-    """Notify student when their admission application is accepted or rejected."""
-    if instance.pk:
-        previous = AdmissionApplication.objects.get(pk=instance.pk)
-        if previous.status != instance.status:
-            subject = None
-            message = None
-
-            if instance.status == 'accepted':
-                subject = f"🎉 Application Accepted - {instance.course.name}"
-                message = (
-                    f"Dear {instance.student.get_full_name() or 'Student'},\n\n"
-                    f"Congratulations! Your application for the course "
-                    f"'{instance.course.name}' at '{instance.course.college.college_name}' "
-                    f"has been accepted.\n\n"
-                    f"Please proceed to complete your admission process."
-                )
-            elif instance.status == 'rejected':
-                subject = f"❌ Application Rejected - {instance.course.name}"
-                message = (
-                    f"Dear {instance.student.get_full_name() or 'Student'},\n\n"
-                    f"We regret to inform you that your application for "
-                    f"'{instance.course.name}' at '{instance.course.college.college_name}' "
-                    f"has been rejected.\n\n"
-                    f"You may apply for other available courses on our platform."
-                )
-
-            if subject and message:
-                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [instance.student.email])
-
-
-# -------------------------------------------------------------------
-# 🔹 3. Automatically assign parent consultant (if applicable)
-# -------------------------------------------------------------------
-@receiver(pre_save, sender=ConsultantProfile)
-def assign_parent_consultant(sender, instance, **kwargs):
-    """Auto-assign parent consultant for district-level consultants."""
-    if instance.consultant_type == 'district' and not instance.parent_consultant:
-        state_consultant = ConsultantProfile.objects.filter(
-            state=instance.state,
-            consultant_type='state',
-            verified=True
-        ).first()
-        if state_consultant:
-            instance.parent_consultant = state_consultant
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=CollegeProfile)
+@receiver(post_delete, sender=CollegeProfile)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def bump_events_version(sender, instance, **kwargs):
+    """Feed rows carry the college's name and location and are filtered by its course streams."""
+    transaction.on_commit(event_feed.bump)
+
+
+# -------------------------------------------------------------------
+# 🔹 15. Normalize image uploads and build their resized variants
+# -------------------------------------------------------------------
+@receiver(pre_save, sender=CollegeProfile)
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=Gallery)
+@receiver(pre_save, sender=Faculty)
+def normalize_image_uploads(sender, instance, raw=False, **kwargs):
+    """Runs before the file fields write their pending uploads to storage."""
+    if not raw:
+        for field_name in images.IMAGE_FIELDS[sender]:
+            images.normalize_field(instance, field_name)
+
+
+@receiver(post_save, sender=CollegeProfile)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Gallery)
+@receiver(post_save, sender=Faculty)
+@receiver(post_save, sender=Hostel)
+def build_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and images.needs_variants(instance):
+        images.schedule(instance)
+
+
+# -------------------------------------------------------------------
+# 🔹 16. Give back media references of replaced and deleted files
+# -------------------------------------------------------------------
+# Variants are not compared here: College/images.py replaces those itself.
+@receiver(pre_save, sender=CollegeProfile)
+@receiver(pre_save, sender=Course)
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=Gallery)
+@receiver(pre_save, sender=Faculty)
+@receiver(pre_save, sender=Hostel)
+def remember_stored_media(sender, instance, raw=False, **kwargs):
+    instance._stored_media = []
+    if raw or instance.pk is None:
+        return
+    fields = ("images",) if sender is Hostel else storage.MEDIA_FIELDS[sender]
+    previous = sender.objects.filter(pk=instance.pk).only(*fields).first()
+    if previous is not None:
+        instance._stored_media = storage.referenced_names(previous, variants=False)
+
+
+@receiver(post_save, sender=CollegeProfile)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Gallery)
+@receiver(post_save, sender=Faculty)
+def release_replaced_media(sender, instance, raw=False, **kwargs):
+    replaced = Counter(getattr(instance, "_stored_media", ())) - Counter(
+        storage.referenced_names(instance, variants=False)
+    )
+    if not raw and replaced:
+        transaction.on_commit(lambda: [default_storage.delete(name) for name in replaced.elements()])
+
+
+@receiver(post_delete, sender=CollegeProfile)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Gallery)
+@receiver(post_delete, sender=Faculty)
+def release_deleted_media(sender, instance, **kwargs):
+    names = storage.referenced_names(instance)
+    if names:
+        transaction.on_commit(lambda: [default_storage.delete(name) for name in names])
+
+
+# Hostel images are client-written URLs: only the college's own uploads
+# (HostelImage rows) are given back, see College/storage.py.
+@receiver(post_save, sender=Hostel)
+def release_unlisted_hostel_images(sender, instance, raw=False, **kwargs):
+    removed = set(getattr(instance, "_stored_media", ())) - set(storage.referenced_names(instance, variants=False))
+    if not raw and removed:
+        storage.release_hostel_images(instance.college_id, removed)
+
+
+@receiver(post_delete, sender=Hostel)
+def release_deleted_hostel_media(sender, instance, **kwargs):
+    storage.release_hostel_images(instance.college_id, storage.referenced_names(instance, variants=False))
+    variants = storage.variant_names(instance)
+    if variants:
+        transaction.on_commit(lambda: [default_storage.delete(name) for name in variants])
+
+
+@receiver(post_delete, sender=HostelImage)
+def release_hostel_image(sender, instance, **kwargs):
+    name = instance.name
+    transaction.on_commit(lambda: storage.release_counted(name))
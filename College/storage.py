@@ -0,0 +1,207 @@
+"""
+Content-addressed, deduplicated media storage.
+
+`ContentAddressedStorage` (the default storage, see STORAGES in settings)
+ignores the name an upload asks for. It stores every file once, under the
+SHA-256 of its bytes:
+
+    blobs/3f/a2/3fa2…e9.png
+
+Saving a file that is already stored writes nothing and returns the
+existing name. The hash is computed while the upload streams in, by the
+upload handlers below (FILE_UPLOAD_HANDLERS), so the storage does not read
+the file again. Files built in memory (normalized images, variants) are
+hashed when saved.
+
+Each save takes one reference on its file, counted in MediaBlob.
+`delete()` gives one back and removes the file once no reference is left.
+The signals in College/signals.py give back the references of replaced and
+deleted college, course brochure, event, gallery and faculty files. Files
+stored before this storage existed have no MediaBlob row and are deleted
+outright. `dedupe_media` moves them into the blob tree and recounts every
+reference.
+
+Hostel images are URLs clients write into `Hostel.images`, so a hostel
+holds no reference of its own. The upload's reference belongs to a
+HostelImage row of the college it was uploaded for. It is given back once
+no hostel of that college lists the file any more, and never for a file
+without a MediaBlob row.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import F
+
+from . import images
+from .models import CollegeProfile, Course, Event, Faculty, Gallery, Hostel, HostelImage, MediaBlob
+
+
+BLOB_PREFIX = "blobs"
+
+# model -> file fields whose references are given back on replace / delete
+MEDIA_FIELDS = {
+    CollegeProfile: ("college_logo", "college_image", "credential_image"),
+    Course: ("brochure",),
+    Event: ("image",),
+    Gallery: ("file",),
+    Faculty: ("photo",),
+}
+
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+def content_hash(content):
+    """SHA-256 hex digest of a File, read chunk by chunk."""
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+    content.seek(0)
+    return hasher.hexdigest()
+
+
+def blob_name(digest, name):
+    """Storage name of the bytes with `digest`; keeps the extension of `name`."""
+    extension = os.path.splitext(name or "")[1].lower()
+    if not _EXTENSION.match(extension):
+        extension = ""
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def is_blob(name):
+    return (name or "").startswith(f"{BLOB_PREFIX}/")
+
+
+def acquire(name, size=0):
+    if not MediaBlob.objects.filter(name=name).update(references=F("references") + 1):
+        blob, created = MediaBlob.objects.get_or_create(name=name, defaults={"size": size, "references": 1})
+        if not created:
+            MediaBlob.objects.filter(name=name).update(references=F("references") + 1)
+
+
+def release(name):
+    """Give back one reference; True when the file is no longer referenced."""
+    with transaction.atomic():
+        MediaBlob.objects.filter(name=name, references__gt=0).update(references=F("references") - 1)
+        remaining = MediaBlob.objects.filter(name=name).values_list("references", flat=True).first()
+        if remaining == 0:
+            MediaBlob.objects.filter(name=name, references=0).delete()
+    return not remaining
+
+
+def release_counted(name):
+    """Give back one reference of blob `name`; a file without a MediaBlob row is left alone."""
+    if MediaBlob.objects.filter(name=name).exists():
+        default_storage.delete(name)
+
+
+def variant_names(instance):
+    """Storage names of the resized variants of `instance`."""
+    return [
+        size[key]
+        for entry in (getattr(instance, "image_variants", None) or {}).values()
+        for size in entry.get("sizes", ())
+        for key in ("src", "webp")
+        if size.get(key)
+    ]
+
+
+def referenced_names(instance, variants=True):
+    """Storage names `instance` holds references to: its files and (unless told not to) their variants."""
+    if isinstance(instance, Hostel):
+        names = hostel_image_names(instance.images)
+    else:
+        names = [getattr(instance, field).name for field in MEDIA_FIELDS[type(instance)] if getattr(instance, field)]
+    return names + variant_names(instance) if variants else names
+
+
+def hostel_image_names(urls):
+    """Storage names of the media URLs in a `Hostel.images` list."""
+    if not isinstance(urls, list):
+        return []
+    return [name for name in (images.storage_name(url) for url in urls if isinstance(url, str)) if name]
+
+
+def foreign_hostel_images(college, urls):
+    """Storage names in `urls` that were not uploaded for `college`."""
+    names = set(hostel_image_names(urls))
+    if not names:
+        return set()
+    return names - set(HostelImage.objects.filter(college=college, name__in=names).values_list("name", flat=True))
+
+
+def release_hostel_images(college_id, names):
+    """
+    Drop the HostelImage rows (and so the upload references) of `names`
+    that no hostel of college `college_id` lists any more. Names the
+    college did not upload are ignored.
+    """
+    names = set(names)
+    if not names:
+        return
+    listed = {
+        name
+        for urls in Hostel.objects.filter(college_id=college_id).values_list("images", flat=True)
+        for name in hostel_image_names(urls)
+    }
+    if names - listed:
+        HostelImage.objects.filter(college_id=college_id, name__in=names - listed).delete()
+
+
+class ContentHashMixin:
+    """Upload handler that hashes the file as its chunks arrive (`file.content_hash`)."""
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if getattr(self, "activated", True):
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(ContentHashMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(ContentHashMixin, TemporaryFileUploadHandler):
+    pass
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, **kwargs):
+        # Two writers racing on one blob write the same bytes.
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = getattr(content, "content_hash", None) or content_hash(content)
+        name = blob_name(digest, name)
+        if not self.exists(name):
+            name = self._save(name, content)
+        acquire(name, content.size or 0)
+        return name
+
+    def delete(self, name):
+        if name and release(name):
+            super().delete(name)
+
+    def purge(self, name):
+        """Delete the file whatever its reference count."""
+        MediaBlob.objects.filter(name=name).delete()
+        super().delete(name)
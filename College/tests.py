@@ -1,3 +1,1183 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from PIL import Image
+
+from EDUCATION_PIONEER import media
+
+from . import images, uploads
+from .models import CollegeProfile, Course, Event, Hostel, HostelImage, MediaBlob, PublicCollegeDocument, UploadSession
+
+User = get_user_model()
+
+
+def create_college(index, **extra):
+    user = User.objects.create(email=f"college{index}@example.com", user_type="admin")
+    fields = {
+        "user": user,
+        "college_name": f"College {index}",
+        "college_code": f"COL-{index:04d}",
+        "country": "India",
+        "state": "Karnataka",
+        "district": "Bengaluru",
+        "address": "Main Road",
+        "email": f"college{index}@example.com",
+        "phone": "9999999999",
+    }
+    fields.update(extra)
+    return CollegeProfile.objects.create(**fields)
+
+
+def create_course(college, main_stream, degree, specialization):
+    return Course.objects.create(
+        college=college,
+        main_stream=main_stream,
+        degree=degree,
+        level="undergraduate",
+        specialization=specialization,
+        duration="4 Years",
+        fee=100000,
+    )
+
+
+class CollegeListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def _list_query_count(self, url="/api/colleges/list/"):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), response.json()
+
+    def _add_colleges(self, start, count):
+        for index in range(start, start + count):
+            college = create_college(index)
+            create_course(college, "engineering", "btech", f"Computer Science {index}")
+            create_course(college, "medical", "mbbs", f"Surgery {index}")
+
+    def test_main_streams_do_not_add_a_query_per_college(self):
+        self._add_colleges(1, 2)
+        small_page_queries, _ = self._list_query_count()
+
+        self._add_colleges(3, 8)
+        large_page_queries, data = self._list_query_count()
+
+        self.assertEqual(len(data["results"]), 10)
+        self.assertEqual(small_page_queries, large_page_queries)
+
+    def test_sparse_fields_do_not_add_a_query_per_college(self):
+        url = "/api/colleges/list/?fields=college_name"
+        self._add_colleges(1, 2)
+        small_page_queries, _ = self._list_query_count(url)
+
+        self._add_colleges(3, 8)
+        large_page_queries, data = self._list_query_count(url)
+
+        self.assertEqual(data["results"][0], {"college_name": "College 10"})
+        self.assertEqual(small_page_queries, large_page_queries)
+
+    def test_main_streams_follow_course_changes(self):
+        college = create_college(1)
+        course = create_course(college, "engineering", "btech", "Mechanical")
+        create_course(college, "law", "llb", "Corporate Law")
+
+        _, data = self._list_query_count()
+        self.assertEqual(data["results"][0]["main_streams"], ["engineering", "law"])
+
+        course.delete()
+        _, data = self._list_query_count()
+        self.assertEqual(data["results"][0]["main_streams"], ["law"])
+
+    def test_moving_a_course_refreshes_both_colleges(self):
+        from . import facets
+
+        first, second = create_college(1), create_college(2)
+        course = create_course(first, "engineering", "btech", "Mechatronics")
+        facets.index.load()
+
+        course.college = second
+        with self.captureOnCommitCallbacks(execute=True):
+            course.save()
+
+        first.refresh_from_db()
+        self.assertEqual((first.course_streams, first.course_specializations), ("", ""))
+        _, data = self._list_query_count("/api/colleges/list/?main_stream=engineering")
+        self.assertEqual([row["college_code"] for row in data["results"]], ["COL-0002"])
+        _, data = self._list_query_count("/api/colleges/list/?search=mechatronics")
+        self.assertEqual([row["college_code"] for row in data["results"]], ["COL-0002"])
+
+
+class KeysetPaginationTests(TestCase):
+    url = "/api/colleges/list/?pagination=cursor&ordering=college_name"
+
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(1, 26):
+            create_college(index)
+
+    def _cursor(self, link):
+        return parse_qs(urlsplit(link).query)["cursor"][0]
+
+    def test_cursor_round_trip_visits_every_row_once(self):
+        names, data = [], self.client.get(self.url).json()
+        pages = [data]
+        names += [row["college_name"] for row in data["results"]]
+        while data["next"]:
+            data = self.client.get(data["next"]).json()
+            pages.append(data)
+            names += [row["college_name"] for row in data["results"]]
+
+        self.assertEqual(names, sorted(f"College {index}" for index in range(1, 26)))
+        self.assertNotIn("count", pages[0])
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = self.client.get(pages[-1]["previous"]).json()
+        self.assertEqual(previous["results"], pages[-2]["results"])
+
+    def test_tampered_cursor_is_not_found(self):
+        link = self.client.get(self.url).json()["next"]
+        payload = json.loads(urlsafe_b64decode(self._cursor(link)))
+        payload["v"][-1] = "not-a-primary-key"
+        tampered = urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        self.assertEqual(self.client.get(f"{self.url}&cursor={tampered}").status_code, 404)
+        self.assertEqual(self.client.get(f"{self.url}&cursor=garbage").status_code, 404)
+
+    def test_cursor_of_another_ordering_is_not_found(self):
+        link = self.client.get(self.url).json()["next"]
+        response = self.client.get(f"/api/colleges/list/?ordering=-college_name&cursor={self._cursor(link)}")
+        self.assertEqual(response.status_code, 404)
+
+
+class CourseImportTests(TestCase):
+    row = {
+        "main_stream": "engineering",
+        "degree": "btech",
+        "level": "undergraduate",
+        "duration": "4 Years",
+        "fee": 100000,
+    }
+
+    def _import(self, college, *rows):
+        from . import importer
+
+        *errors, summary = importer.run("courses", college, list(enumerate(rows, start=1)))
+        self.assertEqual(errors, [])
+        return summary["summary"]
+
+    def test_blank_specialization_is_updated_not_duplicated(self):
+        college = create_college(1)
+
+        self.assertEqual(self._import(college, self.row), {"created": 1, "updated": 0, "failed": 0})
+        summary = self._import(college, {**self.row, "specialization": "", "fee": 120000})
+
+        self.assertEqual(summary, {"created": 0, "updated": 1, "failed": 0})
+        course = Course.objects.get(college=college)
+        self.assertEqual(course.fee, 120000)
+
+    def test_blank_specialization_matches_an_existing_null_row(self):
+        college = create_college(1)
+        create_course(college, "engineering", "btech", None)
+
+        summary = self._import(college, {**self.row, "fee": 90000})
+
+        self.assertEqual(summary, {"created": 0, "updated": 1, "failed": 0})
+        self.assertEqual(list(Course.objects.values_list("fee", flat=True)), [90000])
+
+    def test_specialized_rows_are_upserted(self):
+        college = create_college(1)
+        row = {**self.row, "specialization": "Computer Science"}
+
+        self._import(college, row, {**self.row, "specialization": "Mechanical"})
+        summary = self._import(college, {**row, "fee": 150000})
+
+        self.assertEqual(summary, {"created": 0, "updated": 1, "failed": 0})
+        self.assertEqual(Course.objects.count(), 2)
+        self.assertEqual(Course.objects.get(specialization="Computer Science").fee, 150000)
+
+    def _upload(self, content):
+        college = create_college_admin(1)
+        client = APIClient()
+        client.force_authenticate(college.user)
+        upload = SimpleUploadedFile("courses.csv", content, content_type="text/csv")
+        return client.post("/api/colleges/import/courses/", {"file": upload}, format="multipart")
+
+    def test_upload_streams_the_report(self):
+        header = ",".join(self.row) + ",specialization\n"
+        values = ",".join(str(value) for value in self.row.values())
+        response = self._upload(("\ufeff" + header + values + ",Génie Civil\n").encode("utf-8"))
+
+        self.assertEqual(response.status_code, 200)
+        report = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(report, [{"summary": {"created": 1, "updated": 0, "failed": 0}}])
+        self.assertEqual(Course.objects.get().specialization, "Génie Civil")
+
+    def test_non_utf8_upload_is_rejected_before_streaming(self):
+        header = ",".join(self.row) + ",specialization\n"
+        values = ",".join(str(value) for value in self.row.values())
+        response = self._upload((header + values + ",Génie Civil\n").encode("cp1252"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.json())
+        self.assertFalse(Course.objects.exists())
+
+
+class CollegeCompareTests(TestCase):
+    def test_courses_at_different_levels_stay_apart(self):
+        first, second = create_college(1), create_college(2)
+        create_course(first, "engineering", "btech", "Computer Science")
+        Course.objects.create(
+            college=second,
+            main_stream="engineering",
+            degree="btech",
+            level="postgraduate",
+            specialization="Computer Science",
+            duration="2 Years",
+            fee=150000,
+        )
+
+        response = APIClient().get("/api/colleges/compare/?codes=COL-0001,COL-0002")
+
+        self.assertEqual(response.status_code, 200)
+        rows = {row["level"]: row["fees"] for row in response.json()["courses"]}
+        self.assertEqual(rows, {"undergraduate": [100000, None], "postgraduate": [None, 150000]})
+
+    def test_hostel_features_of_any_json_shape(self):
+        first, second = create_college(1), create_college(2)
+        Hostel.objects.create(
+            college=first, name="North", type="boys", fee=30000,
+            room_types={"Single": 10, "double": 20}, amenities=["WiFi", {"name": "Gym"}],
+        )
+        Hostel.objects.create(
+            college=second, name="South", type="girls", fee=40000,
+            room_types=["single", {"name": "triple"}], amenities="WiFi, Laundry",
+        )
+
+        response = APIClient().get("/api/colleges/compare/?codes=COL-0001,COL-0002")
+
+        self.assertEqual(response.status_code, 200)
+        hostels = response.json()["hostels"]
+        self.assertEqual(hostels["room_types"], [
+            {"name": "double", "available": [True, False]},
+            {"name": "Single", "available": [True, True]},
+        ])
+        self.assertEqual(hostels["amenities"], [{"name": "WiFi", "available": [True, False]}])
+
+
+class LocationResolutionTests(TestCase):
+    def test_aliases_resolve_to_the_canonical_row(self):
+        from . import locations
+
+        odisha = locations.resolve_state(" orissa ")
+        self.assertEqual(odisha.name, "Odisha")
+        self.assertEqual(locations.resolve_district("Bangalore", state=locations.resolve_state("Karnataka")).name, "Bengaluru")
+        self.assertEqual(locations.matching_ids("state", "Orissa"), {odisha.pk})
+
+    def test_lookups_stay_inside_the_given_scope(self):
+        from . import locations
+
+        kerala = locations.resolve_state("Kerala")
+        self.assertIsNone(locations.resolve_district("Bengaluru", state=kerala))
+        self.assertIsNotNone(locations.resolve_district("Bengaluru"))
+
+        district = locations.resolve_district("Bengaluru", state=kerala, create=True)
+        self.assertEqual(district.state, kerala)
+        self.assertNotEqual(district, locations.resolve_district("Bengaluru", state=locations.resolve_state("Karnataka")))
+
+    def test_profile_save_links_canonical_rows(self):
+        college = create_college(1, state="Tamil-Nadu", district="madras")
+
+        college.refresh_from_db()
+        self.assertEqual((college.state, college.district), ("Tamil Nadu", "Chennai"))
+        self.assertEqual(college.state_ref.name, "Tamil Nadu")
+        self.assertEqual(college.district_ref.state, college.state_ref)
+        self.assertEqual(college.country_ref.name, "India")
+
+        college.district = "Trichy"
+        college.save(update_fields=["district"])
+        college.refresh_from_db()
+        self.assertEqual(college.district_ref.name, "Tiruchirappalli")
+
+
+def use_temporary_media(test):
+    """Point MEDIA_ROOT at a fresh directory for the duration of `test`; returns it."""
+    media_root = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, media_root)
+    settings_override = override_settings(MEDIA_ROOT=media_root)
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
+    return media_root
+
+
+def create_college_admin(index):
+    college = create_college(index)
+    college.user.user_type = "college"
+    college.user.save()
+    return college
+
+
+class ResumableUploadTests(TestCase):
+    def setUp(self):
+        use_temporary_media(self)
+        session_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, session_dir)
+        session_dir_patch = mock.patch.object(uploads, "UPLOAD_SESSION_DIR", session_dir)
+        session_dir_patch.start()
+        self.addCleanup(session_dir_patch.stop)
+
+        self.college = create_college_admin(1)
+        self.course = create_course(self.college, "engineering", "btech", "Computer Science")
+        self.client = APIClient()
+        self.client.force_authenticate(self.college.user)
+
+    def _open(self, size):
+        response = self.client.post(
+            "/api/colleges/uploads/",
+            {"target": "brochure", "course": self.course.pk, "filename": "brochure.pdf", "size": size},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return f"/api/colleges/uploads/{response.json()['id']}/"
+
+    def _patch(self, url, offset, data):
+        return self.client.generic(
+            "PATCH", url, data, content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def _upload(self, data):
+        url = self._open(len(data))
+        self.assertEqual(self._patch(url, 0, data).status_code, 204)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"{url}commit/", {}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.course.refresh_from_db()
+        return self.course.brochure.name
+
+    def test_chunks_resume_and_commit(self):
+        data = b"%PDF-1.4 " + os.urandom(1000)
+        url = self._open(len(data))
+
+        response = self._patch(url, 0, data[:400])
+        self.assertEqual((response.status_code, response["Upload-Offset"]), (204, "400"))
+        response = self._patch(url, 0, data[:400])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["offset"], 400)
+        self.assertEqual(self.client.get(url)["Upload-Offset"], "400")
+
+        self.assertEqual(self._patch(url, 400, data[400:]).status_code, 204)
+        response = self.client.post(f"{url}commit/", {"sha256": "0" * 64}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(f"{url}commit/", {"sha256": hashlib.sha256(data).hexdigest()}, format="json")
+        self.assertEqual(response.status_code, 201)
+
+        self.course.refresh_from_db()
+        with self.course.brochure.open("rb") as brochure:
+            self.assertEqual(brochure.read(), data)
+        self.assertEqual(MediaBlob.objects.get(name=self.course.brochure.name).references, 1)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_stale_offset_is_rejected_under_the_lock(self):
+        session = uploads.open_session(
+            user=self.college.user, college=self.college, target="brochure", course=self.course,
+            filename="brochure.pdf", size=6,
+        )
+        stale = UploadSession.objects.get(pk=session.pk)
+
+        self.assertEqual(uploads.append(session, 0, io.BytesIO(b"abc"), 3), 3)
+        with self.assertRaises(uploads.OffsetMismatch) as raised:
+            uploads.append(stale, 0, io.BytesIO(b"xyz"), 3)
+
+        self.assertEqual(raised.exception.args, (3,))
+        with open(uploads.part_path(session), "rb") as part:
+            self.assertEqual(part.read(), b"abc")
+
+    def test_replaced_and_deleted_brochures_give_back_their_blobs(self):
+        first = self._upload(b"%PDF-1.4 first")
+        second = self._upload(b"%PDF-1.4 second")
+
+        self.assertNotEqual(first, second)
+        self.assertFalse(MediaBlob.objects.filter(name=first).exists())
+        self.assertFalse(self.course.brochure.storage.exists(first))
+        self.assertEqual(MediaBlob.objects.get(name=second).references, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.delete()
+        self.assertFalse(MediaBlob.objects.filter(name=second).exists())
+
+    def test_identical_brochures_share_one_blob(self):
+        self._upload(b"%PDF-1.4 shared")
+        other = create_course(self.college, "engineering", "btech", "Mechanical")
+        self.course = other
+        name = self._upload(b"%PDF-1.4 shared")
+
+        self.assertEqual(Course.objects.filter(brochure=name).count(), 2)
+        self.assertEqual(MediaBlob.objects.get(name=name).references, 2)
+
+
+class MediaReferenceTests(TestCase):
+    def setUp(self):
+        self.media_root = use_temporary_media(self)
+        workers = mock.patch.object(images, "IMAGE_PIPELINE_WORKERS", 0)
+        workers.start()
+        self.addCleanup(workers.stop)
+
+    def test_identical_files_are_stored_once_and_counted(self):
+        first = default_storage.save("a.txt", ContentFile(b"same bytes"))
+        second = default_storage.save("b.txt", ContentFile(b"same bytes"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(MediaBlob.objects.get(name=first).references, 2)
+        default_storage.delete(first)
+        self.assertTrue(default_storage.exists(first))
+        self.assertEqual(MediaBlob.objects.get(name=first).references, 1)
+        default_storage.delete(first)
+        self.assertFalse(default_storage.exists(first))
+        self.assertFalse(MediaBlob.objects.filter(name=first).exists())
+
+
+class HostelImageTests(TestCase):
+    def setUp(self):
+        self.media_root = use_temporary_media(self)
+        workers = mock.patch.object(images, "IMAGE_PIPELINE_WORKERS", 0)
+        workers.start()
+        self.addCleanup(workers.stop)
+        self.college = create_college_admin(1)
+        self.other = create_college_admin(2)
+
+    def _client(self, college):
+        client = APIClient()
+        client.force_authenticate(college.user)
+        return client
+
+    def _upload(self, college, color="red"):
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), color).save(buffer, "PNG")
+        image = SimpleUploadedFile("room.png", buffer.getvalue(), content_type="image/png")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._client(college).post(
+                "/api/colleges/hostels/upload-image/", {"image": image, "college": college.pk}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 201)
+        url = response.json()["image_url"]
+        return url, images.storage_name(url)
+
+    def _create_hostel(self, college, urls):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self._client(college).post(
+                "/api/colleges/hostels/",
+                {"college": college.pk, "name": "North Block", "type": "boys", "fee": "50000", "images": urls},
+                format="json",
+            )
+
+    def _set_images(self, hostel_id, urls):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._client(self.college).patch(
+                f"/api/colleges/hostels/{hostel_id}/", {"images": urls}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_image_is_released_once_no_hostel_lists_it(self):
+        url, name = self._upload(self.college)
+        first = self._create_hostel(self.college, [url]).json()["id"]
+        second = self._create_hostel(self.college, [url]).json()["id"]
+        self.assertEqual(MediaBlob.objects.get(name=name).references, 1)
+
+        self._set_images(first, [])
+        self.assertTrue(default_storage.exists(name))
+
+        self._set_images(second, [])
+        self.assertFalse(HostelImage.objects.exists())
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_uploading_the_same_image_twice_takes_one_reference(self):
+        _, first = self._upload(self.college)
+        _, second = self._upload(self.college)
+
+        self.assertEqual(first, second)
+        self.assertEqual(MediaBlob.objects.get(name=first).references, 1)
+        self.assertEqual(HostelImage.objects.filter(college=self.college).count(), 1)
+
+    def test_another_colleges_image_is_rejected_and_never_released(self):
+        url, name = self._upload(self.college)
+        self._create_hostel(self.college, [url])
+
+        response = self._create_hostel(self.other, [url])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("images", response.json())
+
+        # A row that lists the file anyway (older data) gives nothing back.
+        hostel = Hostel.objects.create(college=self.other, name="Annex", type="girls", fee=40000, images=[url])
+        with self.captureOnCommitCallbacks(execute=True):
+            hostel.delete()
+        self.assertEqual(MediaBlob.objects.get(name=name).references, 1)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_file_without_a_blob_row_is_never_deleted(self):
+        name = f"hostels/{self.college.pk}/legacy.png"
+        os.makedirs(os.path.join(self.media_root, "hostels", str(self.college.pk)))
+        with open(os.path.join(self.media_root, name), "wb") as legacy:
+            legacy.write(b"not counted")
+        HostelImage.objects.create(college=self.college, name=name)
+        hostel = Hostel.objects.create(
+            college=self.college, name="Old Block", type="boys", fee=30000, images=[default_storage.url(name)]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            hostel.delete()
+
+        self.assertFalse(HostelImage.objects.exists())
+        self.assertTrue(default_storage.exists(name))
+
+
+class MediaServingTests(TestCase):
+    data = bytes(range(256)) * 4
+
+    def setUp(self):
+        use_temporary_media(self)
+        backend = mock.patch.object(media, "MEDIA_SERVE_BACKEND", "django")
+        backend.start()
+        self.addCleanup(backend.stop)
+        self.blob = default_storage.save("clip.mp4", ContentFile(self.data))
+        self.plain = default_storage.path("brochures/plain.pdf")
+        os.makedirs(os.path.dirname(self.plain))
+        with open(self.plain, "wb") as plain:
+            plain.write(self.data)
+
+    def _get(self, path, method="get", **headers):
+        request = getattr(RequestFactory(), method)(f"/media/{path}", headers=headers)
+        response = media.serve(request, path)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_whole_file_with_validators(self):
+        response, body = self._get(self.blob)
+
+        self.assertEqual((response.status_code, body), (200, self.data))
+        self.assertEqual(response["ETag"], f'"{self.blob.rsplit("/", 1)[1].split(".")[0]}"')
+        self.assertEqual(response["Cache-Control"], media.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertTrue(self._get("brochures/plain.pdf")[0]["ETag"].startswith('W/"'))
+
+    def test_ranges(self):
+        response, body = self._get(self.blob, Range="bytes=10-19")
+        self.assertEqual((response.status_code, body), (206, self.data[10:20]))
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.data)}")
+        self.assertEqual(response["Content-Length"], "10")
+
+        response, body = self._get(self.blob, Range="bytes=-5")
+        self.assertEqual((response.status_code, body), (206, self.data[-5:]))
+        response, body = self._get(self.blob, Range="bytes=1000-")
+        self.assertEqual((response.status_code, body), (206, self.data[1000:]))
+
+        response, _ = self._get(self.blob, Range=f"bytes={len(self.data)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.data)}")
+
+        response, body = self._get(self.blob, Range="bytes=0-1,5-6")
+        self.assertEqual((response.status_code, body), (200, self.data))
+
+    def test_if_range(self):
+        etag = self._get(self.blob)[0]["ETag"]
+        self.assertEqual(self._get(self.blob, Range="bytes=0-3", If_Range=etag)[0].status_code, 206)
+        self.assertEqual(self._get(self.blob, Range="bytes=0-3", If_Range='"stale"')[0].status_code, 200)
+
+        plain = self._get("brochures/plain.pdf")[0]
+        weak = self._get("brochures/plain.pdf", Range="bytes=0-3", If_Range=plain["ETag"])[0]
+        self.assertEqual(weak.status_code, 200)
+        dated = self._get("brochures/plain.pdf", Range="bytes=0-3", If_Range=plain["Last-Modified"])[0]
+        self.assertEqual(dated.status_code, 206)
+        stale = self._get("brochures/plain.pdf", Range="bytes=0-3", If_Range="Mon, 01 Jan 2001 00:00:00 GMT")[0]
+        self.assertEqual(stale.status_code, 200)
+
+    def test_conditional_head_and_missing(self):
+        etag = self._get(self.blob)[0]["ETag"]
+        response, _ = self._get(self.blob, If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        response, body = self._get(self.blob, method="head", Range="bytes=0-9")
+        self.assertEqual((response.status_code, body, response["Content-Length"]), (206, b"", "10"))
+
+        for path in ("missing.png", "../secret.txt", "brochures"):
+            with self.assertRaises(media.Http404):
+                self._get(path)
+
+
+class FullTextSearchTests(TestCase):
+    url = "/api/colleges/list/?search=robotics"
+
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(1, 6):
+            create_college(index, college_name=f"Robotics Institute {index}")
+        for index in range(6, 16):
+            create_college(index, about_college="Home of a small robotics lab.")
+        create_college(16, college_name="Unrelated College")
+
+    def _names(self, data):
+        return [row["college_name"] for row in data["results"]]
+
+    def test_name_matches_rank_first_and_pages_do_not_overlap(self):
+        first = self.client.get(self.url).json()
+        second = self.client.get(first["next"]).json()
+
+        self.assertEqual(first["count"], 15)
+        self.assertEqual(set(self._names(first)[:5]), {f"Robotics Institute {index}" for index in range(1, 6)})
+        names = self._names(first) + self._names(second)
+        self.assertEqual(len(names), 15)
+        self.assertEqual(len(set(names)), 15)
+        self.assertNotIn("Unrelated College", names)
+        self.assertIn("<mark>", first["results"][0]["search_highlight"])
+
+    def test_cursor_pages_follow_the_ranking(self):
+        data = self.client.get(f"{self.url}&pagination=cursor").json()
+        names = self._names(data)
+        while data["next"]:
+            data = self.client.get(data["next"]).json()
+            names += self._names(data)
+
+        self.assertEqual(len(names), 15)
+        self.assertEqual(set(names[:5]), {f"Robotics Institute {index}" for index in range(1, 6)})
+        self.assertEqual(set(names[5:]), {f"College {index}" for index in range(6, 16)})
+
+    def test_search_follows_college_changes(self):
+        college = CollegeProfile.objects.get(college_code="COL-0016")
+        college.college_name = "Robotics Academy"
+        college.save()
+
+        self.assertEqual(self.client.get(self.url).json()["count"], 16)
+        college.delete()
+        self.assertEqual(self.client.get(self.url).json()["count"], 15)
+
+
+class FuzzySearchTests(TestCase):
+    url = "/api/colleges/list/?search=technolgy&search_mode=fuzzy"
+
+    def setUp(self):
+        from . import fuzzy
+
+        self.client = APIClient()
+        for index in range(1, 7):
+            create_college(index, college_name=f"Technology Institute {index}", state="Goa" if index > 4 else "Karnataka")
+        create_college(7, college_name="Law School")
+        # The in-memory indexes outlive the rolled-back data of other tests.
+        fuzzy.college_names.invalidate()
+        fuzzy.specializations.invalidate()
+        limit = mock.patch.object(fuzzy, "FUZZY_RESULT_LIMIT", 3)
+        limit.start()
+        self.addCleanup(limit.stop)
+
+    def test_limit_counts_matches_inside_the_filters(self):
+        response = self.client.get(f"{self.url}&state=Goa")
+
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(
+            {row["college_name"] for row in response.json()["results"]},
+            {"Technology Institute 5", "Technology Institute 6"},
+        )
+        self.assertNotIn("X-Search-Result-Limit", response)
+
+    def test_cut_off_results_are_reported(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual(response["X-Search-Result-Limit"], "3")
+
+    def test_index_follows_renames(self):
+        college = CollegeProfile.objects.get(college_code="COL-0007")
+        college.college_name = "Technologie Campus"
+        college.save()
+
+        response = self.client.get("/api/colleges/list/?search=campas&search_mode=fuzzy")
+        self.assertEqual([row["college_name"] for row in response.json()["results"]], ["Technologie Campus"])
+
+
+class FilterOptionsTests(TestCase):
+    def setUp(self):
+        from django.core.cache.backends.locmem import LocMemCache
+
+        # Two workers, each with its own per-process cache.
+        self.worker_a = LocMemCache("filter-options-a", {})
+        self.worker_b = LocMemCache("filter-options-b", {})
+        self.addCleanup(self.worker_a.clear)
+        self.addCleanup(self.worker_b.clear)
+        create_college(1)
+
+    def _states(self, worker):
+        from . import filter_options
+
+        with mock.patch.object(filter_options, "cache", worker):
+            return APIClient().get("/api/colleges/filters/states/?counts=true").json()["states"]
+
+    def test_write_in_one_worker_refreshes_the_other(self):
+        from . import filter_options
+
+        self.assertEqual(self._states(self.worker_a), [{"value": "Karnataka", "count": 1}])
+
+        with mock.patch.object(filter_options, "cache", self.worker_b):
+            with self.captureOnCommitCallbacks(execute=True):
+                create_college(2, state="Goa")
+
+        self.assertEqual(
+            self._states(self.worker_a),
+            [{"value": "Goa", "count": 1}, {"value": "Karnataka", "count": 1}],
+        )
+
+    def test_unrelated_write_keeps_the_snapshot(self):
+        from . import filter_options
+
+        self._states(self.worker_a)
+        college = CollegeProfile.objects.get(college_code="COL-0001")
+        with self.captureOnCommitCallbacks(execute=True):
+            college.about_college = "Updated"
+            college.save()
+
+        with mock.patch.object(filter_options.FilterOption, "compute") as compute:
+            self._states(self.worker_a)
+        compute.assert_not_called()
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        from . import autocomplete
+
+        self.client = APIClient()
+        create_college(1, college_name="Indian Institute of Technology", district="Chennai")
+        create_college(2, college_name="Technocrats Institute", district="Bhopal")
+        create_course(create_college(3, college_name="City Law School"), "law", "llb", "Technology Law")
+        for index in autocomplete.INDEXES.values():
+            index.invalidate()
+
+    def test_suggestions_complete_every_word(self):
+        data = self.client.get("/api/colleges/autocomplete/?q=tech").json()
+
+        self.assertEqual(set(data["colleges"]), {"Indian Institute of Technology", "Technocrats Institute"})
+        self.assertEqual(data["specializations"], ["Technology Law"])
+        self.assertEqual(data["districts"], [])
+        data = self.client.get("/api/colleges/autocomplete/?q=institute tec&types=colleges&limit=1").json()
+        self.assertEqual(list(data), ["colleges"])
+        self.assertEqual(len(data["colleges"]), 1)
+
+    def test_one_query_per_request(self):
+        self.client.get("/api/colleges/autocomplete/?q=ch")
+
+        with self.assertNumQueries(1):
+            data = self.client.get("/api/colleges/autocomplete/?q=chen").json()
+        self.assertEqual(data["districts"], ["Chennai"])
+
+    def test_changes_from_another_worker_are_picked_up(self):
+        from . import autocomplete, caching
+
+        self.client.get("/api/colleges/autocomplete/?q=ch")
+        # Another worker renamed the college: only the database knows.
+        CollegeProfile.objects.filter(college_code="COL-0001").update(college_name="Chanakya University")
+        caching.bump_catalog_version(autocomplete.INDEXES["colleges"].version_catalog)
+
+        data = self.client.get("/api/colleges/autocomplete/?q=chan&types=colleges").json()
+        self.assertEqual(data["colleges"], ["Chanakya University"])
+
+
+class FacetIndexTests(TestCase):
+    queries = [
+        "main_stream=engineering",
+        "main_stream=engineering,law&college_type=government",
+        "degree=mbbs&verified=true",
+        "college_type=private,autonomous&level=undergraduate",
+        "main_stream=arts",
+    ]
+
+    def setUp(self):
+        from . import facets
+
+        self.client = APIClient()
+        courses = {1: ("engineering", "btech"), 2: ("law", "llb"), 3: ("medical", "mbbs"), 4: ("engineering", "mtech")}
+        for index, college_type in enumerate(["government", "private", "autonomous", "government", "private"], 1):
+            college = create_college(index, college_type=college_type, verified=index % 2 == 1)
+            if index in courses:
+                create_course(college, *courses[index], f"Specialization {index}")
+        facets.index.invalidate()
+
+    def _codes(self, query):
+        data = self.client.get(f"/api/colleges/list/?{query}").json()
+        return sorted(row["college_code"] for row in data["results"])
+
+    def test_index_matches_the_sql_filters(self):
+        from . import facets
+
+        for query in self.queries:
+            with self.subTest(query=query):
+                with mock.patch.object(facets, "MAX_SELECTION_SIZE", -1):
+                    expected = self._codes(query)
+                self.assertEqual(self._codes(query), expected)
+        self.assertEqual(self._codes("main_stream=engineering,law&college_type=government"), ["COL-0001", "COL-0004"])
+
+    def test_large_selection_falls_back_without_listing_ids(self):
+        from . import facets
+
+        with mock.patch.object(facets, "MAX_SELECTION_SIZE", 1), \
+                mock.patch.object(facets, "iter_bits", wraps=facets.iter_bits) as iter_bits:
+            codes = self._codes("college_type=government")
+        iter_bits.assert_not_called()
+        self.assertEqual(codes, ["COL-0001", "COL-0004"])
+
+    def test_counts_match_the_database(self):
+        data = self.client.get("/api/colleges/facets/?college_type=government").json()
+
+        self.assertEqual(data["count"], CollegeProfile.objects.filter(college_type="government").count())
+        self.assertEqual(data["facets"]["main_stream"], {"engineering": 2})
+        self.assertEqual(data["facets"]["college_type"], {"government": 2, "private": 2, "autonomous": 1})
+
+    def test_one_version_read_per_request(self):
+        self.client.get("/api/colleges/facets/")
+
+        with self.assertNumQueries(1):
+            self.client.get("/api/colleges/facets/?main_stream=engineering&verified=true")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.college = create_college(1)
+
+    def test_list_is_not_modified_until_a_write(self):
+        url = "/api/colleges/list/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("public", response["Cache-Control"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        self.college.college_name = "Renamed College"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.college.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["results"][0]["college_name"], "Renamed College")
+
+    def test_detail_validators_follow_nested_rows(self):
+        url = "/api/colleges/public/COL-0001/?include=courses"
+        response = self.client.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_course(self.college, "engineering", "btech", "Robotics")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["courses"]), 1)
+
+    def test_unknown_college_is_not_cached(self):
+        response = self.client.get("/api/colleges/public/COL-9999/?include=courses")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+
+class PublicDocumentTests(TestCase):
+    url = "/api/colleges/public/COL-0001/"
+
+    def setUp(self):
+        from . import documents
+
+        base_url_patch = mock.patch.object(documents, "DOCUMENT_BASE_URL", "http://testserver/")
+        base_url_patch.start()
+        self.addCleanup(base_url_patch.stop)
+        self.client = APIClient()
+        self.college = create_college(1)
+
+    def _stored(self):
+        document = PublicCollegeDocument.objects.get(college=self.college)
+        return json.loads(gzip.decompress(bytes(document.body)))
+
+    def test_document_is_rebuilt_when_the_write_commits(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            create_course(self.college, "engineering", "btech", "Robotics")
+        self.assertEqual(self._stored()["courses"], [])
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual([course["specialization"] for course in self._stored()["courses"]], ["Robotics"])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["courses"][0]["specialization"], "Robotics")
+
+    def test_gzip_and_identity_bodies_agree(self):
+        plain = self.client.get(self.url)
+        compressed = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed["ETag"], plain["ETag"])
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+    def test_other_hosts_are_rendered_live(self):
+        response = self.client.get(self.url, HTTP_HOST="mirror.example.com")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(PublicCollegeDocument.objects.exists())
+        self.assertEqual(response.json()["college_code"], "COL-0001")
+
+
+class SparseFieldsetTests(TestCase):
+    summary_fields = {
+        "id", "college_name", "college_code", "college_type", "state", "district", "college_logo",
+        "college_logo_variants", "verified", "is_popular", "is_featured", "main_streams",
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        college = create_college(1, about_college="A long description.")
+        create_course(college, "engineering", "btech", "Robotics")
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get(url).json()["results"]
+        page_query = next(
+            query["sql"] for query in queries.captured_queries
+            if 'FROM "College_collegeprofile"' in query["sql"] and "ORDER BY" in query["sql"]
+        )
+        return rows[0], page_query
+
+    def test_list_defaults_to_the_summary(self):
+        row, page_query = self._get("/api/colleges/list/")
+
+        self.assertEqual(set(row), self.summary_fields)
+        self.assertEqual(row["main_streams"], ["engineering"])
+        self.assertNotIn('"about_college"', page_query)
+
+    def test_fields_pick_columns_of_the_full_profile(self):
+        row, page_query = self._get("/api/colleges/list/?fields=college_name,about_college,nonsense")
+
+        self.assertEqual(row, {"college_name": "College 1", "about_college": "A long description."})
+        self.assertIn('"about_college"', page_query)
+        self.assertNotIn('"address"', page_query)
+
+    def test_all_fields(self):
+        row, _ = self._get("/api/colleges/list/?fields=all")
+
+        self.assertIn("about_college", row)
+        self.assertIn("address", row)
+
+    def test_only_unknown_fields_fall_back_to_the_summary(self):
+        row, _ = self._get("/api/colleges/list/?fields=nonsense")
+
+        self.assertEqual(set(row), self.summary_fields)
+
+
+class NestedResourceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.college = create_college(1)
+        for specialization in ["Civil", "Aerospace", "Robotics", "Chemical", "Mechanical"]:
+            create_course(self.college, "engineering", "btech", specialization)
+        self.ordered = ["Aerospace", "Chemical", "Civil", "Mechanical", "Robotics"]
+
+    def test_continuation_links_page_through_the_rest(self):
+        data = self.client.get("/api/colleges/public/COL-0001/?include=courses&limit=2").json()
+
+        self.assertNotIn("events", data)
+        self.assertEqual(list(data["nested"]), ["courses"])
+        self.assertEqual(data["nested"]["courses"]["count"], 5)
+        names = [course["specialization"] for course in data["courses"]]
+        link = data["nested"]["courses"]["next"]
+        while link:
+            page = self.client.get(link).json()
+            names += [course["specialization"] for course in page["results"]]
+            link = page["next"]
+
+        self.assertEqual(names, self.ordered)
+        self.assertNotIn("college_code", data["courses"][0])
+
+    def test_last_rows_need_no_link(self):
+        data = self.client.get("/api/colleges/public/COL-0001/?include=courses,events&courses_limit=5").json()
+
+        self.assertEqual(len(data["courses"]), 5)
+        self.assertIsNone(data["nested"]["courses"]["next"])
+        self.assertEqual(data["nested"]["events"], {"count": 0, "next": None})
+
+    def test_zero_limit_links_to_the_first_page(self):
+        data = self.client.get("/api/colleges/public/COL-0001/?include=courses&limit=0").json()
+
+        self.assertEqual(data["courses"], [])
+        page = self.client.get(data["nested"]["courses"]["next"]).json()
+        self.assertEqual([course["specialization"] for course in page["results"]], self.ordered)
+
+    def test_bad_parameters_are_rejected(self):
+        for query in ["include=courses,teachers", "limit=-1", "courses_limit=many"]:
+            with self.subTest(query=query):
+                response = self.client.get(f"/api/colleges/public/COL-0001/?{query}")
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/colleges/public/COL-0001/teachers/").status_code, 404)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(1, 13):
+            college = create_college(index, state="Kerala" if index % 3 == 0 else "Karnataka")
+            create_course(college, "engineering", "btech", f"Specialization {index}")
+
+    def _body(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-store")
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_has_one_row_per_listed_college(self):
+        from EDUCATION_PIONEER.exports import StreamingExportMixin
+
+        url = "/api/colleges/list/export/?state=Karnataka&fields=college_code,college_name,main_streams"
+        with mock.patch.object(StreamingExportMixin, "export_flush_rows", 3):
+            response = self.client.get(url)
+        self.assertIn('filename="colleges-', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self._body(response))))
+
+        self.assertEqual(len(rows), CollegeProfile.objects.filter(state="Karnataka").count())
+        self.assertEqual(len(rows), self.client.get(url.replace("/export", "")).json()["count"])
+        self.assertEqual(list(rows[0]), ["college_name", "college_code", "main_streams"])
+        self.assertEqual(rows[0]["main_streams"], "engineering")
+
+    def test_ndjson_export_of_a_college_admins_courses(self):
+        admin = create_college_admin(20)
+        create_course(admin, "law", "llb", "Corporate Law")
+        self.client.force_authenticate(admin.user)
+
+        lines = self._body(self.client.get("/api/colleges/courses/export/?output=ndjson")).splitlines()
+
+        self.assertEqual([json.loads(line)["specialization"] for line in lines], ["Corporate Law"])
+
+    def test_unknown_output_is_rejected(self):
+        self.assertEqual(self.client.get("/api/colleges/list/export/?output=xlsx").status_code, 400)
+
+
+class HostelSearchTests(TestCase):
+    url = "/api/colleges/hostels/search/"
+
+    def setUp(self):
+        self.client = APIClient()
+        bengaluru, kochi = create_college(1), create_college(2, state="Kerala", district="Kochi")
+        self.hostels = {
+            "North": Hostel.objects.create(
+                college=bengaluru, name="North", type="boys", fee=30000,
+                room_types={"Single": 10, "Double": 20}, amenities=["Wi-Fi", "Laundry"],
+            ),
+            "South": Hostel.objects.create(
+                college=bengaluru, name="South", type="girls", fee=50000,
+                room_types=["triple"], amenities=["WIFI"],
+            ),
+            "Lagoon": Hostel.objects.create(
+                college=kochi, name="Lagoon", type="girls", fee=40000,
+                room_types={"double": 5}, amenities=["wifi", "laundry", "Gym"],
+            ),
+            "Closed": Hostel.objects.create(
+                college=kochi, name="Closed", type="girls", fee=10000,
+                room_types={"single": 1}, amenities=["WiFi"], is_active=False,
+            ),
+        }
+
+    def _names(self, query=""):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.json()["results"]]
+
+    def test_active_hostels_cheapest_first(self):
+        self.assertEqual(self._names(), ["North", "Lagoon", "South"])
+        self.assertEqual(self._names("ordering=-fee"), ["South", "Lagoon", "North"])
+
+    def test_every_listed_amenity_whatever_the_spelling(self):
+        self.assertEqual(self._names("amenity=wifi"), ["North", "Lagoon", "South"])
+        self.assertEqual(self._names("amenity=WiFi,LAUNDRY"), ["North", "Lagoon"])
+        self.assertEqual(self._names("amenity=wifi,gym,laundry"), ["Lagoon"])
+
+    def test_any_listed_room_type(self):
+        self.assertEqual(self._names("room_type=single,triple"), ["North", "South"])
+
+    def test_type_fee_and_location(self):
+        self.assertEqual(self._names("type=girls&fee_max=45000"), ["Lagoon"])
+        self.assertEqual(self._names("fee_min=35000&state=karnataka"), ["South"])
+        row = self.client.get(f"{self.url}?district=Kochi").json()["results"][0]
+        self.assertEqual((row["college_code"], row["state"]), ("COL-0002", "Kerala"))
+
+    def test_features_follow_hostel_edits(self):
+        south = self.hostels["South"]
+        south.amenities = ["Gym"]
+        south.save()
+
+        self.assertEqual(self._names("amenity=wifi"), ["North", "Lagoon"])
+        self.assertEqual(self._names("amenity=gym"), ["Lagoon", "South"])
+
+
+class EventCalendarTests(TestCase):
+    def test_text_values_are_escaped(self):
+        from . import event_feed
+
+        escaped = event_feed.escape("Fees; seats, dates\\rules\r\nmore")
+        self.assertEqual(escaped, "Fees\\; seats\\, dates\\\\rules\\nmore")
+
+    def test_long_lines_fold_without_splitting_characters(self):
+        from . import event_feed
+
+        line = "DESCRIPTION:" + "Vidyā utsav ज्ञान " * 12
+        folded = event_feed.fold(line)
+
+        self.assertTrue(folded.endswith("\r\n"))
+        physical = folded[:-2].split("\r\n")
+        self.assertGreater(len(physical), 1)
+        self.assertTrue(all(len(part.encode("utf-8")) <= 75 for part in physical))
+        self.assertTrue(all(part.startswith(" ") for part in physical[1:]))
+        self.assertEqual(physical[0] + "".join(part[1:] for part in physical[1:]), line)
+        self.assertEqual(event_feed.fold("SUMMARY:Short"), "SUMMARY:Short\r\n")
+
+    def test_calendar_lists_upcoming_events(self):
+        college = create_college(1, college_name="Mysore College, Arts; Science")
+        today = timezone.localdate()
+        Event.objects.create(college=college, name="Open Day, 2026", date=today + datetime.timedelta(days=3))
+        Event.objects.create(college=college, name="Last Year", date=today - datetime.timedelta(days=30))
+
+        response = APIClient().get("/api/colleges/public/COL-0001/events.ics")
+
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content).decode()
+        unfolded = body.replace("\r\n ", "")
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(unfolded.count("BEGIN:VEVENT"), 1)
+        self.assertIn("SUMMARY:Open Day\\, 2026\r\n", unfolded)
+        self.assertIn('ORGANIZER;CN="Mysore College, Arts; Science":mailto:college1@example.com', unfolded)
+        self.assertNotIn("Last Year", unfolded)
+
+        response = APIClient().get("/api/colleges/public/COL-0001/events.ics", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
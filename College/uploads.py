@@ -0,0 +1,192 @@
+"""
+Resumable chunked uploads of gallery videos and course brochures.
+
+Large files go up in several short requests instead of one long multipart
+POST. A dropped connection costs only the chunk in flight, and no request
+holds a worker for the whole transfer:
+
+1. ``POST /api/colleges/uploads/`` opens an UploadSession for a target
+   (`gallery` or `brochure`), file name and total size.
+2. ``PATCH /api/colleges/uploads/<id>/`` sends the next bytes as a raw
+   body, with `Upload-Offset` saying where they start. The body is copied
+   to the session's part file UPLOAD_COPY_SIZE bytes at a time, never
+   held in memory whole. The new offset counts every byte written, even
+   when the client disconnects mid-chunk.
+3. ``HEAD``/``GET`` on the session answers "how far did you get?"
+   (`Upload-Offset`), which is where a client resumes.
+4. ``POST /api/colleges/uploads/<id>/commit/`` hashes the finished part
+   file (checking an optional client `sha256`). It then hands the file to
+   the storage, which moves it into place rather than copying, and
+   attaches it. A gallery upload creates a Gallery item; a brochure upload
+   replaces the course's brochure.
+
+Sessions expire UPLOAD_SESSION_TTL after their last chunk;
+`purge_upload_sessions` removes them with their part files.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files import locks
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Gallery, UploadSession
+
+
+UPLOAD_SESSION_DIR = getattr(
+    settings, "COLLEGE_UPLOAD_SESSION_DIR", os.path.join(settings.BASE_DIR, "upload_sessions")
+)
+UPLOAD_MAX_SIZE = getattr(settings, "COLLEGE_UPLOAD_MAX_SIZE", 1024 * 1024 * 1024)
+# Suggested chunk size, and the most one PATCH may carry.
+UPLOAD_CHUNK_SIZE = getattr(settings, "COLLEGE_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024)
+UPLOAD_MAX_CHUNK_SIZE = getattr(settings, "COLLEGE_UPLOAD_MAX_CHUNK_SIZE", 64 * 1024 * 1024)
+UPLOAD_SESSION_TTL = timedelta(hours=getattr(settings, "COLLEGE_UPLOAD_SESSION_TTL_HOURS", 24))
+# Bytes read from the request and written to disk per step.
+UPLOAD_COPY_SIZE = 64 * 1024
+
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".mov", ".webm", ".mkv", ".avi")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+# target -> accepted file extensions
+TARGET_EXTENSIONS = {
+    "gallery": VIDEO_EXTENSIONS + IMAGE_EXTENSIONS,
+    "brochure": (".pdf",),
+}
+
+
+class OffsetMismatch(Exception):
+    """The chunk does not start where the session's bytes end."""
+
+
+class SessionFile(File):
+    """
+    The finished part file. `temporary_file_path()` lets FileSystemStorage
+    move it into place instead of copying it, and `content_hash` spares the
+    content-addressed storage a second read.
+    """
+
+    def __init__(self, path, name, content_hash):
+        super().__init__(open(path, "rb"), name=name)
+        self.path = path
+        self.content_hash = content_hash
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def part_path(session):
+    return os.path.join(UPLOAD_SESSION_DIR, f"{session.pk}.part")
+
+
+def check_filename(target, filename):
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in TARGET_EXTENSIONS[target]:
+        raise ValidationError({"filename": [f"Must end in one of: {', '.join(TARGET_EXTENSIONS[target])}."]})
+
+
+def open_session(**fields):
+    os.makedirs(UPLOAD_SESSION_DIR, exist_ok=True)
+    session = UploadSession.objects.create(expires_at=timezone.now() + UPLOAD_SESSION_TTL, **fields)
+    open(part_path(session), "wb").close()
+    return session
+
+
+def append(session, offset, stream, length):
+    """
+    Write `length` bytes of `stream` at `offset` of the part file and move
+    the session's offset past whatever was written, even if the stream
+    breaks off. Returns the new offset.
+    """
+    if offset != session.offset:
+        raise OffsetMismatch(session.offset)
+    written = 0
+    try:
+        with open(part_path(session), "r+b") as part:
+            locks.lock(part, locks.LOCK_EX)
+            try:
+                # Another request may have moved the offset while this one waited for the lock.
+                current = UploadSession.objects.filter(pk=session.pk).values_list("offset", flat=True).first()
+                if current != offset:
+                    raise OffsetMismatch(current)
+                part.seek(offset)
+                part.truncate()
+                while written < length:
+                    data = stream.read(min(UPLOAD_COPY_SIZE, length - written))
+                    if not data:
+                        break
+                    part.write(data)
+                    written += len(data)
+                part.flush()
+                os.fsync(part.fileno())
+            finally:
+                locks.unlock(part)
+    finally:
+        if written:
+            UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+                offset=offset + written,
+                updated_at=timezone.now(),
+                expires_at=timezone.now() + UPLOAD_SESSION_TTL,
+            )
+            session.offset = offset + written
+    return session.offset
+
+
+def file_hash(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as part:
+        for block in iter(lambda: part.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def commit(session, sha256=None):
+    """Attach the finished upload to its target; returns the Gallery item or Course."""
+    if session.offset != session.size:
+        raise ValidationError({"offset": [f"Upload incomplete: {session.offset} of {session.size} bytes received."]})
+    path = part_path(session)
+    digest = file_hash(path)
+    if sha256 and sha256.lower() != digest:
+        raise ValidationError({"sha256": ["Does not match the uploaded bytes."]})
+
+    upload = SessionFile(path, session.filename, digest)
+    try:
+        with transaction.atomic():
+            if session.target == "gallery":
+                is_video = session.filename.lower().endswith(VIDEO_EXTENSIONS)
+                instance = Gallery(
+                    college=session.college,
+                    media_type="video" if is_video else "image",
+                    title=session.metadata.get("title", ""),
+                    description=session.metadata.get("description", ""),
+                    display_order=session.metadata.get("display_order", 0),
+                )
+                instance.file = upload
+                instance.save()
+            else:
+                instance = session.course
+                instance.brochure = upload
+                instance.save()
+            session.delete()
+    finally:
+        upload.close()
+    # The storage moved the file away unless the blob already existed.
+    _remove(path)
+    return instance
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def discard(session):
+    """Delete an aborted or expired session and its part file."""
+    path = part_path(session)
+    session.delete()
+    _remove(path)
@@ -3,15 +3,29 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CollegeProfileView,
     CollegeListView,
+    CollegeExportView,
+    CollegeFacetCountsAPIView,
+    CollegeAutocompleteAPIView,
+    CollegePublicBatchView,
     CollegePublicDetailView,
+    CollegePublicRelationView,
+    CollegeCompareAPIView,
+    CourseCatalogView,
     CourseViewSet,
+    EventFeedView,
+    EventCalendarView,
     EventViewSet,
     GalleryViewSet,
     FacultyViewSet,
     HostelImageUploadView,
     HostelListCreateView,
     HostelDetailView,
+    HostelSearchView,
+    UploadSessionCreateView,
+    UploadSessionView,
+    UploadSessionCommitView,
     FilterOptionsAPIView,
+    CatalogImportView,
 )
 
 # 🔹 DRF router for viewsets (Courses)
@@ -24,16 +38,37 @@ router.register("faculties", FacultyViewSet, basename="faculties")
 urlpatterns = [
     # 🔹 College list endpoint (with comprehensive filtering)
     path("list/", CollegeListView.as_view(), name="college-list"),
+    path("list/export/", CollegeExportView.as_view(), name="college-export"),
+    path("facets/", CollegeFacetCountsAPIView.as_view(), name="college-facets"),
+    path("autocomplete/", CollegeAutocompleteAPIView.as_view(), name="college-autocomplete"),
     # Public college detail - visible to anyone (includes nested resources)
+    path("public/", CollegePublicBatchView.as_view(), name="college-public-batch"),
+    path("compare/", CollegeCompareAPIView.as_view(), name="college-compare"),
     path("public/<str:college_code>/", CollegePublicDetailView.as_view(), name="college-public-detail"),
+    path("public/<str:college_code>/events.ics", EventCalendarView.as_view(), name="college-event-calendar"),
+    path("public/<str:college_code>/<str:relation>/", CollegePublicRelationView.as_view(), name="college-public-relation"),
     path("filters/", FilterOptionsAPIView.as_view(), name="filter-options"),
     path("filters/<str:filter_name>/", FilterOptionsAPIView.as_view(), name="single-filter"),
     
     # 🔹 College profile endpoint
     path("profile/", CollegeProfileView.as_view(), name="college-profile"),
     path("hostels/", HostelListCreateView.as_view(), name="hostels"),
+    path("hostels/search/", HostelSearchView.as_view(), name="hostel-search"),
     path("hostels/<int:pk>/", HostelDetailView.as_view(), name="hostel-detail"),
     path("hostels/upload-image/", HostelImageUploadView.as_view(), name="hostel-image-upload"),
+    path("uploads/", UploadSessionCreateView.as_view(), name="upload-session-create"),
+    path("uploads/<uuid:pk>/", UploadSessionView.as_view(), name="upload-session"),
+    path("uploads/<uuid:pk>/commit/", UploadSessionCommitView.as_view(), name="upload-session-commit"),
+
+    # 🔹 Bulk CSV/NDJSON import of courses, faculties and events
+    path("import/<str:kind>/", CatalogImportView.as_view(), name="catalog-import"),
+
+    # 🔹 Public, cached course catalog (before the router's courses/<pk>/)
+    path("courses/catalog/", CourseCatalogView.as_view(), name="course-catalog"),
+
+    # 🔹 Upcoming events across colleges (before the router's events/<pk>/)
+    path("events/feed/", EventFeedView.as_view(), name="event-feed"),
+    path("events/feed.ics", EventCalendarView.as_view(), name="event-calendar"),
 
     # 🔹 Include all course-related endpoints
     path("", include(router.urls)),
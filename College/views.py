@@ -1,23 +1,51 @@
 from rest_framework import generics, viewsets,permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Course, CollegeProfile,Event,Gallery,Faculty,Hostel
+from rest_framework.exceptions import NotFound, ValidationError
+from django.conf import settings
+from .models import Course, CollegeProfile,Event,Gallery,Faculty,Hostel,HostelAmenity,HostelImage,HostelRoomType,UploadSession
 from .serializers import (
     CollegeProfileSerializer,
     CourseSerializer,
+    CourseCatalogSerializer,
     EventSerializer,
+    EventFeedSerializer,
     GallerySerializer,
     FacultySerializer,
     HostelSerializer,
+    HostelSearchSerializer,
     CollegePublicSerializer,
+    CollegeSummarySerializer,
+    UploadSessionSerializer,
 )
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from College import serializers
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, CharFilter, BooleanFilter
 from .permissions import IsCollegeOwner, IsCollegeOwnerOrReadOnly, IsCollegeAdminOrReadOnly
+from .filters import (
+    AnyOfCharFilter, FullTextSearchFilter, FuzzySearchFilter, LocationFilter, RelevanceOrderingFilter,
+    SearchResultLimitMixin,
+)
+from . import (
+    autocomplete, caching, compare, course_catalog, documents, event_feed, facets, filter_options, geo, images, importer,
+    nested, search, uploads,
+)
+from .caching import ConditionalGetMixin
+from EDUCATION_PIONEER.exports import StreamingExportMixin
+from EDUCATION_PIONEER.pagination import KeysetPagination
+from functools import reduce
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+import datetime
+import io
+import json
+import operator
 import django_filters
 
 
@@ -94,34 +122,203 @@ class CollegeFilterSet(FilterSet):
     - Location: country, state, district
     - Course details: main_stream, degree, level, specialization
     - Status: verified, is_popular, is_featured
+
+    Comma-separated values are ORed (`main_stream=engineering,medical`).
+    Exact facet values are answered by the in-memory bitmap index in
+    College/facets.py instead of SQL.
     """
     # Location filters
-    country = CharFilter(field_name='country', lookup_expr='icontains')
-    state = CharFilter(field_name='state', lookup_expr='icontains')
-    district = CharFilter(field_name='district', lookup_expr='icontains')
+    # (matched on the canonical location rows, see College/locations.py)
+    country = LocationFilter(field_name='country', lookup_expr='icontains')
+    state = LocationFilter(field_name='state', lookup_expr='icontains')
+    district = LocationFilter(field_name='district', lookup_expr='icontains')
     
     # College info filters
-    college_type = CharFilter(field_name='college_type', lookup_expr='exact')
-    accreditation_body = CharFilter(field_name='accreditation_body', lookup_expr='icontains')
+    college_type = AnyOfCharFilter(field_name='college_type', lookup_expr='exact')
+    accreditation_body = AnyOfCharFilter(field_name='accreditation_body', lookup_expr='icontains')
     
-    # Course-related filters
-    main_stream = CharFilter(field_name='courses__main_stream', lookup_expr='exact', distinct=True)
-    degree = CharFilter(field_name='courses__degree', lookup_expr='exact', distinct=True)
-    level = CharFilter(field_name='courses__level', lookup_expr='exact', distinct=True)
-    specialization = CharFilter(field_name='courses__specialization', lookup_expr='icontains', distinct=True)
+    # Course-related filters (served from the denormalized course facets
+    # on CollegeProfile, so no JOIN against Course and no DISTINCT)
+    main_stream = CharFilter(field_name='course_streams', method='filter_course_facet')
+    degree = CharFilter(field_name='course_degrees', method='filter_course_facet')
+    level = CharFilter(field_name='course_levels', method='filter_course_facet')
+    specialization = CharFilter(field_name='course_specializations', lookup_expr='icontains')
     
     # Status filters
     verified = django_filters.BooleanFilter(field_name='verified')
     is_popular = django_filters.BooleanFilter(field_name='is_popular')
     is_featured = django_filters.BooleanFilter(field_name='is_featured')
+
+    # Proximity: `near=<pincode>` (or `near=me` for a student's own pin code)
+    # within `radius_km`, annotated with `distance_km`
+    near = CharFilter(method='filter_near')
+    radius_km = django_filters.NumberFilter(method='filter_radius')
     
     class Meta:
         model = CollegeProfile
         fields = ['country', 'state', 'district', 'college_type', 'accreditation_body', 
-                  'main_stream', 'degree', 'level', 'specialization', 'verified', 'is_popular', 'is_featured']
+                  'main_stream', 'degree', 'level', 'specialization', 'verified', 'is_popular', 'is_featured',
+                  'near', 'radius_km']
+
+    def filter_course_facet(self, queryset, name, value):
+        """Match any of the comma-separated values inside a packed ",a,b," facet column."""
+        values = [item.strip() for item in value.split(',') if item.strip()]
+        if not values:
+            return queryset
+        condition = reduce(operator.or_, (Q(**{f'{name}__contains': f',{item},'}) for item in values))
+        return queryset.filter(condition)
+
+    def filter_near(self, queryset, name, value):
+        """Colleges within `radius_km` (default COLLEGE_NEAR_RADIUS_KM) of a pin code."""
+        pincode = value
+        if value.strip().lower() == 'me':
+            student = getattr(getattr(self.request, 'user', None), 'student_profile', None)
+            pincode = getattr(student, 'pincode', None)
+        point = geo.locate(pincode)
+        if point is None:
+            raise ValidationError({'near': ['Unknown pin code.']})
+
+        radius = self.form.cleaned_data.get('radius_km')
+        if radius is None:
+            radius = getattr(settings, 'COLLEGE_NEAR_RADIUS_KM', 25)
+        if radius <= 0 or radius > geo.MAX_RADIUS_KM:
+            raise ValidationError({'radius_km': [f'Must be between 0 and {geo.MAX_RADIUS_KM}.']})
+        return geo.within_radius(queryset, point[0], point[1], float(radius))
+
+    def filter_radius(self, queryset, name, value):
+        """Read by filter_near; on its own it does not filter."""
+        return queryset
+
+    def filter_queryset(self, queryset):
+        """
+        Resolve the fixed-vocabulary facet filters through the in-memory
+        bitmap index and apply the rest (and any facet the index cannot
+        answer) in SQL.
+        """
+        selection = {
+            facet: keys for facet, keys in facets.index.parse(self.data).items() if facet in facets.CLOSED_FACETS
+        }
+        if selection:
+            selected = facets.index.select(selection)
+            if selected.bit_count() <= facets.MAX_SELECTION_SIZE:
+                queryset = queryset.filter(pk__in=list(facets.iter_bits(selected)))
+            else:
+                selection = {}
+
+        for name, value in self.form.cleaned_data.items():
+            if name in selection:
+                continue
+            queryset = self.filters[name].filter(queryset, value)
+        return queryset
+
+
+class CourseCatalogFilterSet(FilterSet):
+    """
+    Filters of the public course catalog. Stream, level and degree take
+    comma-separated values; the fee range is served by the fee-leading
+    catalog index on Course.
+    """
+    main_stream = AnyOfCharFilter(field_name='main_stream', lookup_expr='exact')
+    level = AnyOfCharFilter(field_name='level', lookup_expr='exact')
+    degree = AnyOfCharFilter(field_name='degree', lookup_expr='exact')
+    specialization = CharFilter(field_name='specialization', lookup_expr='icontains')
+    fee_min = django_filters.NumberFilter(field_name='fee', lookup_expr='gte')
+    fee_max = django_filters.NumberFilter(field_name='fee', lookup_expr='lte')
+    college_code = AnyOfCharFilter(field_name='college_id', lookup_expr='exact')
+    state = LocationFilter(
+        field_name='college__state', lookup_expr='icontains', level='state', ref_field='college__state_ref'
+    )
+    district = LocationFilter(
+        field_name='college__district', lookup_expr='icontains', level='district', ref_field='college__district_ref'
+    )
+
+    class Meta:
+        model = Course
+        fields = ['main_stream', 'level', 'degree', 'specialization', 'fee_min', 'fee_max',
+                  'college_code', 'state', 'district']
+
+
+class EventFeedFilterSet(FilterSet):
+    """
+    Filters of the upcoming-events feed and calendar. `from` / `to` bound
+    the date window (inclusive); without `from` the window starts today.
+    Stream matches the college's denormalized course facets.
+    """
+    # `from` is a Python keyword: declared as date_from, published as `from`
+    date_from = django_filters.DateFilter(field_name='date', lookup_expr='gte')
+    date_to = django_filters.DateFilter(field_name='date', lookup_expr='lte')
+    college_code = AnyOfCharFilter(field_name='college__college_code', lookup_expr='exact')
+    state = LocationFilter(
+        field_name='college__state', lookup_expr='icontains', level='state', ref_field='college__state_ref'
+    )
+    district = LocationFilter(
+        field_name='college__district', lookup_expr='icontains', level='district', ref_field='college__district_ref'
+    )
+    main_stream = CharFilter(field_name='college__course_streams', method='filter_course_facet')
+
+    class Meta:
+        model = Event
+        fields = ['college_code', 'state', 'district', 'main_stream']
+
+    filter_course_facet = CollegeFilterSet.filter_course_facet
+
+    def filter_queryset(self, queryset):
+        start, end = self.form.cleaned_data.get('from'), self.form.cleaned_data.get('to')
+        if start and end and start > end:
+            raise ValidationError({'to': ['Must not be before `from`.']})
+        if start is None:
+            queryset = queryset.filter(date__gte=timezone.localdate())
+        return super().filter_queryset(queryset)
 
 
-class CollegeListView(generics.ListAPIView):
+EventFeedFilterSet.base_filters['from'] = EventFeedFilterSet.base_filters.pop('date_from')
+EventFeedFilterSet.base_filters['to'] = EventFeedFilterSet.base_filters.pop('date_to')
+
+
+class HostelSearchFilterSet(FilterSet):
+    """
+    Filters of the cross-college hostel search.
+
+    `amenity=wifi,laundry` keeps hostels offering every listed amenity and
+    `room_type=single,double` those offering any listed room type. Both
+    are matched on the normalized HostelAmenity / HostelRoomType rows
+    (spelling-insensitive: "Wi-Fi" finds "WIFI") through their key index,
+    never by reading the JSON columns.
+    """
+    type = AnyOfCharFilter(field_name='type', lookup_expr='exact')
+    fee_min = django_filters.NumberFilter(field_name='fee', lookup_expr='gte')
+    fee_max = django_filters.NumberFilter(field_name='fee', lookup_expr='lte')
+    amenity = CharFilter(method='filter_amenity')
+    room_type = CharFilter(method='filter_room_type')
+    college_code = AnyOfCharFilter(field_name='college__college_code', lookup_expr='exact')
+    state = LocationFilter(
+        field_name='college__state', lookup_expr='icontains', level='state', ref_field='college__state_ref'
+    )
+    district = LocationFilter(
+        field_name='college__district', lookup_expr='icontains', level='district', ref_field='college__district_ref'
+    )
+
+    class Meta:
+        model = Hostel
+        fields = ['type', 'fee_min', 'fee_max', 'amenity', 'room_type', 'college_code', 'state', 'district']
+
+    @staticmethod
+    def feature_keys(value):
+        return {key for key in (Hostel.feature_key(item) for item in value.split(",")) if key}
+
+    def filter_amenity(self, queryset, name, value):
+        for key in self.feature_keys(value):
+            queryset = queryset.filter(pk__in=HostelAmenity.objects.filter(key=key).values('hostel_id'))
+        return queryset
+
+    def filter_room_type(self, queryset, name, value):
+        keys = self.feature_keys(value)
+        if not keys:
+            return queryset
+        return queryset.filter(pk__in=HostelRoomType.objects.filter(key__in=keys).values('hostel_id'))
+
+
+class CollegeListView(SearchResultLimitMixin, ConditionalGetMixin, generics.ListAPIView):
     """
     List and filter colleges with comprehensive filtering options.
     
@@ -145,46 +342,306 @@ class CollegeListView(generics.ListAPIView):
     - /api/colleges/list/?level=undergraduate&specialization=Computer
     - /api/colleges/list/?main_stream=engineering&is_featured=true&verified=true
     - /api/colleges/list/?accreditation_body=AICTE&college_type=private
+
+    `?search=` runs against the full-text index: results are ranked by
+    relevance (unless `?ordering=` is given) and carry a `search_highlight`.
+    Add `search_mode=fuzzy` for typo-tolerant matching of college names and
+    specializations, ranked by similarity.
+
+    `?near=600036&radius_km=10` keeps the colleges within 10 km of the pin
+    code, nearest first (unless `?ordering=` is given), each with a
+    `distance_km`.
+
+    Rows use the compact CollegeSummarySerializer by default. Pick fields
+    with `?fields=college_name,state,about_college` or get every field with
+    `?fields=all`; only the columns behind the chosen fields are selected.
+
+    Responses carry an ETag/Last-Modified derived from the catalog version,
+    so unchanged pages revalidate with a 304.
     """
     serializer_class = CollegeProfileSerializer
+    summary_serializer_class = CollegeSummarySerializer
+    fields_param = 'fields'
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RelevanceOrderingFilter]
     filterset_class = CollegeFilterSet
     
-    # Search fields
+    # Search fields (fallback when the full-text index is unavailable)
     search_fields = ['college_name', 'country', 'state', 'district', 'about_college', 'accreditation_body']
     
     # Ordering fields
     ordering_fields = ['college_name', 'created_at', 'is_popular', 'is_featured', 'established_year']
     ordering = ['-created_at']
     
+    def get_validators(self, request):
+        if request.query_params.get('near', '').strip().lower() == 'me':
+            return None  # depends on the student's own pin code
+        version, updated_at = caching.catalog_version()
+        etag = caching.make_etag(caching.CATALOG, version, request.get_full_path(), request.accepted_renderer.format)
+        return etag, updated_at
+
+    def get_requested_fields(self):
+        """Field names picked with `?fields=` (None means the default summary)."""
+        raw = self.request.query_params.get(self.fields_param, '')
+        requested = [name.strip() for name in raw.split(',') if name.strip()]
+        if not requested:
+            return None
+        if requested == ['all']:
+            return self.serializer_class.selectable_fields()
+        return self.serializer_class.selectable_fields(requested) or None
+
+    def get_serializer_class(self):
+        if self.get_requested_fields() is None:
+            return self.summary_serializer_class
+        return self.serializer_class
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         """
-        Return distinct colleges to avoid duplicates when filtering by related course fields.
+        Course filters run against the denormalized facet columns, so rows
+        never multiply and neither the list nor its COUNT needs DISTINCT.
+
+        Only the columns read by the requested fields are loaded, plus the
+        ordering columns the cursor paginator reads back from each row.
         """
-        return CollegeProfile.objects.distinct()
+        serializer_class = self.get_serializer_class()
+        fields = self.get_requested_fields() or serializer_class.selectable_fields()
+        columns = set(serializer_class.columns_for(fields)) | set(self.ordering_fields)
+        queryset = CollegeProfile.objects.only(*columns)
+        if 'approved_by' in fields:
+            queryset = queryset.select_related('approved_by')
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        """Fetch the full-text search snippets of the page's rows only."""
+        page = super().paginate_queryset(queryset)
+        if page is not None and getattr(self, "search_text", None):
+            self.search_highlights = search.highlights(self.search_text, [row.pk for row in page])
+        return page
+
+    def get_serializer_context(self):
+        """Expose full-text search highlights to the serializer."""
+        context = super().get_serializer_context()
+        context["search_highlights"] = getattr(self, "search_highlights", None)
+        return context
+
+
+
+class CollegeExportView(StreamingExportMixin, CollegeListView):
+    """
+    `/api/colleges/list/export/?output=csv|ndjson`: every college matching
+    the list filters, streamed (see EDUCATION_PIONEER/exports.py). Takes the
+    same filter, search, ordering and `fields` parameters as the list.
+    """
+    export_filename = 'colleges'
+
+    def get(self, request, *args, **kwargs):
+        return self.export_response(request)
+
+    def get_export_fields(self, serializer, queryset):
+        fields = super().get_export_fields(serializer, queryset)
+        if 'distance_km' in queryset.query.annotations:
+            fields.append('distance_km')
+        return fields
+
+
+class CollegeFacetCountsAPIView(APIView):
+    """
+    Live facet counts for the current college list selection.
+
+    Takes the same facet parameters as CollegeListView
+    (e.g. `?state=Karnataka&main_stream=engineering,medical`) and returns
+    how many colleges match, plus for every facet how many colleges each
+    value would match given the other selected facets.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        selection = facets.index.parse(request.query_params)
+        return Response({
+            "count": facets.index.select(selection).bit_count(),
+            "facets": facets.index.counts(selection),
+        })
+
+
+class CollegeAutocompleteAPIView(APIView):
+    """
+    Search-box suggestions: `?q=tech` returns the best matching college
+    names, districts and specializations, straight from the in-memory
+    prefix index (College/autocomplete.py). The only database query reads
+    the index versions, once per request.
+
+    Optional `?types=colleges,districts` limits the lists returned and
+    `?limit=` (at most COLLEGE_AUTOCOMPLETE_LIMIT) shortens them.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        query = request.query_params.get("q", "")
+        kinds = [kind for kind in request.query_params.get("types", "").split(",") if kind in autocomplete.INDEXES]
+        try:
+            limit = int(request.query_params.get("limit", autocomplete.AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = autocomplete.AUTOCOMPLETE_LIMIT
+        return Response(autocomplete.suggest(query, max(limit, 1), kinds or None))
+
+
+class PublicNestedMixin:
+    """
+    `?include=` and per-relation limits for views serializing with
+    CollegePublicSerializer (see College/nested.py).
+    """
+
+    def get_nested_limits(self):
+        if not hasattr(self, '_nested_limits'):
+            params = self.request.query_params
+            relations = nested.parse_include(params.get('include'))
+            self._nested_limits = nested.parse_limits(params, relations)
+        return self._nested_limits
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['nested_limits'] = self.get_nested_limits()
+        return context
+
+    def get_queryset(self):
+        return nested.public_queryset(self.get_nested_limits())
 
 
+class CollegePublicBatchView(PublicNestedMixin, generics.ListAPIView):
+    """
+    Public details of several colleges at once: `?codes=A,B,C` (at most
+    COLLEGE_BATCH_LIMIT codes). Each result has the shape of the single
+    college detail, in request order; unknown codes are listed under
+    `missing`. The query count does not grow with the number of codes.
+    """
+    serializer_class = CollegePublicSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        codes = compare.parse_codes(request.query_params.get('codes'), compare.BATCH_LIMIT)
+        colleges, missing = compare.in_order(self.get_queryset(), codes)
+        serializer = self.get_serializer(colleges, many=True)
+        return Response({'results': serializer.data, 'missing': missing})
+
+
+class CollegeCompareAPIView(APIView):
+    """
+    Side-by-side comparison of up to COLLEGE_COMPARE_LIMIT colleges:
+    `?codes=A,B`. Every row of `attributes`, `fees`, `courses` and `hostels`
+    holds one entry per college, in the order of `colleges`. Three queries
+    regardless of how many colleges are compared.
+    """
+    permission_classes = [permissions.AllowAny]
 
-class CollegePublicDetailView(generics.RetrieveAPIView):
+    def get(self, request):
+        codes = compare.parse_codes(request.query_params.get('codes'), compare.COMPARE_LIMIT)
+        colleges, missing = compare.in_order(compare.comparison_queryset(), codes)
+        data = {
+            'colleges': CollegeSummarySerializer(colleges, many=True, context={'request': request}).data,
+            'missing': missing,
+        }
+        data.update(compare.compare(colleges))
+        return Response(data)
+
+
+class CollegePublicDetailView(PublicNestedMixin, ConditionalGetMixin, generics.RetrieveAPIView):
     """Public read-only detail view for a college.
 
     URL lookup uses the college's `college_code` so public clients can fetch
     details like courses, events, gallery, faculties and hostels in one call.
+    `?include=` and `?limit=` narrow the nested resources (College/nested.py).
+
+    Default JSON requests are answered from the materialized document (see
+    College/documents.py), validated by its ETag. Other renderers, hosts and
+    include/limit combinations fall back to the serializer, with the
+    ETag/Last-Modified taken from the newest `updated_at` of the college and
+    its nested resources.
     """
     serializer_class = CollegePublicSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'college_code'
     lookup_url_kwarg = 'college_code'
 
-    def get_queryset(self):
-        # optimize related resource fetching for the public detail view
-        return CollegeProfile.objects.select_related('user').prefetch_related(
-            'courses', 'events', 'gallery_items', 'faculties', 'hostels'
+    def get_document(self):
+        if not hasattr(self, '_document'):
+            self._document = None
+            if self.request.accepted_renderer.format == 'json' and nested.is_default(self.request.query_params):
+                self._document = documents.get(
+                    self.kwargs[self.lookup_url_kwarg], self.request.build_absolute_uri('/')
+                )
+        return self._document
+
+    def get_validators(self, request):
+        document = self.get_document()
+        if document is not None:
+            return document.etag, document.source_modified
+        college_code = self.kwargs[self.lookup_url_kwarg]
+        last_modified = caching.college_last_modified(college_code)
+        if last_modified is None:
+            return None
+        etag = caching.make_etag(
+            college_code, last_modified.isoformat(), request.get_full_path(), request.accepted_renderer.format
         )
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        document = self.get_document()
+        if document is None:
+            return super().retrieve(request, *args, **kwargs)
+        return documents.response(document, request)
+
+
+class PublicRelationPagination(KeysetPagination):
+    page_size = nested.NESTED_LIMIT
+    page_size_query_param = 'page_size'
+    max_page_size = nested.MAX_NESTED_LIMIT
+
+
+class CollegePublicRelationView(generics.ListAPIView):
+    """
+    One nested resource of a public college, paginated:
+    `/api/colleges/public/<college_code>/<relation>/`. Rows come in the same
+    order as in the detail, so the detail's `nested.<relation>.next` link
+    continues exactly where the embedded rows stop.
+    """
+    permission_classes = [permissions.AllowAny]
+    pagination_class = PublicRelationPagination
+    serializers_by_relation = {
+        'courses': CourseSerializer,
+        'events': EventSerializer,
+        'gallery_items': GallerySerializer,
+        'faculties': FacultySerializer,
+        'hostels': HostelSerializer,
+    }
+
+    def get_college(self):
+        if not hasattr(self, '_college'):
+            if self.kwargs['relation'] not in nested.RELATIONS:
+                raise NotFound('Unknown relation.')
+            self._college = get_object_or_404(
+                CollegeProfile.objects.only('id', 'college_code'), college_code=self.kwargs['college_code']
+            )
+        return self._college
 
+    def get_queryset(self):
+        return nested.related_rows(self.kwargs['relation'], self.get_college())
+
+    def get_serializer(self, *args, **kwargs):
+        self.get_college()
+        serializer_class = self.serializers_by_relation[self.kwargs['relation']]
+        kwargs.setdefault('context', self.get_serializer_context())
+        return serializer_class(*args, omit=nested.PARENT_FIELDS, **kwargs)
 
-class CourseViewSet(viewsets.ModelViewSet):
+
+class CourseViewSet(SearchResultLimitMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     Manage courses - College admins can only see/edit their own courses
     
@@ -195,10 +652,14 @@ class CourseViewSet(viewsets.ModelViewSet):
     
     Other authenticated users can:
     - View all courses (read-only)
+
+    `courses/export/?output=csv|ndjson` streams every course the caller can
+    list, with the same filters.
     """
     serializer_class = CourseSerializer
+    export_filename = 'courses'
     permission_classes = [IsCollegeAdminOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FuzzySearchFilter, RelevanceOrderingFilter]
     
     # Define filterable fields
     filterset_fields = {
@@ -213,7 +674,8 @@ class CourseViewSet(viewsets.ModelViewSet):
         'fee': ['lte', 'gte'],
     }
     
-    # Search fields
+    # Search fields (`?search_mode=fuzzy` matches specialization and
+    # college name through the trigram index instead)
     search_fields = ['specialization', 'college__college_name', 'description']
     
     # Ordering fields
@@ -304,6 +766,68 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(courses, many=True)
         return Response(serializer.data)
 
+class CourseCatalogPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CourseCatalogView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Public course catalog: browse every course by stream, level, degree,
+    location and fee range (`?fee_min=&fee_max=`), cheapest first by
+    default. Anyone can read it.
+
+    Whole pages are cached under the normalized query (see
+    College/course_catalog.py) until the next course or college write, and
+    the ETag follows the same key, so repeat visitors get a 304 and
+    everyone else a cache hit without touching the database.
+    """
+    serializer_class = CourseCatalogSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    pagination_class = CourseCatalogPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = CourseCatalogFilterSet
+    ordering_fields = ['fee', 'duration', 'degree', 'created_at']
+    ordering = ['fee', 'id']
+
+    def get_queryset(self):
+        return Course.objects.select_related('college').only(
+            'id', 'main_stream', 'degree', 'level', 'specialization', 'duration', 'fee', 'created_at',
+            'college__college_code', 'college__college_name', 'college__state', 'college__district',
+        )
+
+    def get_cache_key(self):
+        if not hasattr(self, '_cache_key'):
+            pagination = self.pagination_class
+            allowed = list(CourseCatalogFilterSet.base_filters) + [
+                'ordering',
+                pagination.page_query_param,
+                pagination.page_size_query_param,
+                pagination.mode_query_param,
+                pagination.cursor_query_param,
+            ]
+            query = course_catalog.normalize_query(self.request.query_params, allowed)
+            self._catalog_version, self._updated_at = course_catalog.version()
+            self._cache_key = course_catalog.cache_key(
+                self._catalog_version, self.request.get_host(), query, self.request.accepted_renderer.format
+            )
+        return self._cache_key
+
+    def get_validators(self, request):
+        etag = caching.make_etag(self.get_cache_key())
+        return etag, self._updated_at
+
+    def list(self, request, *args, **kwargs):
+        data = course_catalog.get(self.get_cache_key())
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            course_catalog.put(self.get_cache_key(), response.data)
+            return response
+        return Response(data)
+
+
 # ===== EVENT VIEWSET =====
 
 class EventViewSet(viewsets.ModelViewSet):
@@ -333,12 +857,12 @@ class EventViewSet(viewsets.ModelViewSet):
         if getattr(user, 'user_type', None) == 'college':
             try:
                 college = user.college_profile
-                return Event.objects.filter(college=college)
+                return Event.objects.filter(college=college).order_by('date', 'id')
             except CollegeProfile.DoesNotExist:
                 return Event.objects.none()
         
         # Other authenticated users can see all events
-        return Event.objects.all()
+        return Event.objects.order_by('date', 'id')
     
     def perform_create(self, serializer):
         """Create event for authenticated college admin's college"""
@@ -380,6 +904,78 @@ class EventViewSet(viewsets.ModelViewSet):
         
         instance.delete()
 
+class EventFeedPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class EventFeedView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Upcoming events across colleges, soonest first, filterable by date
+    window (`?from=&to=`), state, district, stream and college. Anyone
+    can read it.
+
+    Validated by the events catalog version (see College/event_feed.py):
+    unchanged feeds answer revalidations with a 304 after one lookup.
+    """
+    serializer_class = EventFeedSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    pagination_class = EventFeedPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = EventFeedFilterSet
+
+    def get_queryset(self):
+        queryset = Event.objects.select_related('college').only(
+            'id', 'name', 'date', 'location', 'description', 'image', 'image_variants', 'updated_at',
+            'college__college_code', 'college__college_name', 'college__state', 'college__district',
+            'college__email',
+        )
+        if 'college_code' in self.kwargs:
+            queryset = queryset.filter(college__college_code=self.kwargs['college_code'])
+        return queryset.order_by('date', 'id')
+
+    def get_validators(self, request):
+        version, updated_at = event_feed.version()
+        today = timezone.localdate()
+        # The default window moves at midnight even when nothing changed.
+        midnight = timezone.make_aware(datetime.datetime.combine(today, datetime.time.min))
+        last_modified = max(updated_at, midnight) if updated_at else midnight
+        etag = caching.make_etag(
+            event_feed.CATALOG, version, today, request.get_full_path(), request.accepted_renderer.format
+        )
+        return etag, last_modified
+
+
+class EventCalendarView(EventFeedView):
+    """
+    The events feed as a streamed iCalendar file, for calendar
+    subscriptions: `events/feed.ics` takes the feed's filters,
+    `public/<college_code>/events.ics` holds one college's events.
+    """
+    pagination_class = None
+    renderer_classes = [event_feed.ICalendarRenderer]
+
+    def get_calendar_name(self):
+        college_code = self.kwargs.get('college_code')
+        if college_code is None:
+            return 'College events'
+        college = get_object_or_404(CollegeProfile.objects.only('college_name'), college_code=college_code)
+        return f'{college.college_name} events'
+
+    def list(self, request, *args, **kwargs):
+        name = self.get_calendar_name()
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            event_feed.stream_calendar(queryset, name, request.get_host()),
+            content_type='text/calendar; charset=utf-8',
+        )
+        filename = self.kwargs.get('college_code', 'events')
+        response['Content-Disposition'] = f'inline; filename="{filename}.ics"'
+        return response
+
+
 # ===== GALLERY VIEWSET =====
 
 class GalleryViewSet(viewsets.ModelViewSet):
@@ -603,6 +1199,36 @@ class HostelListCreateView(generics.ListCreateAPIView):
                 "You must have a college profile to create hostels."
             )
 
+class HostelSearchPagination(KeysetPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class HostelSearchView(generics.ListAPIView):
+    """
+    Search active hostels across colleges by type, fee range
+    (`?fee_min=&fee_max=`), amenity, room type and location, cheapest
+    first by default (`?ordering=-fee`, `name`). Anyone can read it.
+
+    `GET /api/colleges/hostels/search/?type=girls&amenity=wifi&fee_max=60000&state=Karnataka`
+    """
+    serializer_class = HostelSearchSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = HostelSearchPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = HostelSearchFilterSet
+    ordering_fields = ['fee', 'name', 'created_at']
+    ordering = ['fee', 'id']
+
+    def get_queryset(self):
+        return Hostel.objects.filter(is_active=True).select_related('college').only(
+            'id', 'name', 'type', 'fee', 'room_types', 'amenities', 'images', 'image_variants', 'description',
+            'created_at',
+            'college__college_code', 'college__college_name', 'college__state', 'college__district',
+        )
+
+
 class HostelDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, and delete hostels - College admins can only edit their own
@@ -665,8 +1291,17 @@ class HostelImageUploadView(APIView):
         extension = image.name.split(".")[-1]
         filename = f"{uuid.uuid4()}.{extension}"
 
-        # 🔹 Save file
+        # 🔹 Orientate, cap the size and strip EXIF (variants are built once a hostel lists it)
+        normalized = images.normalize(image)
+        if normalized is not None:
+            image = ContentFile(normalized)
+
+        # 🔹 Save file; the college's HostelImage row holds its reference (see College/storage.py)
         path = default_storage.save(f"hostels/{college.id}/{filename}", image)
+        _, created = HostelImage.objects.get_or_create(college=college, name=path)
+        if not created:
+            # Same bytes uploaded again: the existing row already holds a reference.
+            default_storage.delete(path)
         image_url = default_storage.url(path)
 
         # 🔹 Make full URL
@@ -674,60 +1309,188 @@ class HostelImageUploadView(APIView):
 
         return Response({"image_url": full_url}, status=201)
 
-class FilterOptionsAPIView(APIView):
+
+class UploadSessionMixin:
+    """Sessions of the requesting user; an expired one is gone."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_session(self, request, pk):
+        session = get_object_or_404(UploadSession.objects.select_related('college', 'course'), pk=pk, user=request.user)
+        if session.expires_at <= timezone.now():
+            uploads.discard(session)
+            raise NotFound("Upload session expired.")
+        return session
+
+    def progress_headers(self, session):
+        return {
+            'Upload-Offset': str(session.offset),
+            'Upload-Length': str(session.size),
+            'Upload-Expires': session.expires_at.isoformat(),
+            'Cache-Control': 'no-store',
+        }
+
+
+class UploadSessionCreateView(UploadSessionMixin, APIView):
     """
-    Returns all dropdown options OR specific filter options dynamically.
+    Open a resumable upload of a gallery video/image or a course brochure
+    (see College/uploads.py). College admins only.
+
+    `POST /api/colleges/uploads/` with `{"target": "gallery", "filename": "tour.mp4", "size": 734003200}`
     """
 
-    def get_filter_data(self):
-        """Collect all filter values in one place to reuse."""
-        countries = CollegeProfile.objects.values_list("country", flat=True).distinct()
-        states = CollegeProfile.objects.values_list("state", flat=True).distinct()
-        districts = CollegeProfile.objects.values_list("district", flat=True).distinct()
+    def post(self, request):
+        if getattr(request.user, 'user_type', None) != 'college':
+            raise permissions.PermissionDenied("Only college admins can upload files.")
+        try:
+            college = request.user.college_profile
+        except CollegeProfile.DoesNotExist:
+            raise permissions.PermissionDenied("You must have a college profile to upload files.")
 
-        accreditation = (
-            CollegeProfile.objects
-            .exclude(accreditation_body__isnull=True)
-            .exclude(accreditation_body__exact="")
-            .values_list("accreditation_body", flat=True)
-            .distinct()
-        )
+        serializer = UploadSessionSerializer(data=request.data, context={'request': request, 'college': college})
+        serializer.is_valid(raise_exception=True)
+        session = serializer.save()
+        headers = self.progress_headers(session)
+        headers['Location'] = reverse('upload-session', kwargs={'pk': session.pk})
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-        course_levels = [c[0] for c in Course.COURSE_LEVEL_CHOICES]
-        main_streams = [c[0] for c in Course.MAIN_STREAM_CHOICES]
-        degrees = [c[0] for c in Course.DEGREE_CHOICES]
 
-        specializations = (
-            Course.objects
-            .exclude(specialization__isnull=True)
-            .exclude(specialization__exact="")
-            .values_list("specialization", flat=True)
-            .distinct()
-        )
+class UploadSessionView(UploadSessionMixin, APIView):
+    """
+    One resumable upload.
 
-        return {
-            "countries": list(countries),
-            "states": list(states),
-            "districts": list(districts),
-            "accreditation_bodies": list(accreditation),
-            "course_levels": course_levels,
-            "main_streams": main_streams,
-            "degrees": degrees,
-            "specializations": list(specializations),
-        }
+    - `GET`/`HEAD`: how many bytes arrived (`Upload-Offset`); resume there.
+    - `PATCH`: the next chunk as the raw request body (any content type),
+      starting at the `Upload-Offset` header. A chunk that does not start
+      at the session's offset gets 409 with the right one.
+    - `DELETE`: abort the upload.
+    """
 
-    def get(self, request, filter_name=None):
-        all_filters = self.get_filter_data()
+    def get(self, request, pk):
+        session = self.get_session(request, pk)
+        return Response(UploadSessionSerializer(session).data, headers=self.progress_headers(session))
+
+    def patch(self, request, pk):
+        session = self.get_session(request, pk)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            raise ValidationError({'Upload-Offset': ['Required: the byte offset this chunk starts at.']})
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length <= 0:
+            raise ValidationError({'Content-Length': ['Required: the size of this chunk.']})
+        if length > uploads.UPLOAD_MAX_CHUNK_SIZE:
+            return Response(
+                {'error': f'Chunks may carry at most {uploads.UPLOAD_MAX_CHUNK_SIZE} bytes.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        if offset + length > session.size:
+            raise ValidationError({'Content-Length': [f'The upload was declared as {session.size} bytes.']})
+
+        # The body is read straight from the request stream; request.data would load it whole.
+        try:
+            uploads.append(session, offset, request.stream, length)
+        except uploads.OffsetMismatch as exc:
+            session.offset = exc.args[0]
+            return Response(
+                {'error': 'Chunk does not start at the upload offset.', 'offset': session.offset},
+                status=status.HTTP_409_CONFLICT,
+                headers=self.progress_headers(session),
+            )
+        except OSError:
+            # The client went away mid-chunk; what arrived is kept.
+            return Response(
+                {'error': 'Chunk incomplete.', 'offset': session.offset},
+                status=status.HTTP_400_BAD_REQUEST,
+                headers=self.progress_headers(session),
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT, headers=self.progress_headers(session))
+
+    def delete(self, request, pk):
+        uploads.discard(self.get_session(request, pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionCommitView(UploadSessionMixin, APIView):
+    """
+    Finish a resumable upload: attach the file to a new gallery item or
+    the course, after checking the optional `{"sha256": "<hex>"}`.
+    """
+
+    def post(self, request, pk):
+        session = self.get_session(request, pk)
+        instance = uploads.commit(session, sha256=request.data.get('sha256'))
+        serializer_class = GallerySerializer if session.target == 'gallery' else CourseSerializer
+        return Response(serializer_class(instance, context={'request': request}).data, status=status.HTTP_201_CREATED)
 
-        # If /filters/ → return all
-        if filter_name is None:
-            return Response(all_filters)
+class FilterOptionsAPIView(APIView):
+    """
+    Returns all dropdown options OR specific filter options dynamically.
+
+    Option lists are computed lazily (only the ones asked for) and cached
+    until a relevant CollegeProfile/Course field changes.
+    Add `?counts=true` to get `{"value": ..., "count": <colleges>}` entries.
+    """
 
-        # If /filters/<filter_name>/ → return only that filter
-        if filter_name not in all_filters:
+    def get(self, request, filter_name=None):
+        with_counts = request.query_params.get("counts", "").lower() in ("1", "true", "yes")
+
+        # If /filters/<filter_name>/ → validate before computing anything
+        if filter_name is not None and filter_name not in filter_options.FILTER_OPTIONS:
             return Response(
                 {"error": f"'{filter_name}' is not a valid filter"},
                 status=400
             )
 
-        return Response({filter_name: all_filters[filter_name]})
+        # If /filters/ → return all, otherwise only that filter
+        names = (filter_name,) if filter_name else ()
+        snapshots = filter_options.get_options(*names)
+
+        if with_counts:
+            data = {
+                name: [{"value": value, "count": count} for value, count in snapshot]
+                for name, snapshot in snapshots.items()
+            }
+        else:
+            data = {
+                name: [value for value, _ in snapshot]
+                for name, snapshot in snapshots.items()
+            }
+        return Response(data)
+
+
+class CatalogImportView(APIView):
+    """
+    Bulk import for the logged-in college's own catalog:
+    POST /api/colleges/import/<kind>/ with a multipart `file` (kind is
+    courses, faculties or events). CSV needs a header row of field names;
+    NDJSON has one JSON object per line. The format comes from the file
+    extension or an explicit `format` field.
+
+    The response streams an NDJSON report while the import runs: one line
+    per rejected row (`line`, `errors`) and a closing `summary`. Courses
+    are upserted on (degree, specialization, level); see College/importer.py.
+    """
+    permission_classes = [IsCollegeAdminOrReadOnly]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, kind):
+        if kind not in importer.KINDS:
+            raise NotFound(f"Unknown import kind; choose from {', '.join(importer.KINDS)}.")
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['Upload a CSV or NDJSON file.']})
+        fmt = request.data.get('format') or importer.guess_format(upload.name)
+        if fmt not in importer.FORMATS:
+            raise ValidationError({'format': [f"Must be one of: {', '.join(importer.FORMATS)}."]})
+        if not importer.is_utf8(upload):
+            raise ValidationError({'file': ['The file must be UTF-8 encoded.']})
+
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        report = importer.run(kind, request.user.college_profile, importer.read_rows(lines, fmt))
+        return StreamingHttpResponse(
+            (json.dumps(entry) + '\n' for entry in report),
+            content_type='application/x-ndjson',
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Consultant', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['state', 'district', 'consultant_type', 'verified'], name='consultant_region_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['state', 'consultant_type', 'verified'], name='consultant_state_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultantprofile',
+            index=models.Index(fields=['-created_at'], name='consultant_created_idx'),
+        ),
+    ]
@@ -16,6 +16,10 @@ class ConsultantProfile(models.Model):
     consultant_type = models.CharField(max_length=20, choices=CONSULTANT_TYPES, default='pending')
     state = models.CharField(max_length=100)
     district = models.CharField(max_length=100, blank=True, null=True)
+
+    # Canonical location rows, kept in sync with state/district on save
+    state_ref = models.ForeignKey('College.State', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='consultants')
+    district_ref = models.ForeignKey('College.District', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='consultants')
     parent_consultant = models.ForeignKey(
         'self',
         on_delete=models.SET_NULL,
@@ -48,6 +52,14 @@ class ConsultantProfile(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # consultant auto-assignment in Student/signals.py and Consultant/signals.py
+            models.Index(fields=['state', 'district', 'consultant_type', 'verified'], name='consultant_region_idx'),
+            models.Index(fields=['state', 'consultant_type', 'verified'], name='consultant_state_type_idx'),
+            models.Index(fields=['-created_at'], name='consultant_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.full_name} - {self.get_consultant_type_display()} ({self.state}, {self.district or 'N/A'})"
 
@@ -3,6 +3,13 @@ from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
 from .models import ConsultantProfile
+from College import locations
+
+
+@receiver(pre_save, sender=ConsultantProfile)
+def link_consultant_location(sender, instance, **kwargs):
+    """Link to canonical location rows before the state checks below."""
+    locations.link_profile_on_save(sender, instance, **kwargs)
 
 
 @receiver(pre_save, sender=ConsultantProfile)
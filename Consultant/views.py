@@ -1,7 +1,8 @@
 from rest_framework import generics, permissions, filters
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
-from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
+from College.filters import LocationFilter
 from .models import ConsultantProfile
 from .serializers import (
     ConsultantProfileSerializer,
@@ -17,12 +18,22 @@ class IsCounsellorOrAdmin(permissions.BasePermission):
         return request.user.is_authenticated and request.user.user_type in ['counsellor', 'admin']
 
 
+class ConsultantFilterSet(FilterSet):
+    """State/district resolve through the canonical location tables (aliases included)."""
+    state = LocationFilter(field_name='state', lookup_expr='iexact')
+    district = LocationFilter(field_name='district', lookup_expr='iexact')
+
+    class Meta:
+        model = ConsultantProfile
+        fields = ['consultant_type', 'verified', 'state', 'district']
+
+
 class ConsultantListView(generics.ListAPIView):
     queryset = ConsultantProfile.objects.all().order_by('-created_at')
     serializer_class = ConsultantProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['consultant_type', 'verified', 'state', 'district']
+    filterset_class = ConsultantFilterSet
     search_fields = ['full_name', 'state', 'district']
 
     # Optional: restrict to counsellor/admin full view
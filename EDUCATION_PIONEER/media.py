@@ -0,0 +1,182 @@
+"""
+Production serving of uploaded media (MEDIA_URL).
+
+`serve` answers `GET`/`HEAD /media/<path>` for files under MEDIA_ROOT:
+- Conditional requests (`If-None-Match`, `If-Modified-Since`) get 304.
+  Content-addressed blobs (`blobs/ab/cd/<sha256>.<ext>`, see
+  College/storage.py) never change under their name. They get the hash as
+  a strong ETag and `Cache-Control: public, max-age=31536000, immutable`.
+  Other files get an mtime/size ETag and MEDIA_CACHE_MAX_AGE.
+- `Range: bytes=...` (one range) gets 206 with that slice, so video and
+  brochure viewers can seek. A range past the end gets 416. `If-Range`
+  is honoured with a date, or with an ETag only when it is strong (a
+  blob's): the weak mtime/size ETag of other files never matches.
+
+MEDIA_SERVE_BACKEND picks who sends the bytes:
+- ``"x-accel-redirect"``: nginx, via an internal location under
+  MEDIA_ACCEL_REDIRECT_PREFIX. nginx handles ranges itself.
+- ``"x-sendfile"``: Apache mod_xsendfile or lighttpd.
+- ``"django"``: the worker, through a FileResponse. Servers with a
+  `wsgi.file_wrapper` (gunicorn) send it with sendfile(2), range slices
+  included: the file is positioned at the range start and Content-Length
+  bounds the count, so the bytes never pass through Python.
+- empty: media is only served with DEBUG on (in "django" mode).
+"""
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import iri_to_uri
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+
+MEDIA_SERVE_BACKENDS = ("django", "x-accel-redirect", "x-sendfile")
+MEDIA_SERVE_BACKEND = getattr(settings, "MEDIA_SERVE_BACKEND", "") or ("django" if settings.DEBUG else "")
+if MEDIA_SERVE_BACKEND and MEDIA_SERVE_BACKEND not in MEDIA_SERVE_BACKENDS:
+    raise ImproperlyConfigured(f"MEDIA_SERVE_BACKEND must be one of {', '.join(MEDIA_SERVE_BACKENDS)}")
+MEDIA_ACCEL_REDIRECT_PREFIX = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+MEDIA_CACHE_MAX_AGE = getattr(settings, "MEDIA_CACHE_MAX_AGE", 3600)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_BLOB = re.compile(r"^blobs/[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(\.[a-z0-9]{1,10})?$")
+_RANGE = re.compile(r"^bytes=(?P<start>\d*)-(?P<end>\d*)$")
+
+
+class FileRange:
+    """
+    Read-only view of `length` bytes of `file` from `start`. Reads stop at
+    the end of the range; `fileno()` stays available so the server can
+    sendfile() the slice from the current position.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        data = self.file.read(self.remaining if size is None or size < 0 else min(size, self.remaining))
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def validators(path, st):
+    """(ETag, Cache-Control) of the media file `path` with stat result `st`."""
+    match = _BLOB.match(path)
+    if match:
+        return f'"{match["digest"]}"', IMMUTABLE_CACHE_CONTROL
+    return f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"', f"public, max-age={MEDIA_CACHE_MAX_AGE}"
+
+
+def byte_range(request, size, etag, last_modified):
+    """
+    (start, end) inclusive of the requested byte range, None to send the
+    whole file (no usable `Range`, or a stale `If-Range`), or False when
+    the range lies past the end of the file.
+    """
+    match = _RANGE.match(request.headers.get("Range", "").replace(" ", ""))
+    if not match or not (match["start"] or match["end"]):
+        # Multiple ranges are not worth a multipart body; the whole file is a valid answer.
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range:
+        date = parse_http_date_safe(if_range)
+        if date is not None:
+            if date != int(last_modified):
+                return None
+        elif etag.startswith("W/") or if_range != etag:
+            # An If-Range entity tag needs a strong comparison (RFC 9110 13.1.5).
+            return None
+    if not match["start"]:
+        suffix = int(match["end"])
+        return (max(size - suffix, 0), size - 1) if suffix and size else False
+    start = int(match["start"])
+    end = min(int(match["end"]), size - 1) if match["end"] else size - 1
+    if match["end"] and int(match["end"]) < start:
+        return None
+    return (start, end) if start < size else False
+
+
+@require_safe
+def serve(request, path):
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Not found.")
+    try:
+        st = os.stat(fullpath)
+    except OSError:
+        raise Http404("Not found.")
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("Not found.")
+
+    etag, cache_control = validators(path, st)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(st.st_mtime),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if conditional is not None:
+        if conditional.status_code == 304:
+            for header, value in headers.items():
+                conditional[header] = value
+        return conditional
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    # A .gz or .br file is served as it is, not as its decompressed type.
+    content_type = "application/octet-stream" if encoding or not content_type else content_type
+
+    if MEDIA_SERVE_BACKEND == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["X-Accel-Redirect"] = iri_to_uri(MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + path)
+        return response
+    if MEDIA_SERVE_BACKEND == "x-sendfile":
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response["X-Sendfile"] = fullpath
+        return response
+
+    requested = byte_range(request, st.st_size, etag, st.st_mtime)
+    if requested is False:
+        headers["Content-Range"] = f"bytes */{st.st_size}"
+        return HttpResponse(status=416, headers=headers)
+    start, end = requested or (0, st.st_size - 1)
+    if requested:
+        headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    status = 206 if requested else 200
+
+    if request.method == "HEAD":
+        return HttpResponse(status=status, content_type=content_type, headers=headers)
+    return FileResponse(
+        FileRange(open(fullpath, "rb"), start, end - start + 1),
+        status=status,
+        content_type=content_type,
+        headers=headers,
+    )
+
+
+def urlpatterns():
+    """URL patterns serving MEDIA_URL, or none when media is served elsewhere."""
+    if not MEDIA_SERVE_BACKEND:
+        return []
+    prefix = settings.MEDIA_URL.lstrip("/")
+    return [re_path(rf"^{re.escape(prefix)}(?P<path>.*)$", serve, name="media")]
@@ -0,0 +1,224 @@
+"""
+Project-wide pagination.
+
+`KeysetPagination` is the default pagination class. Without extra query
+parameters it behaves exactly like DRF's PageNumberPagination
+(`?page=N`, `count`, `next`, `previous`, `results`).
+
+Clients opt in to keyset (cursor) pagination with `?pagination=cursor`. The
+page is then located with a WHERE clause on the ordering columns of the
+last row seen instead of OFFSET, and no COUNT(*) is run, so page 500 costs
+the same as page 1. The ordering is whatever the view's OrderingFilter (or
+the model's Meta.ordering) produced, with the primary key appended as a
+tie-break so that every row has a unique position. The `next`/`previous`
+links carry an opaque `?cursor=` token.
+"""
+import datetime
+import decimal
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    """JSON fallback that keeps full precision (no millisecond truncation)."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+class KeysetPagination(PageNumberPagination):
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset, cursor['values'], reverse))
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving forward, a next page exists if we over-fetched and a previous
+        # one if we arrived through a cursor; moving backward it is the mirror.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = (cursor is not None) if not reverse else has_more
+        self.page_rows = results
+        return results
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'].pop('count', None)
+        return response_schema
+
+    # --- Ordering ---
+    def get_ordering(self, queryset):
+        """
+        [(field, descending), ...] from the queryset's ordering, with the
+        primary key appended as a unique tie-break.
+        """
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        result = []
+        for item in ordering:
+            if not isinstance(item, str):
+                raise NotFound('Cursor pagination is not available for this ordering.')
+            descending = item.startswith('-')
+            field = item.lstrip('-')
+            if field == 'pk':
+                field = queryset.model._meta.pk.name
+            result.append((field, descending))
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(field == pk_name for field, _ in result):
+            result.append((pk_name, result[-1][1] if result else False))
+        return result
+
+    def get_order_by(self, reverse):
+        """NULLs always sort as the smallest value so the keyset filter can rely on it."""
+        order_by = []
+        for field, descending in self.ordering:
+            if descending != reverse:
+                order_by.append(F(field).desc(nulls_last=True))
+            else:
+                order_by.append(F(field).asc(nulls_first=True))
+        return order_by
+
+    def _model_field(self, queryset, name):
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def get_keyset_filter(self, queryset, values, reverse):
+        """
+        Rows strictly after `values` in the current ordering:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND pk > z) ...
+        """
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (field, descending), value in zip(self.ordering, values):
+            model_field = self._model_field(queryset, field)
+            if model_field is not None and value is not None:
+                try:
+                    value = model_field.to_python(value)
+                except DjangoValidationError:
+                    # A tampered cursor; an issued one always holds valid values.
+                    raise NotFound(self.invalid_cursor_message)
+            elif isinstance(value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            nullable = model_field is None or model_field.null
+
+            if descending != reverse:
+                beyond = self._less_than(field, value, nullable)
+            else:
+                beyond = self._greater_than(field, value)
+            condition |= equal_so_far & beyond
+
+            if value is None:
+                equal_so_far &= Q(**{f'{field}__isnull': True})
+            else:
+                equal_so_far &= Q(**{field: value})
+        return condition
+
+    def _greater_than(self, field, value):
+        if value is None:
+            return Q(**{f'{field}__isnull': False})
+        return Q(**{f'{field}__gt': value})
+
+    def _less_than(self, field, value, nullable):
+        if value is None:
+            return Q(pk__in=[])
+        condition = Q(**{f'{field}__lt': value})
+        if nullable:
+            condition |= Q(**{f'{field}__isnull': True})
+        return condition
+
+    # --- Cursors ---
+    def get_position(self, row):
+        values = []
+        for field, _ in self.ordering:
+            value = row
+            for part in field.split('__'):
+                value = getattr(value, part, None)
+            values.append(getattr(value, 'pk', value))
+        return values
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps(
+            {'o': [[field, descending] for field, descending in self.ordering], 'v': values, 'r': reverse},
+            default=_encode_value,
+            separators=(',', ':'),
+        )
+        token = urlsafe_b64encode(payload.encode()).decode('ascii')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, 'cursor')
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            ordering = [(field, bool(descending)) for field, descending in payload['o']]
+            values = list(payload['v'])
+            reverse = bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor only makes sense for the ordering it was issued for.
+        if ordering != self.ordering or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {'values': values, 'reverse': reverse}
+
+    def get_next_link(self):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self.encode_cursor(self.get_position(self.page_rows[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self.encode_cursor(self.get_position(self.page_rows[0]), reverse=True)
@@ -124,12 +124,21 @@ STATICFILES_DIRS = [BASE_DIR / "static"]  # optional for custom static files
 
 STATIC_ROOT = BASE_DIR / "staticfiles"  # required for collectstatic
 
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
-
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored once per distinct content and reference counted
+# (College/storage.py); the upload handlers hash them as they stream in.
+STORAGES = {
+    "default": {"BACKEND": "College.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+FILE_UPLOAD_HANDLERS = [
+    "College.storage.HashingMemoryFileUploadHandler",
+    "College.storage.HashingTemporaryFileUploadHandler",
+]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -143,7 +152,8 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Page-number pagination by default, keyset pagination with ?pagination=cursor
+    'DEFAULT_PAGINATION_CLASS': 'EDUCATION_PIONEER.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -180,6 +190,24 @@ TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
 USE_TWILIO = os.getenv("USE_TWILIO", "False") == "True"
 
+# ==========================
+# Public College Documents (College/documents.py)
+# ==========================
+# Scheme and host the public API is served on. Stored documents embed
+# absolute media URLs built against it and are only served to requests on
+# that host, so it must match the production URL (behind a TLS-terminating
+# proxy, also set SECURE_PROXY_SSL_HEADER).
+COLLEGE_DOCUMENT_BASE_URL = os.getenv("COLLEGE_DOCUMENT_BASE_URL", "http://127.0.0.1:8000/")
+
+# ==========================
+# Media Serving (EDUCATION_PIONEER/media.py)
+# ==========================
+# "x-accel-redirect" (nginx), "x-sendfile" (Apache/lighttpd) or "django"
+# (gunicorn, with sendfile); empty serves media only when DEBUG is on.
+MEDIA_SERVE_BACKEND = os.getenv("MEDIA_SERVE_BACKEND", "")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", 3600))
+
 
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = True
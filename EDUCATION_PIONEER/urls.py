@@ -1,7 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
+from EDUCATION_PIONEER import media
 from User.views import admin_logout_redirect
 
 urlpatterns = [
@@ -20,7 +19,6 @@ urlpatterns = [
 ]
 
 # ==========================
-# Serve Media Files (only in DEBUG)
+# Serve Media Files (in DEBUG, or with MEDIA_SERVE_BACKEND set)
 # ==========================
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += media.urlpatterns()
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'EDUCATION_PIONEER.settings')
 
 application = get_wsgi_application()
+
+# Build the in-memory college facet, fuzzy search and autocomplete indexes
+# once per worker, before the first request.
+from College import autocomplete, facets, fuzzy  # noqa: E402
+
+facets.warm_up()
+fuzzy.warm_up()
+autocomplete.warm_up()
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Consultant', '0003_catalog_indexes'),
+        ('Student', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['state', 'district'], name='student_state_district_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('College', '0014_location_reference_tables'),
+        ('Student', '0003_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='country_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students', to='College.country'),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='district_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students', to='College.district'),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='state_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students', to='College.state'),
+        ),
+    ]
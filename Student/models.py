@@ -30,6 +30,11 @@ class StudentProfile(models.Model):
     district = models.CharField(max_length=100, blank=True, null=True)
     pincode = models.CharField(max_length=10, blank=True, null=True)
 
+    # Canonical location rows, kept in sync with country/state/district on save
+    country_ref = models.ForeignKey('College.Country', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='students')
+    state_ref = models.ForeignKey('College.State', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='students')
+    district_ref = models.ForeignKey('College.District', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='students')
+
     education_level = models.CharField(max_length=20, choices=EDUCATION_LEVELS, blank=True, null=True)
     school_college_name = models.CharField(max_length=255, blank=True, null=True)
     percentage_or_grade = models.CharField(max_length=20, blank=True, null=True)
@@ -52,6 +57,12 @@ class StudentProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # StudentProfileViewSet state/district filters
+            models.Index(fields=['state', 'district'], name='student_state_district_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.email} ({self.user.get_user_type_display()})"
 
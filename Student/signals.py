@@ -4,6 +4,7 @@ from django.dispatch import receiver
 from django.conf import settings
 from .models import StudentProfile
 from Consultant.models import ConsultantProfile
+from College import locations
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -35,14 +36,31 @@ def update_profile_completion(sender, instance, **kwargs):
 
 
 
+@receiver(pre_save, sender=StudentProfile)
+def link_student_location(sender, instance, **kwargs):
+    """Link to canonical location rows before the consultant lookup below."""
+    locations.link_profile_on_save(sender, instance, **kwargs)
+
+
 @receiver(pre_save, sender=StudentProfile)
 def assign_consultant_based_on_region(sender, instance, **kwargs):
     """Automatically assign consultant based on student's district/state."""
     if not instance.assigned_consultant and instance.state and instance.district:
+        # Match on the canonical location rows when linked, so alias
+        # spellings (Bangalore / Bengaluru) find the same consultant
+        if instance.state_ref_id:
+            state_match = {'state_ref_id': instance.state_ref_id}
+        else:
+            state_match = {'state': instance.state}
+        if instance.district_ref_id:
+            district_match = {'district_ref_id': instance.district_ref_id}
+        else:
+            district_match = {'district': instance.district}
+
         # Try district consultant first
         district_consultant = ConsultantProfile.objects.filter(
-            state=instance.state,
-            district=instance.district,
+            **state_match,
+            **district_match,
             consultant_type='district',
             verified=True
         ).first()
@@ -52,7 +70,7 @@ def assign_consultant_based_on_region(sender, instance, **kwargs):
         else:
             # Fallback to state consultant
             state_consultant = ConsultantProfile.objects.filter(
-                state=instance.state,
+                **state_match,
                 consultant_type='state',
                 verified=True
             ).first()
@@ -1,7 +1,9 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
+from College.filters import LocationFilter
+from EDUCATION_PIONEER.exports import StreamingExportMixin
 from .models import StudentProfile
 from .serializers import StudentProfileSerializer
 
@@ -14,13 +16,29 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.user == request.user
 
 
-class StudentProfileViewSet(viewsets.ModelViewSet):
+class StudentProfileFilterSet(FilterSet):
+    """State/district resolve through the canonical location tables (aliases included)."""
+    state = LocationFilter(field_name='state', lookup_expr='iexact')
+    district = LocationFilter(field_name='district', lookup_expr='iexact')
+
+    class Meta:
+        model = StudentProfile
+        fields = ['state', 'district', 'education_level', 'assigned_consultant']
+
+
+class StudentProfileViewSet(StreamingExportMixin, viewsets.ModelViewSet):
+    """
+    Student profiles, scoped to the caller (own profile, assigned students or
+    everyone for admins). `students/export/?output=csv|ndjson` streams the
+    same rows with the same filters.
+    """
     queryset = StudentProfile.objects.select_related('user', 'assigned_consultant')
     serializer_class = StudentProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
-    filterset_fields = ['state', 'district', 'education_level', 'assigned_consultant']
+    filterset_class = StudentProfileFilterSet
     search_fields = ['user__email', 'user__username', 'state', 'district']
+    export_filename = 'students'
 
     def get_queryset(self):
         user = self.request.user
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0006_user_is_profile_complete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailotp',
+            index=models.Index(fields=['user', 'created_at'], name='emailotp_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='phoneotp',
+            index=models.Index(fields=['user', 'created_at'], name='phoneotp_user_created_idx'),
+        ),
+    ]
@@ -100,6 +100,12 @@ class EmailOTP(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     verified = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # resend / password-reset rate limiting: user + created_at window
+            models.Index(fields=['user', 'created_at'], name='emailotp_user_created_idx'),
+        ]
+
     def generate_otp(self):
         """Generate and save a 6-digit OTP for email."""
         self.otp = str(random.randint(100000, 999999))
@@ -123,6 +129,11 @@ class PhoneOTP(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     verified = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='phoneotp_user_created_idx'),
+        ]
+
     def generate_otp(self):
         """Generate and save a 6-digit OTP for phone."""
         self.otp = str(random.randint(100000, 999999))
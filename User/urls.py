@@ -23,4 +23,5 @@ urlpatterns = [
     # 🔹 User Management
     path('profile/', views.UserProfileView.as_view(), name='user-profile'),
     path('users/', views.UserListView.as_view(), name='user-list'),
+    path('users/export/', views.UserExportView.as_view(), name='user-export'),
 ]
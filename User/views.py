@@ -38,9 +38,10 @@ logger = logging.getLogger(__name__)
 # -----------------------------
 # PAGINATION CLASS
 # -----------------------------
-from rest_framework.pagination import PageNumberPagination
+from EDUCATION_PIONEER.exports import StreamingExportMixin
+from EDUCATION_PIONEER.pagination import KeysetPagination
 
-class StandardResultsSetPagination(PageNumberPagination):
+class StandardResultsSetPagination(KeysetPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
@@ -63,6 +64,17 @@ class UserListView(generics.ListAPIView):
     ordering_fields = ['date_joined', 'email']
 
 
+class UserExportView(StreamingExportMixin, UserListView):
+    """
+    Admin/Counsellor: stream every user matching the list filters as CSV or
+    NDJSON (`?output=`), without pagination.
+    """
+    export_filename = 'users'
+
+    def get(self, request, *args, **kwargs):
+        return self.export_response(request)
+
+
 # -----------------------------
 # REGISTER VIEW
 # -----------------------------
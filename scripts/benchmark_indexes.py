@@ -0,0 +1,245 @@
+"""
+Before/after benchmark for the catalog indexes (Meta.indexes on
+CollegeProfile, Course, ConsultantProfile, StudentProfile, EmailOTP and
+PhoneOTP).
+
+Builds a throw-away SQLite database, migrates it and fills it with a
+synthetic catalog. It then runs the query shapes used by the list views
+and signals twice, first with the Meta.indexes dropped ("before") and then
+with them restored ("after"), and prints each query plan and median
+latency.
+
+Usage:
+    python scripts/benchmark_indexes.py [--colleges 20000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+# ensure project root is on PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'EDUCATION_PIONEER.settings')
+
+from django.conf import settings  # noqa: E402
+
+DB_FILE = os.path.join(tempfile.mkdtemp(prefix='ep-bench-'), 'bench.sqlite3')
+settings.DATABASES['default']['NAME'] = DB_FILE
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from College.models import CollegeProfile, Course  # noqa: E402
+from Consultant.models import ConsultantProfile  # noqa: E402
+from Student.models import StudentProfile  # noqa: E402
+from User.models import EmailOTP, PhoneOTP, User  # noqa: E402
+
+INDEXED_MODELS = [CollegeProfile, Course, ConsultantProfile, StudentProfile, EmailOTP, PhoneOTP]
+
+STATES = [f"State {i}" for i in range(28)]
+DISTRICTS = {state: [f"{state} District {j}" for j in range(25)] for state in STATES}
+STREAMS = [value for value, _ in Course.MAIN_STREAM_CHOICES]
+DEGREES = [value for value, _ in Course.DEGREE_CHOICES]
+LEVELS = [value for value, _ in Course.COURSE_LEVEL_CHOICES]
+
+
+def populate(n_colleges):
+    rng = random.Random(42)
+    batch = 2000
+
+    n_consultants = max(n_colleges // 4, len(STATES))
+    n_students = n_colleges
+    users = [
+        User(email=f"bench{i}@example.com", username=f"bench{i}", password='!', user_type='admin')
+        for i in range(n_colleges + n_consultants + n_students)
+    ]
+    User.objects.bulk_create(users, batch_size=batch)
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+    college_users = user_ids[:n_colleges]
+    consultant_users = user_ids[n_colleges:n_colleges + n_consultants]
+    student_users = user_ids[n_colleges + n_consultants:]
+
+    colleges = []
+    for i, user_id in enumerate(college_users):
+        state = rng.choice(STATES)
+        colleges.append(CollegeProfile(
+            user_id=user_id,
+            college_name=f"College {i:06d}",
+            college_code=f"B{i:07d}",
+            country="India",
+            state=state,
+            district=rng.choice(DISTRICTS[state]),
+            address="Synthetic address",
+            email=f"college{i}@example.com",
+            phone="9999999999",
+            about_college="Synthetic college " * 50,
+            verified=rng.random() < 0.3,
+            is_popular=rng.random() < 0.05,
+            is_featured=rng.random() < 0.05,
+        ))
+    CollegeProfile.objects.bulk_create(colleges, batch_size=batch)
+    # auto_now_add ignores explicit values, spread created_at afterwards
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE "{CollegeProfile._meta.db_table}" '
+            "SET created_at = datetime('now', '-' || (id * 37 % 100000) || ' minutes')"
+        )
+
+    courses = []
+    for college in colleges:
+        for degree in rng.sample(DEGREES, 5):
+            courses.append(Course(
+                college_id=college.college_code,
+                main_stream=rng.choice(STREAMS),
+                degree=degree,
+                level=rng.choice(LEVELS),
+                specialization=f"Specialization {rng.randint(0, 500)}",
+                duration="4 Years",
+                fee=rng.randint(20, 2000) * 1000,
+            ))
+    Course.objects.bulk_create(courses, batch_size=batch)
+
+    ConsultantProfile.objects.bulk_create([
+        ConsultantProfile(
+            user_id=user_id,
+            consultant_type='state' if i < len(STATES) else rng.choice(['district', 'pending']),
+            state=STATES[i] if i < len(STATES) else rng.choice(STATES),
+            district=None if i < len(STATES) else rng.choice(DISTRICTS[rng.choice(STATES)]),
+            full_name=f"Consultant {i}",
+            phone="8888888888",
+            verified=rng.random() < 0.7,
+        )
+        for i, user_id in enumerate(consultant_users)
+    ], batch_size=batch)
+
+    StudentProfile.objects.bulk_create([
+        StudentProfile(user_id=user_id, state=rng.choice(STATES), district=rng.choice(DISTRICTS[STATES[0]]))
+        for user_id in student_users
+    ], batch_size=batch)
+
+    otps = []
+    for i in range(n_colleges * 5):
+        otps.append(EmailOTP(user_id=rng.choice(user_ids), otp="123456"))
+    EmailOTP.objects.bulk_create(otps, batch_size=batch)
+    PhoneOTP.objects.bulk_create(
+        [PhoneOTP(user_id=otp.user_id, otp="123456") for otp in otps], batch_size=batch
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def query_shapes():
+    """The hot predicates of the views and signals, as querysets."""
+    state = STATES[3]
+    district = DISTRICTS[state][7]
+    some_user = EmailOTP.objects.values_list('user_id', flat=True).first()
+    since = timezone.now() - timedelta(minutes=10)
+    return [
+        ("college list, newest first",
+         lambda: CollegeProfile.objects.order_by('-created_at')[:10]),
+        ("verified colleges, newest first",
+         lambda: CollegeProfile.objects.filter(verified=True).order_by('-created_at')[:10]),
+        ("featured colleges, newest first",
+         lambda: CollegeProfile.objects.filter(is_featured=True).order_by('-created_at')[:10]),
+        ("colleges by state + district",
+         lambda: CollegeProfile.objects.filter(state=state, district=district).order_by('-created_at')[:10]),
+        ("colleges ordered by name",
+         lambda: CollegeProfile.objects.order_by('college_name')[:10]),
+        ("courses by stream + level, fee range, by fee",
+         lambda: Course.objects.filter(
+             main_stream='engineering', level='undergraduate', fee__gte=100000, fee__lte=300000
+         ).order_by('fee')[:10]),
+        ("courses by degree, cheapest first",
+         lambda: Course.objects.filter(degree='mba').order_by('fee')[:10]),
+        ("courses, newest first",
+         lambda: Course.objects.order_by('-created_at')[:10]),
+        ("district consultant lookup (Student signal)",
+         lambda: ConsultantProfile.objects.filter(
+             state=state, district=district, consultant_type='district', verified=True
+         )[:1]),
+        ("state consultant lookup (signals)",
+         lambda: ConsultantProfile.objects.filter(state=state, consultant_type='state', verified=True)[:1]),
+        ("students by state + district",
+         lambda: StudentProfile.objects.filter(state=state, district=district)[:10]),
+        ("email OTP rate limit window",
+         lambda: EmailOTP.objects.filter(user_id=some_user, created_at__gte=since)),
+    ]
+
+
+def set_indexes(enabled):
+    with connection.schema_editor() as editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                if enabled:
+                    editor.add_index(model, index)
+                else:
+                    editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def measure(make_queryset, repeat):
+    timings = []
+    for _ in range(repeat):
+        queryset = make_queryset()
+        start = time.perf_counter()
+        if queryset.query.is_sliced:
+            list(queryset)
+        else:
+            queryset.count()
+        timings.append((time.perf_counter() - start) * 1000)
+    plan = make_queryset().explain()
+    return statistics.median(timings), plan
+
+
+def run(repeat):
+    results = {}
+    for label, enabled in (("before", False), ("after", True)):
+        set_indexes(enabled)
+        for name, make_queryset in query_shapes():
+            results.setdefault(name, {})[label] = measure(make_queryset, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--colleges', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Building synthetic catalog in {DB_FILE} ...")
+    call_command('migrate', verbosity=0)
+    start = time.perf_counter()
+    populate(args.colleges)
+    print(
+        f"{CollegeProfile.objects.count()} colleges, {Course.objects.count()} courses, "
+        f"{ConsultantProfile.objects.count()} consultants, {StudentProfile.objects.count()} students, "
+        f"{EmailOTP.objects.count()} email OTPs ({time.perf_counter() - start:.1f}s)\n"
+    )
+
+    results = run(args.repeat)
+    for name, runs in results.items():
+        before_ms, before_plan = runs["before"]
+        after_ms, after_plan = runs["after"]
+        speedup = before_ms / after_ms if after_ms else float('inf')
+        print(f"== {name}")
+        print(f"   before: {before_ms:8.3f} ms   after: {after_ms:8.3f} ms   ({speedup:.1f}x)")
+        print("   plan before:\n      " + before_plan.replace("\n", "\n      "))
+        print("   plan after:\n      " + after_plan.replace("\n", "\n      "))
+        print()
+
+    os.remove(DB_FILE)
+
+
+if __name__ == '__main__':
+    main()